@@ -6,8 +6,10 @@ with JEL code visualization.
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-from collections import defaultdict
+import numpy as np
+from collections import defaultdict, namedtuple
+import functools
+import json
 import sys
 import os
 
@@ -16,12 +18,17 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from data.jel_codes import (
     JEL_CODES, JEL_CATEGORIES, JEL_LETTERS,
-    get_jel_description, get_category_name, parse_jel_code
+    get_jel_description, get_category_name, parse_jel_codes
 )
 from data.papers import (
-    PAPERS_2026, JOURNAL_COLORS, JOURNAL_ABBREVIATIONS,
+    JOURNAL_COLORS, JOURNAL_ABBREVIATIONS,
     get_all_papers, get_journals
 )
+from data.bitmap import get_filter_engine
+from data.cache import filter_key, get_view_cache
+from data.cooccurrence import get_cooccurrence
+from data.similar import similarity_index_for
+from data.timing import get_timer, span, timed
 
 # Short names for journals (used in checkboxes and legend)
 JOURNAL_SHORT_NAMES = {
@@ -32,6 +39,31 @@ JOURNAL_SHORT_NAMES = {
     "Econometrica": "Econometrica",
 }
 
+# Above this many JEL points the chart switches from SVG to WebGL traces.
+# 5000 is an estimate, not a measurement: SVG rendering in plotly.js slows
+# noticeably at a few thousand markers. benchmarks/bench_backends.py --html
+# writes a page that finds the crossover in a given browser; update this
+# value (and record the browser and result here) once it has been run.
+WEBGL_POINT_THRESHOLD = 5000
+
+# Above this many papers the JEL chart shows code and edge densities instead
+# of one line per paper, so its payload stops growing with the corpus
+DENSITY_PAPER_THRESHOLD = 2000
+
+# Number of strongest code pairs (edges) drawn in the density view
+DENSITY_MAX_EDGES = 300
+DENSITY_EDGE_LEVELS = 5
+
+# Paper list pagination
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+# Maximum number of ranked results shown for a search
+SEARCH_RESULT_LIMIT = 200
+
+# Similar papers listed under each paper
+SIMILAR_PAPERS = 3
+
 # Page configuration
 st.set_page_config(
     page_title="truffle.econ",
@@ -258,13 +290,305 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def create_jel_visualization(papers, highlighted_paper_idx=None):
-    """Create the JEL code visualization using Plotly."""
+# Sorted JEL chart points of a list of papers: the points of the i-th paper
+# are bounds[i]:bounds[i + 1] of xs, ys and codes
+Polylines = namedtuple("Polylines", ["bounds", "xs", "ys", "codes"])
 
-    fig = go.Figure()
 
-    # Create a mapping from JEL letter to x position
-    letter_to_x = {letter: i for i, letter in enumerate(JEL_LETTERS)}
+def _paper_polylines(papers, letter_to_x):
+    """Return every paper's JEL codes as points sorted for drawing.
+
+    Papers from a PaperStore slice the chart points precomputed at ingestion;
+    other papers have all their codes parsed in one batch. Codes whose letter
+    is not on the x axis are dropped.
+    """
+    store = getattr(papers[0], "store", None) if papers else None
+    if (store is not None and all(getattr(p, "store", None) is store for p in papers)
+            and letter_to_x == {letter: i for i, letter in enumerate(JEL_LETTERS)}):
+        bounds, xs, ys, code_ids = store.jel_chart_points([p.paper_id for p in papers])
+        unique_ids, inverse = np.unique(code_ids, return_inverse=True)
+        codes = np.array([store.decode_jel_id(c) for c in unique_ids], dtype=object)[inverse]
+        return Polylines(bounds, xs, ys, codes)
+
+    codes = [code for paper in papers for code in paper.jel_codes]
+    batch = parse_jel_codes(codes)
+    x_of_letter = np.array([letter_to_x.get(letter, -1) for letter in JEL_LETTERS] + [-1])
+    xs = x_of_letter[batch.letter_idx]
+    owners = np.repeat(np.arange(len(papers)), [len(paper.jel_codes) for paper in papers])
+
+    # Sort coords by paper, then x, then y for consistent drawing
+    keep = np.flatnonzero(xs >= 0)
+    order = keep[np.lexsort((batch.numbers[keep], xs[keep], owners[keep]))]
+    bounds = np.searchsorted(owners[order], np.arange(len(papers) + 1))
+    return Polylines(bounds, xs[order], batch.numbers[order], np.array(codes, dtype=object)[order])
+
+
+def _paper_hover_text(paper, codes):
+    """Build the hover text shown for a paper's line on the JEL chart."""
+    abbrev = JOURNAL_SHORT_NAMES.get(paper.journal, paper.journal[:3])
+    jel_codes_str = ", ".join(codes)
+    return (
+        f"<b>{paper.title}</b><br>"
+        f"<i>{abbrev}</i><br>"
+        f"JEL: {jel_codes_str}"
+    )
+
+
+def _line_style(highlighted_paper_idx, is_highlighted):
+    """Return (opacity, line_width, marker_size) for a paper line."""
+    if highlighted_paper_idx is not None:
+        if is_highlighted:
+            return 1.0, 4, 10
+        return 0.15, 1.5, 5
+    return 0.8, 2, 6
+
+
+def _resolve_backend(n_points, backend, webgl_threshold):
+    """Pick the Plotly scatter class for the paper lines.
+
+    ``backend`` is "svg", "webgl" or "auto"; in auto mode WebGL is used once
+    the number of JEL points to draw (``n_points``) exceeds ``webgl_threshold``.
+    """
+    import plotly.graph_objects as go
+    if backend == "svg":
+        return go.Scatter
+    if backend == "webgl":
+        return go.Scattergl
+    if backend != "auto":
+        raise ValueError(f"Unknown rendering backend: {backend!r}")
+
+    if webgl_threshold is None:
+        webgl_threshold = WEBGL_POINT_THRESHOLD
+    return go.Scattergl if n_points > webgl_threshold else go.Scatter
+
+
+def _use_density(n_papers, mode, density_threshold):
+    """Return True if the chart should aggregate papers into densities."""
+    if mode != "auto":
+        return mode == "density"
+    if density_threshold is None:
+        density_threshold = DENSITY_PAPER_THRESHOLD
+    return n_papers > density_threshold
+
+
+def _add_paper_traces(fig, papers, polylines, highlighted_paper_idx, scatter_cls):
+    """Add one trace per paper (legacy mode, scales with paper count)."""
+    bounds = polylines.bounds
+    for paper_idx, paper in enumerate(papers):
+        start, end = bounds[paper_idx], bounds[paper_idx + 1]
+        if end - start < 1:
+            continue
+
+        # Get journal color
+        color = JOURNAL_COLORS.get(paper.journal, "#888888")
+
+        # Determine if this paper is highlighted
+        is_highlighted = highlighted_paper_idx is not None and paper_idx == highlighted_paper_idx
+        opacity, line_width, marker_size = _line_style(highlighted_paper_idx, is_highlighted)
+
+        hover_text = _paper_hover_text(paper, polylines.codes[start:end])
+
+        fig.add_trace(scatter_cls(
+            x=polylines.xs[start:end],
+            y=polylines.ys[start:end],
+            mode='lines+markers',
+            line=dict(color=color, width=line_width),
+            marker=dict(size=marker_size, color=color),
+            opacity=opacity,
+            hovertemplate=hover_text + '<extra></extra>',
+            customdata=np.full(end - start, paper_idx),
+            showlegend=False,
+            name=paper.title[:30]
+        ))
+
+
+def _add_batched_traces(fig, papers, polylines, highlighted_paper_idx, scatter_cls):
+    """Add one trace per journal, joining paper polylines with gap separators.
+
+    Each point carries its paper's hover text and index, so hovering behaves
+    as in per-paper mode. A highlighted paper is drawn on top as a single
+    extra trace, keeping the trace count independent of the number of papers.
+    Trace data is assembled as arrays, so Plotly does not validate it point
+    by point.
+    """
+    bounds = polylines.bounds
+    counts = np.diff(bounds)
+    owners = np.repeat(np.arange(len(papers)), counts)
+    drawn = np.flatnonzero(counts > 0)
+
+    hover = np.empty(len(papers), dtype=object)
+    for paper_idx in drawn:
+        codes = polylines.codes[bounds[paper_idx]:bounds[paper_idx + 1]]
+        hover[paper_idx] = _paper_hover_text(papers[paper_idx], codes)
+
+    # Journals in order of their first drawn paper
+    journal_of = np.empty(len(papers), dtype=object)
+    journal_of[drawn] = [papers[i].journal for i in drawn]
+    highlight = None
+    if highlighted_paper_idx is not None and 0 <= highlighted_paper_idx < len(papers) \
+            and counts[highlighted_paper_idx] > 0:
+        highlight = highlighted_paper_idx
+        journal_of[highlight] = None
+    journals = dict.fromkeys(j for j in journal_of[drawn] if j is not None)
+
+    opacity, line_width, marker_size = _line_style(highlighted_paper_idx, False)
+    for journal in journals:
+        members = journal_of == journal
+        points = np.flatnonzero(members[owners])
+        # Each point shifts right by one gap per earlier paper of the journal;
+        # the unfilled slots stay NaN/None and break the line between papers
+        rank = np.cumsum(members) - 1
+        slots = np.arange(len(points)) + rank[owners[points]]
+        size = len(points) + int(members.sum()) - 1
+        xs = np.full(size, np.nan)
+        ys = np.full(size, np.nan)
+        texts = np.full(size, None, dtype=object)
+        indices = np.full(size, None, dtype=object)
+        xs[slots] = polylines.xs[points]
+        ys[slots] = polylines.ys[points]
+        texts[slots] = hover[owners[points]]
+        indices[slots] = owners[points]
+
+        color = JOURNAL_COLORS.get(journal, "#888888")
+        fig.add_trace(scatter_cls(
+            x=xs,
+            y=ys,
+            mode='lines+markers',
+            line=dict(color=color, width=line_width),
+            marker=dict(size=marker_size, color=color),
+            opacity=opacity,
+            hovertemplate='%{text}<extra></extra>',
+            text=texts,
+            customdata=indices,
+            showlegend=False,
+            name=JOURNAL_SHORT_NAMES.get(journal, journal[:3])
+        ))
+
+    if highlight is not None:
+        _add_highlight_trace(fig, papers, polylines, highlight, hover[highlight], scatter_cls)
+
+
+def _add_highlight_trace(fig, papers, polylines, paper_idx, hover_text, scatter_cls):
+    """Draw one paper's line on top of the other traces."""
+    paper = papers[paper_idx]
+    start, end = polylines.bounds[paper_idx], polylines.bounds[paper_idx + 1]
+    xs, ys = polylines.xs[start:end], polylines.ys[start:end]
+    color = JOURNAL_COLORS.get(paper.journal, "#888888")
+    opacity, line_width, marker_size = _line_style(paper_idx, True)
+    fig.add_trace(scatter_cls(
+        x=xs,
+        y=ys,
+        mode='lines+markers',
+        line=dict(color=color, width=line_width),
+        marker=dict(size=marker_size, color=color),
+        opacity=opacity,
+        hovertemplate='%{text}<extra></extra>',
+        text=[hover_text] * len(xs),
+        customdata=[paper_idx] * len(xs),
+        showlegend=False,
+        name=paper.title[:30]
+    ))
+
+
+def _jel_density(polylines):
+    """Count chart points per JEL cell and drawn segments per code pair.
+
+    Returns (cell counts as a subcode x letter matrix, edge start cells,
+    edge end cells, edge counts); cells are ``letter * 100 + subcode``.
+    """
+    n_cells = len(JEL_LETTERS) * 100
+    xs = polylines.xs.astype(np.int64)
+    ys = polylines.ys.astype(np.int64)
+    cells = np.where((ys >= 0) & (ys < 100), xs * 100 + ys, -1)
+    cell_counts = np.bincount(cells[cells >= 0], minlength=n_cells)
+    cell_counts = cell_counts.reshape(len(JEL_LETTERS), 100).T
+
+    # Segments join consecutive points of the same paper
+    owners = np.repeat(np.arange(len(polylines.bounds) - 1), np.diff(polylines.bounds))
+    starts, ends = cells[:-1], cells[1:]
+    segment = (owners[1:] == owners[:-1]) & (starts >= 0) & (ends >= 0) & (starts != ends)
+    edge_ids, edge_counts = np.unique(starts[segment] * n_cells + ends[segment], return_counts=True)
+    return cell_counts, edge_ids // n_cells, edge_ids % n_cells, edge_counts
+
+
+@functools.lru_cache(maxsize=None)
+def _jel_cell_labels():
+    """Return the hover label of every JEL cell, as a subcode x letter matrix."""
+    labels = np.empty((100, len(JEL_LETTERS)), dtype=object)
+    for i, letter in enumerate(JEL_LETTERS):
+        for num in range(100):
+            code = f"{letter}{num:02d}"
+            desc = get_jel_description(code)
+            if desc == "Unknown":
+                desc = get_category_name(letter)
+            labels[num, i] = f"<b>{code}</b><br>{desc}"
+    labels.flags.writeable = False
+    return labels
+
+
+def _add_density_traces(fig, polylines, max_edges=None):
+    """Add a heatmap of codes per cell and the strongest code-pair edges.
+
+    The number of traces and points is fixed (one heatmap, at most
+    DENSITY_EDGE_LEVELS edge traces of ``max_edges`` segments in total),
+    however many papers are aggregated.
+    """
+    import plotly.graph_objects as go
+    if max_edges is None:
+        max_edges = DENSITY_MAX_EDGES
+    cell_counts, edge_starts, edge_ends, edge_counts = _jel_density(polylines)
+
+    z = np.where(cell_counts > 0, cell_counts, np.nan)
+    fig.add_trace(go.Heatmap(
+        z=z,
+        x=np.arange(len(JEL_LETTERS)),
+        y=np.arange(100),
+        text=_jel_cell_labels(),
+        hovertemplate='%{text}<br>%{z} papers<extra></extra>',
+        colorscale='Blues',
+        showscale=False,
+        xgap=1,
+        name='JEL density'
+    ))
+
+    if len(edge_counts) > max_edges:
+        top = np.argpartition(-edge_counts, max_edges - 1)[:max_edges]
+        edge_starts, edge_ends, edge_counts = edge_starts[top], edge_ends[top], edge_counts[top]
+    if len(edge_counts) == 0:
+        return
+
+    # One trace per weight level; None breaks the line between segments
+    levels = np.ceil(edge_counts / edge_counts.max() * DENSITY_EDGE_LEVELS).astype(int)
+    for level in range(1, DENSITY_EDGE_LEVELS + 1):
+        chosen = levels == level
+        n = int(chosen.sum())
+        if n == 0:
+            continue
+        xs = np.full(3 * n, np.nan)
+        ys = np.full(3 * n, np.nan)
+        xs[0::3], ys[0::3] = edge_starts[chosen] // 100, edge_starts[chosen] % 100
+        xs[1::3], ys[1::3] = edge_ends[chosen] // 100, edge_ends[chosen] % 100
+        fig.add_trace(go.Scatter(
+            x=xs,
+            y=ys,
+            mode='lines',
+            line=dict(color='#1a3a6b', width=0.5 + 3.5 * level / DENSITY_EDGE_LEVELS),
+            opacity=0.15 + 0.6 * level / DENSITY_EDGE_LEVELS,
+            hoverinfo='skip',
+            showlegend=False,
+            name=f'JEL edges {level}'
+        ))
+
+
+@functools.lru_cache(maxsize=None)
+def _jel_chart_template():
+    """Build the paper-independent part of the JEL chart once per process.
+
+    Returns the background grid trace and the axis/layout configuration as a
+    JSON string, so the cached template cannot be mutated by callers.
+    """
+    import plotly.graph_objects as go
+    fig = go.Figure()
 
     # First, add a background grid of all possible JEL points (subtle)
     grid_x, grid_y, grid_text = [], [], []
@@ -293,69 +617,6 @@ def create_jel_visualization(papers, highlighted_paper_idx=None):
         name='JEL Grid'
     ))
 
-    # Add lines for each paper connecting its JEL codes
-    for paper_idx, paper in enumerate(papers):
-        if not paper.jel_codes:
-            continue
-
-        # Parse JEL codes to coordinates
-        coords = []
-        for code in paper.jel_codes:
-            letter, number = parse_jel_code(code)
-            if letter in letter_to_x:
-                x = letter_to_x[letter]
-                y = number
-                coords.append((x, y, code))
-
-        if len(coords) < 1:
-            continue
-
-        # Get journal color
-        color = JOURNAL_COLORS.get(paper.journal, "#888888")
-        abbrev = JOURNAL_SHORT_NAMES.get(paper.journal, paper.journal[:3])
-
-        # Determine if this paper is highlighted
-        is_highlighted = highlighted_paper_idx is not None and paper_idx == highlighted_paper_idx
-
-        # Set opacity based on highlight state
-        if highlighted_paper_idx is not None:
-            opacity = 1.0 if is_highlighted else 0.15
-            line_width = 4 if is_highlighted else 1.5
-            marker_size = 10 if is_highlighted else 5
-        else:
-            opacity = 0.8
-            line_width = 2
-            marker_size = 6
-
-        # Sort coords by x then y for consistent drawing
-        coords.sort(key=lambda c: (c[0], c[1]))
-
-        # Build JEL codes string for hover
-        jel_codes_str = ", ".join([c[2] for c in coords])
-
-        # Create hover text with paper info
-        hover_text = (
-            f"<b>{paper.title}</b><br>"
-            f"<i>{abbrev}</i><br>"
-            f"JEL: {jel_codes_str}"
-        )
-
-        xs = [c[0] for c in coords]
-        ys = [c[1] for c in coords]
-
-        fig.add_trace(go.Scatter(
-            x=xs,
-            y=ys,
-            mode='lines+markers',
-            line=dict(color=color, width=line_width),
-            marker=dict(size=marker_size, color=color),
-            opacity=opacity,
-            hovertemplate=hover_text + '<extra></extra>',
-            customdata=[paper_idx] * len(coords),
-            showlegend=False,
-            name=paper.title[:30]
-        ))
-
     # Configure layout for clean white theme
     fig.update_layout(
         plot_bgcolor='#fafafa',
@@ -390,6 +651,70 @@ def create_jel_visualization(papers, highlighted_paper_idx=None):
         dragmode=False,  # Disable drag/selection
     )
 
+    return fig.to_json()
+
+
+def figure_from_json(figure_json):
+    """Load a figure serialized by this module, skipping re-validation."""
+    import plotly.graph_objects as go
+    # The JSON came from an already validated figure
+    return go.Figure(json.loads(figure_json), _validate=False)
+
+
+def create_jel_figure_base():
+    """Return a new figure holding the cached JEL grid and layout."""
+    return figure_from_json(_jel_chart_template())
+
+
+def create_jel_visualization(papers, highlighted_paper_idx=None, batched=True,
+                             backend="auto", webgl_threshold=None, mode="auto",
+                             density_threshold=None):
+    """Create the JEL code visualization using Plotly.
+
+    With ``batched=True`` (the default) all papers of a journal share one
+    trace, so the figure size no longer grows with one trace per paper.
+    Pass ``batched=False`` to draw every paper as its own trace.
+
+    ``backend`` selects SVG ("svg") or WebGL ("webgl") paper lines; "auto"
+    switches to WebGL above ``webgl_threshold`` points (defaults to
+    ``WEBGL_POINT_THRESHOLD``).
+
+    ``mode`` is "lines", "density" (a heatmap of codes plus the strongest
+    code-pair edges) or "auto", which shows densities above
+    ``density_threshold`` papers (defaults to ``DENSITY_PAPER_THRESHOLD``).
+    """
+    import plotly.graph_objects as go
+    if mode not in ("auto", "lines", "density"):
+        raise ValueError(f"Unknown chart mode: {mode!r}")
+
+    with span("figure.base"):
+        fig = create_jel_figure_base()
+
+    # Create a mapping from JEL letter to x position
+    letter_to_x = {letter: i for i, letter in enumerate(JEL_LETTERS)}
+
+    # Add lines for each paper connecting its JEL codes
+    with span("figure.polylines"):
+        polylines = _paper_polylines(papers, letter_to_x)
+    if _use_density(len(papers), mode, density_threshold):
+        with span("figure.traces"):
+            _add_density_traces(fig, polylines)
+        bounds = polylines.bounds
+        if highlighted_paper_idx is not None and 0 <= highlighted_paper_idx < len(papers) \
+                and bounds[highlighted_paper_idx + 1] > bounds[highlighted_paper_idx]:
+            codes = polylines.codes[bounds[highlighted_paper_idx]:bounds[highlighted_paper_idx + 1]]
+            hover_text = _paper_hover_text(papers[highlighted_paper_idx], codes)
+            _add_highlight_trace(fig, papers, polylines, highlighted_paper_idx, hover_text, go.Scatter)
+        return fig
+
+    n_points = len(polylines.xs)
+    scatter_cls = _resolve_backend(n_points, backend, webgl_threshold)
+    with span("figure.traces"):
+        if batched:
+            _add_batched_traces(fig, papers, polylines, highlighted_paper_idx, scatter_cls)
+        else:
+            _add_paper_traces(fig, papers, polylines, highlighted_paper_idx, scatter_cls)
+
     return fig
 
 
@@ -407,8 +732,9 @@ def create_legend_html():
     return '<div class="legend-box">' + ''.join(items) + '</div>'
 
 
-def display_paper(paper, paper_id):
-    """Display a paper as an expandable section."""
+@timed("display_paper")
+def display_paper(paper, paper_id, similar_papers=()):
+    """Display a paper as an expandable section, listing ``similar_papers``."""
     color = JOURNAL_COLORS.get(paper.journal, "#888888")
     abbrev = JOURNAL_SHORT_NAMES.get(paper.journal, paper.journal[:3])
 
@@ -446,14 +772,62 @@ def display_paper(paper, paper_id):
         if paper.url:
             st.markdown(f'[Read full text →]({paper.url})')
 
+        # Nearest neighbours by JEL codes and abstract
+        if similar_papers:
+            st.markdown('<p class="filter-label">Similar papers</p>', unsafe_allow_html=True)
+            st.markdown("\n".join(
+                f"- {other.title} "
+                f"*({JOURNAL_SHORT_NAMES.get(other.journal, other.journal[:3])})*"
+                for other in similar_papers
+            ))
+
+
+def _build_jel_chart_json(papers):
+    """Return the JEL chart of ``papers`` serialized for the figure cache."""
+    with span("figure.build"):
+        fig = create_jel_visualization(papers)
+    with span("figure.serialize"):
+        return fig.to_json()
+
+
+def _debug_enabled():
+    """Whether to show the timing panel (``?debug=1`` or TRUFFLE_DEBUG=1)."""
+    return st.query_params.get("debug", os.environ.get("TRUFFLE_DEBUG", "0")) not in ("", "0")
+
+
+def display_timing_panel():
+    """Show per-stage timings over recent reruns, with a JSON lines download."""
+    timer = get_timer()
+    with st.expander("Timing", expanded=True):
+        stats = timer.stats()
+        if not stats:
+            st.markdown('<p class="stats-text">Timing is disabled (TRUFFLE_TIMING=0)</p>',
+                        unsafe_allow_html=True)
+            return
+        st.dataframe(
+            [{"stage": name, "count": s["count"],
+              **{k: round(s[k], 2) for k in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms")}}
+             for name, s in stats.items()],
+            hide_index=True,
+        )
+        st.download_button(
+            "Download reruns (JSON lines)",
+            timer.runs_jsonl(),
+            file_name="truffle-timing.jsonl",
+            mime="application/x-ndjson",
+            key="timing_download",
+        )
+
 
 def main():
     # Header
     st.markdown('<h1 class="main-header">truffle.econ</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Browse the latest from top economics journals</p>', unsafe_allow_html=True)
 
-    # Get all papers and journals
-    all_papers = get_all_papers()
+    # Get the filter engine, view cache and journals
+    engine = get_filter_engine()
+    view_cache = get_view_cache()
+    store = engine.store
     journals = get_journals()
 
     # Legend
@@ -491,7 +865,7 @@ def main():
                 selected_journals.append(journal)
 
     # Month filter dropdown
-    month_options = sorted(set((p.year, p.month) for p in all_papers), reverse=True)
+    month_options = engine.index.months()
     month_labels = ["All months"] + [f"{m:02d}/{y}" for y, m in month_options]
     month_values = [None] + list(month_options)
 
@@ -505,37 +879,62 @@ def main():
         )
     selected_month = month_values[selected_month_idx]
 
-    # Filter papers for graph
-    graph_papers = all_papers.copy()
-
-    if selected_journals:
-        graph_papers = [p for p in graph_papers if p.journal in selected_journals]
-    else:
-        graph_papers = []
-
-    if selected_month:
-        graph_papers = [p for p in graph_papers if (p.year, p.month) == selected_month]
+    # Filter papers for graph (no journals selected means no papers)
+    with span("graph.filter"):
+        graph_ids = view_cache.paper_ids(engine, selected_journals, selected_month)
 
     # Stats
     with col3:
+        density_note = " · shown as density" if len(graph_ids) > DENSITY_PAPER_THRESHOLD else ""
         st.markdown(
-            f'<p class="stats-text">{len(graph_papers)} papers displayed</p>',
+            f'<p class="stats-text">{len(graph_ids)} papers displayed{density_note}</p>',
             unsafe_allow_html=True
         )
 
     # JEL Visualization
-    fig = create_jel_visualization(graph_papers)
+    graph_key = filter_key(store.version, selected_journals, selected_month)
+    with span("graph.figure"):
+        fig = figure_from_json(view_cache.figure_json(
+            ("jel_chart",) + graph_key,
+            lambda: _build_jel_chart_json(store.papers(graph_ids)),
+        ))
 
     # Display chart with disabled interactivity except hover
-    st.plotly_chart(
-        fig,
-        width="stretch",
-        config={
-            'displayModeBar': False,
-            'scrollZoom': False,
-            'doubleClick': False,
-        }
-    )
+    with span("graph.render"):
+        st.plotly_chart(
+            fig,
+            width="stretch",
+            config={
+                'displayModeBar': False,
+                'scrollZoom': False,
+                'doubleClick': False,
+            }
+        )
+
+    # Related fields: codes most often listed together with a chosen code,
+    # within the chart's journal / month selection
+    with st.expander("Related fields"), span("related"):
+        chart_codes = [store.decode_jel_id(c) for c in store.unique_jel_ids() if c >= 0]
+        related_code = st.selectbox(
+            "JEL code",
+            options=chart_codes,
+            format_func=lambda c: f"{c} · {get_jel_description(c)}",
+            key="related_code"
+        )
+        related = get_cooccurrence().related(
+            related_code, k=10, journals=selected_journals, year_month=selected_month
+        ) if related_code else []
+        if related:
+            st.markdown("\n".join(
+                f"- **{code}** {get_jel_description(code)} · {count} "
+                f"{'paper' if count == 1 else 'papers'}"
+                for code, count in related
+            ))
+        else:
+            st.markdown(
+                '<p class="stats-text">No codes listed together with it in this selection</p>',
+                unsafe_allow_html=True
+            )
 
     # === PAPERS SECTION ===
     st.markdown('<h2 class="section-header">Papers</h2>', unsafe_allow_html=True)
@@ -582,31 +981,61 @@ def main():
         )
     paper_selected_month = month_values[paper_month_idx]
 
-    # Filter papers
-    filtered_papers = all_papers.copy()
-
-    if paper_selected_journals:
-        filtered_papers = [p for p in filtered_papers if p.journal in paper_selected_journals]
-    else:
-        filtered_papers = []
-
-    if paper_selected_month:
-        filtered_papers = [p for p in filtered_papers if (p.year, p.month) == paper_selected_month]
-
-    # Sort by journal then by title
-    filtered_papers.sort(key=lambda p: (p.journal, p.title))
+    # Full-text search over titles and abstracts
+    search_query = st.text_input(
+        "Search titles and abstracts",
+        key="paper_search",
+        placeholder="e.g. minimum wage"
+    ).strip()
+
+    # Filter papers (cached per filter state): search hits in rank order,
+    # otherwise sorted by journal then title
+    with span("papers.filter"):
+        if search_query:
+            filtered_ids = view_cache.search_ids(
+                engine, search_query, paper_selected_journals, paper_selected_month,
+                k=SEARCH_RESULT_LIMIT
+            )
+        else:
+            filtered_ids = view_cache.display_ids(engine, paper_selected_journals, paper_selected_month)
+    n_papers = len(filtered_ids)
+
+    # Page size and page number; only the current page is rendered
+    with pcol2:
+        page_size = st.selectbox(
+            "Per page",
+            options=PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+            key="paper_page_size"
+        )
+    n_pages = max(1, -(-n_papers // page_size))
+    if st.session_state.get("paper_page", 1) > n_pages:
+        st.session_state["paper_page"] = n_pages
+    page = st.session_state.get("paper_page", 1)
+    start = (page - 1) * page_size
+    page_papers = store.papers(filtered_ids[start:start + page_size])
 
     # Display count
     with pcol3:
         st.markdown(
-            f'<p class="stats-text">{len(filtered_papers)} papers</p>',
+            f'<p class="stats-text">{n_papers} {"results" if search_query else "papers"}</p>',
             unsafe_allow_html=True
         )
 
-    # Display papers grouped by journal (use FULL journal name in header)
+    # Display papers grouped by journal (use FULL journal name in header);
+    # headers restart on every page so each page is self-contained.
+    # Ranked search results are listed without journal headers.
+    # Similar papers for the whole page come from one batched query
+    page_ids = tuple(paper.paper_id for paper in page_papers)
+    with span("papers.similar"):
+        similar = view_cache.ids.get_or_compute(
+            ("similar", store.version, page_ids),
+            lambda: similarity_index_for(store).similar_many(page_ids, k=SIMILAR_PAPERS),
+        )
+
     current_journal = None
-    for idx, paper in enumerate(filtered_papers):
-        if paper.journal != current_journal:
+    for idx, paper in enumerate(page_papers, start=start):
+        if not search_query and paper.journal != current_journal:
             current_journal = paper.journal
             color = JOURNAL_COLORS.get(current_journal, "#888")
             # Use FULL journal name for headers
@@ -615,7 +1044,29 @@ def main():
                 f'{current_journal}</h3>',
                 unsafe_allow_html=True
             )
-        display_paper(paper, f"paper_{idx}")
+        similar_papers = store.papers(i for i, _ in similar.get(paper.paper_id, []))
+        display_paper(paper, f"paper_{idx}", similar_papers)
+
+    # Page navigation
+    if n_pages > 1:
+        nav_col1, nav_col2, nav_col3 = st.columns([1, 1, 2])
+        with nav_col1:
+            st.number_input(
+                "Page",
+                min_value=1,
+                max_value=n_pages,
+                step=1,
+                key="paper_page"
+            )
+        with nav_col3:
+            st.markdown(
+                f'<p class="stats-text">Showing {start + 1}-{start + len(page_papers)} '
+                f'of {n_papers} · page {page} of {n_pages}</p>',
+                unsafe_allow_html=True
+            )
+
+    if _debug_enabled():
+        display_timing_panel()
 
     # Footer
     st.markdown(
@@ -627,4 +1078,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with get_timer().run():
+        main()
@@ -0,0 +1 @@
+# Benchmarks for truffle.econ
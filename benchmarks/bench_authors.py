@@ -0,0 +1,50 @@
+"""
+Time building the author index and its lookups on a synthetic corpus.
+
+    python benchmarks/bench_authors.py --papers 1000000 --authors 200000
+"""
+
+import argparse
+import random
+import time
+
+from common import make_author_names, make_papers, timeit
+
+from data.authors import AuthorIndex
+from data.store import PaperStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--papers", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    store = PaperStore.from_papers(make_papers(args.papers, n_authors=args.authors))
+    start = time.perf_counter()
+    index = AuthorIndex(store)
+    build = time.perf_counter() - start
+    print(f"{args.papers} papers, {len(index)} distinct authors")
+    print(f"build: {build:.2f} s, {index.nbytes / 1e6:.1f} MB")
+
+    rng = random.Random(1)
+    names = rng.sample(make_author_names(args.authors), args.queries)
+    variants = {
+        "exact name": names,
+        "folded (upper, no initial)": [f"{n.split()[0]} {n.split()[-1]}".upper() for n in names],
+        "surname, first": [f"{n.split()[-1]}, {n.split()[0]}" for n in names],
+        "first initial": [f"{n[0]}. {n.split()[-1]}" for n in names],
+    }
+    print(f"{'query':<28} {'us/query':>9}")
+    for label, queries in variants.items():
+        elapsed = timeit(lambda: [index.lookup(q) for q in queries], repeat=3)
+        print(f"{label:<28} {elapsed / len(queries) * 1e6:>9.1f}")
+
+    prefixes = [n.split()[-1][:3] for n in names[:100]]
+    elapsed = timeit(lambda: [index.complete(p) for p in prefixes], repeat=3)
+    print(f"{'complete (3-letter prefix)':<28} {elapsed / len(prefixes) * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare the SVG (Scatter) and WebGL (Scattergl) backends of the JEL chart.
+
+The Python side times figure construction and JSON serialization for both
+backends. Browser rendering is where the two really differ, so the script
+also writes a standalone HTML page that renders each figure with plotly.js,
+times it, and reports the point count where WebGL becomes faster.
+
+    python benchmarks/bench_backends.py --html bench_backends.html
+"""
+
+import argparse
+import json
+
+from common import import_app, make_papers, timeit
+
+app = import_app()
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>JEL chart backend crossover</title>
+<script>{plotlyjs}</script></head>
+<body>
+<div id="chart" style="width:1200px;height:450px"></div>
+<pre id="out">running...</pre>
+<script>
+const CASES = {cases};
+const REPEAT = 3;
+
+async function renderTime(fig) {{
+  let best = Infinity;
+  for (let i = 0; i < REPEAT; i++) {{
+    Plotly.purge("chart");
+    const start = performance.now();
+    await Plotly.newPlot("chart", fig.data, fig.layout);
+    await new Promise(requestAnimationFrame);
+    best = Math.min(best, performance.now() - start);
+  }}
+  return best;
+}}
+
+(async () => {{
+  const lines = ["points\\tsvg_ms\\twebgl_ms"];
+  let crossover = null;
+  for (const c of CASES) {{
+    const svg = await renderTime(c.svg);
+    const webgl = await renderTime(c.webgl);
+    lines.push(`${{c.points}}\\t${{svg.toFixed(1)}}\\t${{webgl.toFixed(1)}}`);
+    if (crossover === null && webgl < svg) crossover = c.points;
+  }}
+  lines.push(crossover === null
+    ? "WebGL was never faster in the measured range"
+    : `crossover: WebGL faster from ~${{crossover}} points`);
+  document.getElementById("out").textContent = lines.join("\\n");
+  console.log(lines.join("\\n"));
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,300,1000,3000,10000",
+                        help="comma-separated paper counts")
+    parser.add_argument("--html", help="write a browser crossover benchmark here")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    cases = []
+
+    print(f"{'papers':>8} {'points':>8} {'backend':>8} {'build_ms':>9} {'json_ms':>8} {'json_kb':>8}")
+    for n in sizes:
+        papers = make_papers(n)
+        points = sum(len(p.jel_codes) for p in papers)
+        case = {"points": points}
+        for backend in ("svg", "webgl"):
+            build = timeit(lambda: app.create_jel_visualization(papers, backend=backend), repeat=3)
+            fig = app.create_jel_visualization(papers, backend=backend)
+            serialize = timeit(fig.to_json, repeat=3)
+            payload = fig.to_json()
+            print(f"{n:>8} {points:>8} {backend:>8} {build * 1e3:>9.1f} "
+                  f"{serialize * 1e3:>8.1f} {len(payload) / 1024:>8.0f}")
+            case[backend] = json.loads(payload)
+        cases.append(case)
+
+    print(f"\ncurrent WEBGL_POINT_THRESHOLD = {app.WEBGL_POINT_THRESHOLD}")
+
+    if args.html:
+        from plotly.offline import get_plotlyjs
+        with open(args.html, "w") as f:
+            f.write(HTML_TEMPLATE.format(plotlyjs=get_plotlyjs(), cases=json.dumps(cases)))
+        print(f"open {args.html} in a browser to measure the rendering crossover")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Time combined journal x month x JEL filters on a synthetic corpus.
+
+Compares the sorted-array PaperIndex with the bitmap FilterEngine, counting
+matches without materializing papers.
+
+    python benchmarks/bench_filters.py --papers 1000000
+"""
+
+import argparse
+
+from common import make_papers, timeit
+
+from data.bitmap import FilterEngine
+from data.index import PaperIndex
+from data.papers import get_journals
+from data.store import PaperStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--papers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    store = PaperStore.from_papers(make_papers(args.papers))
+    index = PaperIndex(store)
+    engine = FilterEngine(index)
+    journals = get_journals()
+
+    queries = {
+        "2 journals": dict(journals=journals[:2]),
+        "2 journals x month": dict(journals=journals[:2], year_month=(2026, 3)),
+        "all journals x month x letter J": dict(
+            journals=journals, year_month=(2026, 3), jel_letters=["J"]),
+        "3 journals x code J31": dict(journals=journals[:3], jel_codes=["J31"]),
+    }
+
+    print(f"{args.papers} papers")
+    print(f"{'query':<34} {'matches':>8} {'bitmap_ms':>10} {'index_ms':>9}")
+    for name, filters in queries.items():
+        bitmap = timeit(lambda: engine.count(**filters), repeat=50)
+        sorted_ids = timeit(lambda: len(index.query(**filters)), repeat=5)
+        print(f"{name:<34} {engine.count(**filters):>8} "
+              f"{bitmap * 1e3:>10.3f} {sorted_ids * 1e3:>9.3f}")
+
+    within = engine.query(journals=journals[:2])
+    counts = timeit(lambda: engine.facet_counts("jel_letter", within), repeat=20)
+    print(f"{'facet counts (JEL letters)':<34} {'':>8} {counts * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
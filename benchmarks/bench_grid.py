@@ -0,0 +1,32 @@
+"""
+Measure the time the cached JEL grid/layout template saves per rerun.
+
+Compares building the background grid and layout from scratch (what every
+Streamlit rerun used to do) with copying the per-process cached template,
+both on an empty chart and on the full chart for the real corpus.
+
+    python benchmarks/bench_grid.py
+"""
+
+from common import import_app, timeit
+
+app = import_app()
+
+
+def main():
+    papers = app.get_all_papers()
+    app._jel_chart_template()  # warm the cache
+
+    # The undecorated template builder redoes the grid and layout work
+    uncached = timeit(app._jel_chart_template.__wrapped__, repeat=20)
+    cached = timeit(app.create_jel_figure_base, repeat=20)
+    full = timeit(lambda: app.create_jel_visualization(papers), repeat=20)
+
+    print(f"grid + layout, rebuilt:   {uncached * 1e3:7.2f} ms")
+    print(f"grid + layout, cached:    {cached * 1e3:7.2f} ms")
+    print(f"saved per rerun:          {(uncached - cached) * 1e3:7.2f} ms")
+    print(f"full chart ({len(papers)} papers): {full * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure recall and latency of the similar-papers index on a synthetic corpus.
+
+Recall@k compares each query's results with an exact scan of the sparse
+vectors (ties with the k-th exact score count as hits).
+
+    python benchmarks/bench_similar.py --papers 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import make_papers, timeit
+
+from data.search import SearchIndex
+from data.similar import SimilarityIndex
+from data.store import PaperStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--papers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128, 256])
+    args = parser.parse_args()
+
+    store = PaperStore.from_papers(make_papers(args.papers))
+    search_index = SearchIndex.from_store(store)
+    rng = np.random.default_rng(1)
+    queries = rng.choice(len(store), size=args.queries, replace=False)
+    blocks = np.array_split(np.arange(len(store)), max(len(store) // 100_000, 1))
+
+    print(f"{args.papers} papers, {args.queries} queries, k={args.k}")
+    print("build_s: sparse vectors + projection for the first dim, projection only after")
+    print(f"{'dim':>4} {'rerank':>6} {'build_s':>8} {'MB':>6} {'recall':>7} "
+          f"{'ms/query':>9} {'ms/query@25':>12}")
+    exact_kth = None
+    index = None
+    for dim in args.dims:
+        start = time.perf_counter()
+        if index is None:
+            index = SimilarityIndex.from_store(store, search_index, dim=dim)
+        else:
+            # Same sparse vectors, new projection
+            index = SimilarityIndex(index.indptr, index.features, index.values,
+                                    index.n_features, dim=dim)
+        build = time.perf_counter() - start
+        if exact_kth is None:
+            # k-th best exact score of each query (excluding itself)
+            exact_kth = {}
+            for q in queries:
+                scores = np.concatenate([index.exact_scores(int(q), b) for b in blocks])
+                scores[q] = -np.inf
+                exact_kth[int(q)] = np.partition(-scores, args.k - 1)[args.k - 1] * -1
+        for rerank in (20, 100, 400):
+            results = index.similar_many(queries, args.k, rerank)
+            hits = [sum(score >= exact_kth[q] - 1e-6 for _, score in results[q]) for q in results]
+            recall = np.sum(hits) / (args.k * len(queries))
+            single = timeit(lambda: index.similar(int(queries[0]), args.k, rerank), repeat=3)
+            batch = timeit(lambda: index.similar_many(queries[:25], args.k, rerank), repeat=3) / 25
+            print(f"{dim:>4} {rerank:>6} {build:>8.1f} {index.nbytes / 1e6:>6.0f} {recall:>7.3f} "
+                  f"{single * 1e3:>9.1f} {batch * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
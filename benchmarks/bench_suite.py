@@ -0,0 +1,243 @@
+"""
+Time the whole request path on synthetic corpora and save the results as JSON.
+
+For each corpus size this measures startup (store build, snapshot write and
+load, index build), the filtering done by app.main (cold and cached), the
+journal x month x JEL letter count cube, search, JEL figure construction and
+JSON size, and rendering a page of paper cards. Cold imports (the data
+package, a JEL lookup, the app) are timed once, with an -X importtime
+breakdown (--importtime prints it). Results go to a JSON file; --compare prints the change against an earlier
+run and exits non-zero if any timing got slower than --threshold.
+
+    python benchmarks/bench_suite.py --sizes 10000 100000 1000000 --output bench_suite.json
+    python benchmarks/bench_suite.py --compare bench_suite.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import ROOT, import_app, make_papers, timeit
+
+from data.aggregate import facet_cube
+from data.bitmap import FilterEngine
+from data.cache import ViewCache
+from data.index import PaperIndex
+from data.papers import get_journals
+from data.search import SearchIndex
+from data.snapshot import load_snapshot, write_snapshot
+from data.store import PaperStore
+from data.synthetic import generate_store
+
+app = import_app()
+
+SEARCH_QUERIES = ["labor market", "monetary policy shocks", "inequality", "trade", "health insurance"]
+PAGE_SIZE = 25
+
+
+def elapsed(fn):
+    """Return (result, seconds) of one call of ``fn``."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def figure_metrics(prefix, papers, repeat, **options):
+    """Time figure construction and serialization for ``papers``."""
+    fig = app.create_jel_visualization(papers, **options)
+    return {
+        f"{prefix}_papers": len(papers),
+        f"{prefix}_build_ms": timeit(lambda: app.create_jel_visualization(papers, **options), repeat) * 1e3,
+        f"{prefix}_json_ms": timeit(fig.to_json, repeat) * 1e3,
+        f"{prefix}_json_bytes": len(fig.to_json()),
+    }
+
+
+def measure(n, seed, repeat):
+    results = {}
+    # Built chunk by chunk, so 1M papers never exist as Paper objects at once
+    store, results["generate_store_s"] = elapsed(lambda: generate_store(n, seed))
+    sample = make_papers(min(n, 50_000), seed)
+    results["store_build_us_per_paper"] = timeit(
+        lambda: PaperStore.from_papers(sample), repeat) / len(sample) * 1e6
+    del sample
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.snap")
+        _, results["snapshot_write_s"] = elapsed(lambda: write_snapshot(store, path))
+        results["snapshot_bytes"] = os.path.getsize(path)
+        results["snapshot_load_ms"] = timeit(lambda: load_snapshot(path), repeat) * 1e3
+
+    index, results["index_build_s"] = elapsed(lambda: PaperIndex(store))
+    engine, results["bitmap_build_s"] = elapsed(lambda: FilterEngine(index))
+
+    # The filter path of app.main: matching ids in display order, via the view cache
+    journals = get_journals()
+    filters = {
+        "all": dict(),
+        "2 journals x month": dict(journals=journals[:2], year_month=(2026, 3)),
+    }
+    for name, f in filters.items():
+        key = name.replace(" ", "_")
+        results[f"filter_{key}_cold_ms"] = timeit(
+            lambda: ViewCache().display_ids(engine, **f), repeat) * 1e3
+        cache = ViewCache()
+        cache.display_ids(engine, **f)
+        results[f"filter_{key}_cached_us"] = timeit(lambda: cache.display_ids(engine, **f), repeat) * 1e6
+        results[f"filter_{key}_matches"] = len(cache.display_ids(engine, **f))
+
+    # Reporting counts for every journal x month x JEL letter cell
+    results["facet_cube_ms"] = timeit(lambda: facet_cube(store), repeat) * 1e3
+
+    search, results["search_build_s"] = elapsed(lambda: SearchIndex.from_store(store))
+    results["search_query_ms"] = np.mean(
+        [timeit(lambda: search.search(q, 200), repeat) for q in SEARCH_QUERIES]) * 1e3
+
+    # Figures: the unfiltered chart (density above the threshold) and one
+    # journal-month slice drawn as lines
+    results.update(figure_metrics("figure_all", store.papers(), repeat))
+    one_slice = index.query(journals=journals[:1], year_month=(2026, 3))
+    results.update(figure_metrics("figure_slice_lines", store.papers(one_slice), repeat, mode="lines"))
+
+    page = store.papers(one_slice[:PAGE_SIZE])
+    # Streamlit warns on every element written outside `streamlit run`
+    logging.disable(logging.WARNING)
+    try:
+        results["display_page_ms"] = timeit(
+            lambda: [app.display_paper(p, f"paper_{i}") for i, p in enumerate(page)], repeat) * 1e3
+    finally:
+        logging.disable(logging.NOTSET)
+    return {k: float(v) for k, v in results.items()}
+
+
+# Cold imports timed in a fresh interpreter
+STARTUP_IMPORTS = {
+    "data_import": "import data",
+    "jel_lookup": "from data import get_jel_description; get_jel_description('J31')",
+    "app_import": "import app",
+}
+
+
+def run_python(code, *options):
+    return subprocess.run([sys.executable, *options, "-c", code], cwd=ROOT, check=True,
+                          capture_output=True, text=True)
+
+
+def startup_times(repeat):
+    """Best time of each STARTUP_IMPORTS snippet, excluding interpreter startup."""
+    times = {}
+    for name, code in STARTUP_IMPORTS.items():
+        timed = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+        best = min(float(run_python(timed).stdout.split()[-1]) for _ in range(repeat))
+        times[f"{name}_ms"] = best * 1e3
+    return times
+
+
+def import_profile(code, top=15):
+    """Return the ``top`` modules by self import time for ``code`` (from -X importtime).
+
+    Rows are [module, self ms, cumulative ms].
+    """
+    rows = []
+    for line in run_python(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if module == " site":
+            # Everything so far was imported by interpreter startup
+            rows = []
+            continue
+        rows.append([module.strip(), int(self_us) / 1e3, int(cumulative_us) / 1e3])
+    rows.sort(key=lambda row: -row[1])
+    return rows[:top]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new, threshold):
+    """Print per-metric ratios; return the number of timings slower than ``threshold``."""
+    regressions = 0
+    print(f"{'size':>8} {'metric':<36} {'old':>12} {'new':>12} {'ratio':>7}")
+    groups = [("startup", new["startup"], old.get("startup", {}))]
+    groups += [(size, metrics, old["sizes"].get(size, {})) for size, metrics in new["sizes"].items()]
+    for size, metrics, old_metrics in groups:
+        for metric, value in metrics.items():
+            before = old_metrics.get(metric)
+            if before is None or before == 0:
+                continue
+            ratio = value / before
+            timing = metric.endswith(("_s", "_ms", "_us"))
+            flag = " !" if timing and ratio > threshold else ""
+            regressions += bool(flag)
+            print(f"{size:>8} {metric:<36} {before:>12.4g} {value:>12.4g} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_suite.json")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--importtime", action="store_true",
+                        help="print the slowest modules imported by each startup snippet")
+    args = parser.parse_args()
+
+    import plotly
+    run = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plotly": plotly.__version__,
+            "machine": platform.machine(),
+            "seed": args.seed,
+        },
+        "startup": startup_times(args.repeat),
+        "imports": {name: import_profile(code) for name, code in STARTUP_IMPORTS.items()},
+        "sizes": {},
+    }
+    print(", ".join(f"{k}: {v:.1f}" for k, v in run["startup"].items()))
+    if args.importtime:
+        for name, rows in run["imports"].items():
+            print(f"{name}: {STARTUP_IMPORTS[name]}")
+            print(f"  {'self ms':>8} {'cumul ms':>9}  module")
+            for module, self_ms, cumulative_ms in rows:
+                print(f"  {self_ms:>8.1f} {cumulative_ms:>9.1f}  {module}")
+    for n in args.sizes:
+        print(f"measuring {n} papers...", flush=True)
+        run["sizes"][str(n)] = measure(n, args.seed, args.repeat)
+        for metric, value in run["sizes"][str(n)].items():
+            print(f"  {metric:<36} {value:>14.4g}")
+
+    with open(args.output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        if compare(old, run, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
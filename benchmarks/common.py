@@ -0,0 +1,45 @@
+# Shared helpers for the truffle.econ benchmarks
+
+import logging
+import os
+import sys
+import time
+
+# Make the repository root importable when run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data.synthetic import author_names, generate_papers
+
+
+def import_app():
+    """Import app.py outside of `streamlit run`, silencing bare-mode warnings."""
+    logging.disable(logging.WARNING)
+    try:
+        import app
+    finally:
+        logging.disable(logging.NOTSET)
+    return app
+
+
+def make_author_names(n, seed=0):
+    """Return ``n`` synthetic author names (the pool ``make_papers`` draws from)."""
+    return author_names(n, seed)
+
+
+def make_papers(n, seed=0, n_authors=None):
+    """Return ``n`` synthetic papers from the seeded generator in data/synthetic.py.
+
+    With ``n_authors``, authors are drawn from ``make_author_names(n_authors, seed)``.
+    """
+    return generate_papers(n, seed, n_authors=n_authors)
+
+
+def timeit(fn, repeat=5):
+    """Return the best wall-clock time of ``fn()`` over ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
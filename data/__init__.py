@@ -1,7 +1,44 @@
 # Data module for truffle.econ
-from .jel_codes import JEL_CODES, JEL_CATEGORIES, JEL_LETTERS, get_jel_description, get_category_name, parse_jel_code
-from .papers import (
-    Paper, PAPERS_2026, JOURNAL_COLORS, JOURNAL_ABBREVIATIONS,
-    get_all_papers, get_papers_by_journal, get_papers_by_month,
-    get_unique_jel_codes, get_journals
-)
+# Names are re-exported lazily: ``from data import get_jel_description``
+# imports data.jel_codes only, not NumPy, the corpus or the indexes.
+
+_EXPORTS = {
+    "jel_codes": (
+        "JEL_CODES", "JEL_CATEGORIES", "JEL_LETTERS", "get_jel_description", "get_category_name",
+        "parse_jel_code", "encode_jel_code", "decode_jel_code", "parse_jel_codes", "JelCodeBatch",
+        "jel_code_range", "jel_parent", "jel_children",
+    ),
+    "papers": (
+        "Paper", "JOURNAL_COLORS", "JOURNAL_ABBREVIATIONS", "PAPERS_2026",
+        "get_all_papers", "get_papers_by_journal", "get_papers_by_month", "get_papers_by_author",
+        "get_unique_jel_codes", "get_journals",
+    ),
+    "store": ("PaperStore", "PaperView", "StringTable", "get_store"),
+    "index": ("PaperIndex", "get_index"),
+    "bitmap": ("Bitmap", "FilterEngine", "get_filter_engine"),
+    "authors": ("AuthorIndex", "get_author_index", "normalize_author"),
+    "cooccurrence": ("CooccurrenceIndex", "CsrMatrix", "get_cooccurrence"),
+    "search": ("SearchIndex", "get_search_index", "search_papers"),
+    "similar": ("SimilarityIndex", "get_similarity_index"),
+    "aggregate": ("FacetCube", "facet_cube"),
+    "cache": ("LRUCache", "BytesLRUCache", "ViewCache", "filter_key", "get_view_cache"),
+    "timing": ("Timer", "get_timer", "span", "timed"),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ rather than importlib.import_module, so -X importtime sees it
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    # Later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
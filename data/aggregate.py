@@ -0,0 +1,173 @@
+# Group-by counts over the paper store for truffle.econ
+# facet_cube(store, ("journal", "month", "jel_letter")) counts papers in
+# every journal x issue month x JEL letter cell at once: each dimension's
+# values are mapped to dense codes 0..k-1, combined into a single
+# mixed-radix key per row and counted with one np.bincount. The result is a
+# dense array, so a reporting job's thousands of cells cost one pass over
+# the columns instead of one filter query each.
+#
+# Journal, year and month have one value per paper. A JEL dimension expands
+# a paper into one row per distinct letter (or code), so a paper listed
+# under D and J counts in both cells, once each; at most one JEL dimension
+# may be used per cube.
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .jel_codes import JEL_CODE_STRIDE, JEL_LETTERS
+from .store import PaperStore
+
+DIMENSIONS = ("journal", "year", "month", "jel_letter", "jel_code")
+JEL_DIMENSIONS = ("jel_letter", "jel_code")
+# Largest dense cube (cells) facet_cube will allocate
+MAX_CELLS = 1 << 26
+
+
+def _dense_codes(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (codes, distinct values) with ``distinct[codes] == values``.
+
+    Small integer ranges are compacted with a bincount instead of a sort.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), values[:0]
+    lo, hi = int(values.min()), int(values.max())
+    if hi - lo <= 4 * len(values) + 1024:
+        present = np.bincount(values - lo, minlength=hi - lo + 1) > 0
+        remap = np.cumsum(present) - 1
+        return remap[values - lo], np.flatnonzero(present) + lo
+    distinct, codes = np.unique(values, return_inverse=True)
+    return codes, distinct
+
+
+class FacetCube:
+    """Dense paper counts over the cells of several dimensions.
+
+    ``counts[i, j, ...]`` is the number of papers with ``labels[dims[0]][i]``,
+    ``labels[dims[1]][j]``, ... Labels list every value present in the
+    store, so cubes of different filters over one store line up.
+    """
+
+    def __init__(self, dims: Tuple[str, ...], labels: dict, counts: np.ndarray):
+        self.dims = dims
+        self.labels = labels
+        self.counts = counts
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.counts.shape
+
+    def count(self, **cell) -> int:
+        """Return the count of one cell, e.g. ``count(journal="Econometrica", jel_letter="C")``."""
+        index = tuple(self.labels[d].index(cell[d]) for d in self.dims)
+        return int(self.counts[index])
+
+    def to_frame(self, dense: bool = False):
+        """Return a pandas DataFrame with one column per dimension and ``papers``.
+
+        Only non-empty cells are listed unless ``dense`` is set.
+        """
+        import pandas as pd
+
+        cells = np.indices(self.shape).reshape(len(self.dims), -1)
+        counts = self.counts.ravel()
+        if not dense:
+            keep = counts > 0
+            cells, counts = cells[:, keep], counts[keep]
+        columns = {}
+        for dim, positions in zip(self.dims, cells):
+            labels = np.empty(len(self.labels[dim]), dtype=object)
+            labels[:] = self.labels[dim]
+            columns[dim] = labels[positions]
+        columns["papers"] = counts
+        return pd.DataFrame(columns)
+
+    def __repr__(self):
+        return f"FacetCube({' x '.join(f'{d}[{n}]' for d, n in zip(self.dims, self.shape))})"
+
+
+def _jel_rows(store: PaperStore, dim: str) -> Tuple[np.ndarray, np.ndarray, list]:
+    """Return (paper ids, value codes, labels) of distinct (paper, letter/code) pairs."""
+    papers = np.repeat(np.arange(len(store), dtype=np.int64), np.diff(store.jel_offsets))
+    code_ids = store.jel_ids.astype(np.int64)
+    valid = code_ids >= 0
+    papers, code_ids = papers[valid], code_ids[valid]
+    values = code_ids // JEL_CODE_STRIDE if dim == "jel_letter" else code_ids
+    codes, distinct = _dense_codes(values)
+    # A paper listing two codes of one letter (or one code twice) counts
+    # once. Pairs are already grouped by paper, so the sort is cheap.
+    pairs = np.sort(papers * max(len(distinct), 1) + codes)
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+    papers, codes = np.divmod(pairs, max(len(distinct), 1))
+    if dim == "jel_letter":
+        labels = [JEL_LETTERS[v] for v in distinct.tolist()]
+    else:
+        labels = [store.decode_jel_id(v) for v in distinct.tolist()]
+    return papers, codes, labels
+
+
+def _paper_codes(store: PaperStore, dim: str) -> Tuple[np.ndarray, list]:
+    """Return (value code per paper, labels) of a one-value-per-paper dimension."""
+    if dim == "journal":
+        codes, distinct = _dense_codes(store.journal_ids.astype(np.int64))
+        return codes, [store.journals.get(int(j)) for j in distinct]
+    if dim == "year":
+        codes, distinct = _dense_codes(store.years.astype(np.int64))
+        return codes, distinct.tolist()
+    codes, distinct = _dense_codes(store.years.astype(np.int64) * 12 + store.months - 1)
+    return codes, [(v // 12, v % 12 + 1) for v in distinct.tolist()]
+
+
+def facet_cube(store: PaperStore, dims: Sequence[str] = ("journal", "month", "jel_letter"),
+               paper_ids: Optional[Iterable[int]] = None) -> FacetCube:
+    """Count papers in every cell of ``dims`` in one pass.
+
+    ``dims`` are names from DIMENSIONS ("month" values are (year, month)
+    pairs). ``paper_ids`` restricts the count to some papers, e.g. the ids
+    of a FilterEngine query.
+    """
+    dims = tuple(dims)
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown or not dims:
+        raise ValueError(f"Unknown cube dimension: {unknown[0] if unknown else None!r} "
+                         f"(use {', '.join(DIMENSIONS)})")
+    if len(set(dims)) < len(dims):
+        raise ValueError(f"Repeated cube dimension in {dims}")
+    jel_dims = [d for d in dims if d in JEL_DIMENSIONS]
+    if len(jel_dims) > 1:
+        raise ValueError("A cube can have only one JEL dimension")
+
+    # Rows: one per paper, or one per distinct (paper, JEL value) pair
+    labels = {}
+    if jel_dims:
+        rows, jel_codes, labels[jel_dims[0]] = _jel_rows(store, jel_dims[0])
+    else:
+        rows, jel_codes = np.arange(len(store), dtype=np.int64), None
+    if paper_ids is not None:
+        if not isinstance(paper_ids, np.ndarray):
+            paper_ids = np.fromiter(paper_ids, dtype=np.int64)
+        selected = np.zeros(len(store), dtype=bool)
+        selected[paper_ids] = True
+        keep = selected[rows]
+        rows = rows[keep]
+        if jel_codes is not None:
+            jel_codes = jel_codes[keep]
+
+    # Mixed-radix key: ((c0 * n1 + c1) * n2 + c2) ...
+    columns: List[np.ndarray] = []
+    for dim in dims:
+        if dim in JEL_DIMENSIONS:
+            columns.append(jel_codes)
+        else:
+            codes, labels[dim] = _paper_codes(store, dim)
+            columns.append(codes[rows])
+    shape = tuple(len(labels[d]) for d in dims)
+    n_cells = int(np.prod(shape, dtype=np.int64))
+    if n_cells > MAX_CELLS:
+        raise ValueError(f"Cube of {n_cells} cells exceeds MAX_CELLS; use fewer dimensions")
+    key = np.zeros(len(rows), dtype=np.int64)
+    for column, size in zip(columns, shape):
+        key *= size
+        key += column
+    counts = np.bincount(key, minlength=n_cells).reshape(shape)
+    return FacetCube(dims, {d: labels[d] for d in dims}, counts)
@@ -0,0 +1,439 @@
+# JSON query API for truffle.econ
+# A headless ASGI app (Starlette) over the same corpus as the Streamlit UI,
+# for services that need the data without scraping the page:
+#
+#   GET /                     corpus version, size, journals and months
+#   GET /papers               filtered papers, cursor-paginated
+#   GET /papers/{id}          one paper
+#   GET /facets               per-value counts of each facet within a filter
+#   GET /cube?dim=            paper counts over every cell of several facets
+#   GET /cooccurrence?code=   codes most often listed with a JEL code
+#   GET /chart                JEL chart points of the filtered papers
+#
+# Filters: journal (name or abbreviation, repeatable), month (YYYY-MM),
+# jel and letter (repeatable), q (full-text search, /papers only). Values
+# within a filter are OR-ed and filters are AND-ed, as in FilterEngine.
+#
+# Every response is a pure function of the corpus version and the query,
+# which gives its ETag (If-None-Match answers 304 without any work) and the
+# key of a bounded cache holding the serialized and compressed bodies.
+# Bodies are gzip- or brotli-compressed (brotli when the package is
+# installed) as the client accepts. Cursors name the corpus version, so a
+# cursor from before a snapshot update fails with 410 instead of skipping
+# or repeating papers.
+#
+#   python -m data.api [--host 127.0.0.1] [--port 8000]
+#
+# Tests can call the app in-process with starlette.testclient.TestClient
+# (or httpx.ASGITransport), and create_app(store) serves a given store.
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+from .aggregate import facet_cube
+from .bitmap import engine_for
+from .cache import BytesLRUCache
+from .cooccurrence import cooccurrence_for
+from .index import index_for
+from .jel_codes import JEL_CODES, get_jel_description
+from .papers import JOURNAL_ABBREVIATIONS
+from .replay import request_key
+from .search import search_index_for
+from .store import PaperStore, get_store
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# Search hits considered for /papers?q= (ranked, then paginated)
+SEARCH_LIMIT = 1000
+MAX_RELATED = 100
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+ENCODING_SUFFIX = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+class ApiError(Exception):
+    """A client error, answered with ``status`` and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_bytes(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(_json_bytes({"error": message}), status, media_type="application/json")
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header: str) -> str:
+    """Return "br", "gzip" or "identity" for an Accept-Encoding header."""
+    accepted = accepted_encodings(header)
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return body
+
+
+def _etag_matches(header: Optional[str], digest: str) -> bool:
+    """Whether If-None-Match names any encoding of the entity ``digest``."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == digest or any(tag == digest + s for s in ENCODING_SUFFIX.values() if s):
+            return True
+    return False
+
+
+def encode_cursor(version: str, offset: int) -> str:
+    raw = json.dumps([version, offset], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, version: str) -> int:
+    """Return the offset of ``cursor``; ApiError if invalid or from another version."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_version, offset = json.loads(raw)
+        offset = int(offset)
+    except (ValueError, TypeError):
+        raise ApiError(400, "invalid cursor")
+    if cursor_version != version:
+        raise ApiError(410, "cursor expired: the corpus has changed, restart from the first page")
+    if offset < 0:
+        raise ApiError(400, "invalid cursor")
+    return offset
+
+
+_JOURNAL_NAMES = {
+    **{abbrev.lower(): name for name, abbrev in JOURNAL_ABBREVIATIONS.items()},
+    **{name.lower(): name for name in JOURNAL_ABBREVIATIONS},
+}
+
+
+def parse_filters(request: Request, store: PaperStore, jel: bool = True) -> dict:
+    """Return FilterEngine.query keyword arguments from the query string."""
+    params = request.query_params
+    filters = {}
+    journals = params.getlist("journal")
+    if journals:
+        filters["journals"] = []
+        for journal in journals:
+            name = _JOURNAL_NAMES.get(journal.lower(), journal)
+            if store.journal_id(name) < 0 and name not in JOURNAL_ABBREVIATIONS:
+                raise ApiError(400, f"unknown journal: {journal}")
+            filters["journals"].append(name)
+    month = params.get("month")
+    if month:
+        try:
+            year, month_number = (int(part) for part in month.split("-"))
+        except ValueError:
+            raise ApiError(400, f"month must be YYYY-MM, not {month!r}")
+        if not 1 <= month_number <= 12:
+            raise ApiError(400, f"month must be YYYY-MM, not {month!r}")
+        filters["year_month"] = (year, month_number)
+    if jel:
+        codes = params.getlist("jel")
+        if codes:
+            unknown = [c for c in codes if c.upper() not in JEL_CODES]
+            if unknown:
+                raise ApiError(400, f"unknown JEL code: {unknown[0]}")
+            filters["jel_codes"] = [c.upper() for c in codes]
+        letters = params.getlist("letter")
+        if letters:
+            if any(len(l) != 1 or not l.isalpha() for l in letters):
+                raise ApiError(400, "letter must be a single JEL letter")
+            filters["jel_letters"] = letters
+    return filters
+
+
+def _int_param(request: Request, name: str, default: int, lo: int, hi: int) -> int:
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if not lo <= value <= hi:
+        raise ApiError(400, f"{name} must be between {lo} and {hi}")
+    return value
+
+
+def paper_json(store: PaperStore, paper_id: int) -> dict:
+    view = store.paper(paper_id)
+    return {
+        "id": paper_id,
+        "title": view.title,
+        "authors": view.authors,
+        "journal": view.journal,
+        "year": view.year,
+        "month": view.month,
+        "volume": view.volume,
+        "issue": view.issue,
+        "pages": view.pages,
+        "jel_codes": view.jel_codes,
+        "abstract": view.abstract,
+        "url": view.url,
+        "doi": view.doi,
+    }
+
+
+def _month_label(year_month: Tuple[int, int]) -> str:
+    return f"{year_month[0]}-{year_month[1]:02d}"
+
+
+class CorpusAPI:
+    """Endpoint handlers over the store returned by ``store_source``.
+
+    The store is looked up on every request, so a replaced snapshot or an
+    appended segment is served (under a new version) without a restart.
+    """
+
+    def __init__(self, store_source: Callable[[], PaperStore] = get_store,
+                 cache_size: int = 256, cache_bytes: int = 64 << 20):
+        self.store_source = store_source
+        self.cache = BytesLRUCache(cache_size, cache_bytes)
+
+    def _respond(self, request: Request, build: Callable[[PaperStore], object]) -> Response:
+        """Answer a GET with the cached, compressed JSON of ``build(store)``."""
+        store = self.store_source()
+        key = request_key(str(request.url))
+        digest = hashlib.sha1(f"{store.version} {key}".encode()).hexdigest()[:20]
+        headers = {"vary": "Accept-Encoding", "cache-control": "no-cache"}
+
+        if _etag_matches(request.headers.get("if-none-match"), digest):
+            return Response(status_code=304, headers={**headers, "etag": f'"{digest}"'})
+        try:
+            body = self.cache.get_or_compute((store.version, key, "identity"),
+                                             lambda: _json_bytes(build(store)))
+        except ApiError as e:
+            return _error(e.status, e.message)
+
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if len(body) < MIN_COMPRESS_BYTES:
+            encoding = "identity"
+        if encoding != "identity":
+            body = self.cache.get_or_compute((store.version, key, encoding),
+                                             lambda: compress(body, encoding))
+            headers["content-encoding"] = encoding
+        headers["etag"] = f'"{digest}{ENCODING_SUFFIX[encoding]}"'
+        return Response(body, headers=headers, media_type="application/json")
+
+    def root(self, request: Request) -> Response:
+        def build(store):
+            index = index_for(store)
+            return {
+                "version": store.version,
+                "papers": len(store),
+                "journals": sorted(index.by_journal),
+                "months": [_month_label(ym) for ym in index.months()],
+            }
+        return self._respond(request, build)
+
+    def papers(self, request: Request) -> Response:
+        def build(store):
+            filters = parse_filters(request, store)
+            limit = _int_param(request, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+            cursor = request.query_params.get("cursor")
+            offset = decode_cursor(cursor, store.version) if cursor else 0
+            ids = self._ordered_ids(store, filters, request.query_params.get("q", "").strip())
+            page = ids[offset:offset + limit]
+            end = offset + len(page)
+            return {
+                "version": store.version,
+                "total": len(ids),
+                "papers": [paper_json(store, int(i)) for i in page],
+                "next_cursor": encode_cursor(store.version, end) if end < len(ids) else None,
+            }
+        return self._respond(request, build)
+
+    def _ordered_ids(self, store: PaperStore, filters: dict, query: str) -> np.ndarray:
+        """Return matching ids in display order, or ranked search hits for ``query``."""
+        engine = engine_for(index_for(store))
+        ids = engine.query(**filters).to_ids()
+        if query:
+            hits = search_index_for(store).search(query, SEARCH_LIMIT, ids)
+            return np.array([paper_id for paper_id, _ in hits], dtype=np.int64)
+        return engine.index.sort_for_display(ids)
+
+    def paper(self, request: Request) -> Response:
+        def build(store):
+            try:
+                paper_id = int(request.path_params["paper_id"])
+            except ValueError:
+                raise ApiError(404, "no such paper")
+            if not 0 <= paper_id < len(store):
+                raise ApiError(404, "no such paper")
+            return paper_json(store, paper_id)
+        return self._respond(request, build)
+
+    def facets(self, request: Request) -> Response:
+        def build(store):
+            engine = engine_for(index_for(store))
+            names = request.query_params.getlist("facet") or list(engine.FACETS)
+            unknown = [n for n in names if n not in engine.FACETS]
+            if unknown:
+                raise ApiError(400, f"unknown facet: {unknown[0]} (one of {', '.join(engine.FACETS)})")
+            filters = parse_filters(request, store)
+            within = engine.query(**filters) if filters else None
+            facets = {}
+            for name in names:
+                counts = engine.facet_counts(name, within)
+                if name == "month":
+                    counts = {_month_label(ym): n for ym, n in counts.items()}
+                facets[name] = dict(sorted(((str(value), n) for value, n in counts.items() if n),
+                                           key=lambda item: (-item[1], item[0])))
+            return {
+                "version": store.version,
+                "total": len(store) if within is None else within.count(),
+                "facets": facets,
+            }
+        return self._respond(request, build)
+
+    def cube(self, request: Request) -> Response:
+        def build(store):
+            dims = request.query_params.getlist("dim") or ["journal", "month", "jel_letter"]
+            filters = parse_filters(request, store)
+            ids = engine_for(index_for(store)).query(**filters).to_ids() if filters else None
+            try:
+                cube = facet_cube(store, dims, ids)
+            except ValueError as e:
+                raise ApiError(400, str(e))
+            return {
+                "version": store.version,
+                "dims": list(cube.dims),
+                "labels": {d: [_month_label(v) for v in values] if d == "month" else values
+                           for d, values in cube.labels.items()},
+                # Nested lists, indexed in the order of dims
+                "counts": cube.counts.tolist(),
+            }
+        return self._respond(request, build)
+
+    def cooccurrence(self, request: Request) -> Response:
+        def build(store):
+            code = request.query_params.get("code", "").upper()
+            if not code:
+                raise ApiError(400, "code is required")
+            if code not in JEL_CODES:
+                raise ApiError(400, f"unknown JEL code: {code}")
+            k = _int_param(request, "k", 10, 1, MAX_RELATED)
+            filters = parse_filters(request, store, jel=False)
+            related = cooccurrence_for(store).related(
+                code, k, filters.get("journals"), filters.get("year_month"))
+            return {
+                "version": store.version,
+                "code": code,
+                "description": get_jel_description(code),
+                "related": [{"code": c, "description": get_jel_description(c), "papers": n}
+                            for c, n in related],
+            }
+        return self._respond(request, build)
+
+    def chart(self, request: Request) -> Response:
+        def build(store):
+            filters = parse_filters(request, store)
+            ids = engine_for(index_for(store)).query(**filters).to_ids()
+            bounds, xs, ys, code_ids = store.jel_chart_points(ids)
+            codes = np.unique(code_ids)
+            return {
+                "version": store.version,
+                "papers": ids.tolist(),
+                "journals": store.journal_ids[ids].tolist(),
+                "journal_names": list(store.journals),
+                # Points of papers[i] are bounds[i]:bounds[i + 1] of x, y, code
+                "bounds": bounds.tolist(),
+                "x": xs.tolist(),
+                "y": ys.tolist(),
+                "code": np.searchsorted(codes, code_ids).tolist(),
+                "code_names": [store.decode_jel_id(int(c)) for c in codes],
+            }
+        return self._respond(request, build)
+
+    def routes(self) -> List[Route]:
+        return [
+            Route("/", self.root, methods=["GET"]),
+            Route("/papers", self.papers, methods=["GET"]),
+            Route("/papers/{paper_id}", self.paper, methods=["GET"]),
+            Route("/facets", self.facets, methods=["GET"]),
+            Route("/cube", self.cube, methods=["GET"]),
+            Route("/cooccurrence", self.cooccurrence, methods=["GET"]),
+            Route("/chart", self.chart, methods=["GET"]),
+        ]
+
+
+def create_app(store: Optional[PaperStore] = None, **params) -> Starlette:
+    """Return the ASGI app over ``store`` (default: the current corpus, see get_store).
+
+    ``params`` go to CorpusAPI (cache_size, cache_bytes).
+    """
+    api = CorpusAPI(get_store if store is None else (lambda: store), **params)
+    app = Starlette(routes=api.routes())
+    app.state.api = api
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the corpus as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Author index for truffle.econ
+# Maps normalized author names to sorted arrays of paper ids. Names are
+# folded so that case, diacritics, punctuation and middle initials do not
+# matter ("John N. Friedman", "john friedman" and "Friedman, John" share one
+# entry). Keys are kept in a sorted list, so exact lookups and prefix
+# autocomplete are binary searches rather than scans over every paper.
+
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .index import EMPTY, ID_DTYPE, union_sorted
+from .store import PaperStore, get_store
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+# Sorts after any character that can appear in a normalized name
+_PREFIX_END = "\U0010ffff"
+
+
+def fold_text(text: str) -> str:
+    """Lower-case ``text``, strip diacritics and turn punctuation into spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_WORD_RE.sub(" ", text.casefold()).split())
+
+
+def normalize_author(name: str) -> str:
+    """Return the index key for an author name.
+
+    "Last, First" is reordered to "First Last", and single-letter middle
+    initials are dropped: "John N. Friedman" -> "john friedman".
+    """
+    if "," in name:
+        last, first = name.split(",", 1)
+        name = f"{first} {last}"
+    tokens = fold_text(name).split()
+    if len(tokens) > 2:
+        tokens = [tokens[0]] + [t for t in tokens[1:-1] if len(t) > 1] + [tokens[-1]]
+    return " ".join(tokens)
+
+
+def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """Return the slice of sorted ``keys`` that start with ``prefix``."""
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + _PREFIX_END)
+
+
+class AuthorIndex:
+    """Normalized author name -> paper ids, with prefix autocomplete.
+
+    ``keys`` is the sorted list of normalized names; the papers of
+    ``keys[k]`` are ``paper_ids[offsets[k]:offsets[k + 1]]`` (CSR-style,
+    sorted). A second sorted list holds "last first ..." rotations so that
+    prefixes also match on surnames.
+    """
+
+    def __init__(self, store: PaperStore):
+        self.store = store
+        string_ids = np.unique(store.author_ids)
+        # Normalize each distinct spelling once, most-published spelling first
+        # so it becomes the display name of its key
+        papers_per_string = np.bincount(store.author_ids, minlength=len(store.strings))
+        string_ids = string_ids[np.argsort(-papers_per_string[string_ids], kind="stable")]
+        names = [store.strings.get(s) for s in string_ids]
+        normalized = [normalize_author(n) for n in names]
+
+        self.keys: List[str] = sorted(set(normalized))
+        key_ids = {key: k for k, key in enumerate(self.keys)}
+        self.names: List[Optional[str]] = [None] * len(self.keys)
+        key_of_string = np.full(len(store.strings), -1, dtype=np.int64)
+        for string_id, name, key in zip(string_ids, names, normalized):
+            k = key_ids[key]
+            key_of_string[string_id] = k
+            if self.names[k] is None:
+                self.names[k] = name
+
+        # One entry per (paper, author); a paper listing two spellings of one
+        # author is kept once
+        counts = np.diff(store.author_offsets)
+        papers = np.repeat(np.arange(len(store), dtype=np.int64), counts)
+        entry_keys = key_of_string[store.author_ids]
+        order = np.lexsort((papers, entry_keys))
+        entry_keys, papers = entry_keys[order], papers[order]
+        keep = np.ones(len(papers), dtype=bool)
+        keep[1:] = (entry_keys[1:] != entry_keys[:-1]) | (papers[1:] != papers[:-1])
+        self.paper_ids = papers[keep].astype(ID_DTYPE)
+        self.offsets = np.zeros(len(self.keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entry_keys[keep], minlength=len(self.keys)), out=self.offsets[1:])
+
+        rotations = sorted(
+            (f"{key[key.rfind(' ') + 1:]} {key[:key.rfind(' ')]}", k)
+            for k, key in enumerate(self.keys) if " " in key
+        )
+        self._rotated_keys = [r for r, _ in rotations]
+        self._rotated_targets = np.array([k for _, k in rotations], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _key_id(self, name: str) -> int:
+        key = normalize_author(name)
+        k = bisect_left(self.keys, key)
+        return k if k < len(self.keys) and self.keys[k] == key else -1
+
+    def _ids_of(self, k: int) -> np.ndarray:
+        return self.paper_ids[self.offsets[k]:self.offsets[k + 1]]
+
+    def lookup(self, name: str) -> np.ndarray:
+        """Return sorted ids of papers by ``name`` (any spelling of it).
+
+        A name given with only a first initial ("J. Friedman") matches every
+        author with that surname and initial.
+        """
+        k = self._key_id(name)
+        if k >= 0:
+            return self._ids_of(k)
+        tokens = normalize_author(name).split()
+        if len(tokens) < 2 or len(tokens[0]) > 1:
+            return EMPTY
+        lo, hi = _prefix_range(self._rotated_keys, f"{tokens[-1]} {tokens[0]}")
+        return union_sorted(self._ids_of(k) for k in self._rotated_targets[lo:hi])
+
+    def _prefix_keys(self, prefix: str) -> np.ndarray:
+        """Return ids of the keys whose name or surname starts with ``prefix``."""
+        prefix = fold_text(prefix)
+        if not prefix:
+            return np.zeros(0, dtype=np.int64)
+        lo, hi = _prefix_range(self.keys, prefix)
+        r_lo, r_hi = _prefix_range(self._rotated_keys, prefix)
+        return np.union1d(np.arange(lo, hi), self._rotated_targets[r_lo:r_hi])
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return up to ``limit`` (author, paper count) pairs matching ``prefix``.
+
+        Matches on the start of the full name or of the surname; the most
+        published authors come first.
+        """
+        keys = self._prefix_keys(prefix)
+        counts = self.offsets[keys + 1] - self.offsets[keys]
+        if len(keys) > limit:
+            top = np.argpartition(-counts, limit - 1)[:limit]
+            keys, counts = keys[top], counts[top]
+        order = np.lexsort((keys, -counts))
+        return [(self.names[keys[i]], int(counts[i])) for i in order]
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        """Return sorted ids of papers by any author matching ``prefix``."""
+        return union_sorted(self._ids_of(k) for k in self._prefix_keys(prefix))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the postings and key lists."""
+        keys = sum(len(k) for k in self.keys) + sum(len(k) for k in self._rotated_keys)
+        return self.paper_ids.nbytes + self.offsets.nbytes + self._rotated_targets.nbytes + keys
+
+
+@lru_cache(maxsize=2)
+def author_index_for(store: PaperStore) -> AuthorIndex:
+    """Return the author index over ``store``, built once per store."""
+    return AuthorIndex(store)
+
+
+def get_author_index() -> AuthorIndex:
+    """Return the author index over the current corpus."""
+    return author_index_for(get_store())
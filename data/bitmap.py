@@ -0,0 +1,353 @@
+# Compressed bitmaps and the facet filter engine for truffle.econ
+# Bitmaps follow the Roaring layout: paper ids are split into 2^16-id chunks,
+# and each chunk is stored either as a sorted uint16 array (sparse) or as a
+# 1024-word uint64 bitmap (dense). AND/OR/ANDNOT run word-at-a-time per chunk
+# and counts come from popcounts, so no paper objects are materialized.
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .index import PaperIndex, get_index, index_for
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+WORDS_PER_CHUNK = (1 << CHUNK_BITS) // 64
+# Above this many ids a bitmap container is smaller than an array container
+ARRAY_MAX = 4096
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> int:
+        return int(np.bitwise_count(words).sum())
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> int:
+        return int(_BYTE_COUNTS[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _is_array(container: np.ndarray) -> bool:
+    return container.dtype == np.uint16
+
+
+def _array_to_bitmap(values: np.ndarray) -> np.ndarray:
+    bits = np.zeros(1 << CHUNK_BITS, dtype=bool)
+    bits[values] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+
+def _bitmap_to_array(words: np.ndarray) -> np.ndarray:
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _bitmap_contains(words: np.ndarray, values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((words[values >> np.uint64(6)] >> (values & np.uint64(63))) & np.uint64(1)) != 0
+
+
+def _nonempty(words: np.ndarray) -> Optional[np.ndarray]:
+    """Return a bitmap result, or None if it has no bits set.
+
+    Unlike Roaring, results are not converted back to array containers:
+    unpacking a chunk costs more than the word-wise ops it would save, and
+    query results are short-lived.
+    """
+    return words if words.any() else None
+
+
+def _and(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if _is_array(a) and _is_array(b):
+        result = np.intersect1d(a, b, assume_unique=True)
+    elif _is_array(a):
+        result = a[_bitmap_contains(b, a)]
+    elif _is_array(b):
+        result = b[_bitmap_contains(a, b)]
+    else:
+        return _nonempty(a & b)
+    return result if len(result) else None
+
+
+def _or(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if _is_array(a) and _is_array(b):
+        result = np.union1d(a, b)
+        return _array_to_bitmap(result) if len(result) > ARRAY_MAX else result
+    if _is_array(a):
+        a = _array_to_bitmap(a)
+    if _is_array(b):
+        b = _array_to_bitmap(b)
+    return a | b
+
+
+def _andnot(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if _is_array(a):
+        keep = (~np.isin(a, b, assume_unique=True) if _is_array(b)
+                else ~_bitmap_contains(b, a))
+        result = a[keep]
+        return result if len(result) else None
+    if _is_array(b):
+        b = _array_to_bitmap(b)
+    return _nonempty(a & ~b)
+
+
+class Bitmap:
+    """Immutable Roaring-style set of paper ids."""
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers: Optional[Dict[int, np.ndarray]] = None):
+        # chunk key (id >> 16) -> uint16 array or uint64 bitmap container
+        self.containers: Dict[int, np.ndarray] = containers or {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "Bitmap":
+        """Build a bitmap from sorted, unique paper ids."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return cls()
+        keys = ids >> CHUNK_BITS
+        bounds = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1], True])
+        containers = {}
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            lows = (ids[start:end] & CHUNK_MASK).astype(np.uint16)
+            containers[int(keys[start])] = (
+                _array_to_bitmap(lows) if len(lows) > ARRAY_MAX else lows
+            )
+        return cls(containers)
+
+    @classmethod
+    def full(cls, n: int) -> "Bitmap":
+        """Return the bitmap holding ids 0..n-1."""
+        return cls.from_ids(np.arange(n))
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for key in self.containers.keys() & other.containers.keys():
+            result = _and(self.containers[key], other.containers[key])
+            if result is not None:
+                containers[key] = result
+        return Bitmap(containers)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        containers = dict(self.containers)
+        for key, container in other.containers.items():
+            mine = containers.get(key)
+            containers[key] = container if mine is None else _or(mine, container)
+        return Bitmap(containers)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for key, container in self.containers.items():
+            theirs = other.containers.get(key)
+            result = container if theirs is None else _andnot(container, theirs)
+            if result is not None:
+                containers[key] = result
+        return Bitmap(containers)
+
+    def and_count(self, other: "Bitmap") -> int:
+        """Return ``(self & other).count()`` without building the result."""
+        total = 0
+        for key in self.containers.keys() & other.containers.keys():
+            a, b = self.containers[key], other.containers[key]
+            if _is_array(a) or _is_array(b):
+                result = _and(a, b)
+                total += 0 if result is None else len(result)
+            else:
+                total += _popcount(a & b)
+        return total
+
+    def count(self) -> int:
+        """Return the number of ids in the bitmap."""
+        return sum(len(c) if _is_array(c) else _popcount(c)
+                   for c in self.containers.values())
+
+    __len__ = count
+
+    def __bool__(self):
+        return bool(self.containers)
+
+    def to_ids(self) -> np.ndarray:
+        """Return the ids as a sorted int64 array."""
+        parts = []
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            lows = container if _is_array(container) else _bitmap_to_array(container)
+            parts.append((key << CHUNK_BITS) + lows.astype(np.int64))
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.containers.values())
+
+    def __repr__(self):
+        return f"Bitmap(count={self.count()}, chunks={len(self.containers)})"
+
+
+def _repeated_entries(offsets: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Mark each entry of a CSR code list that repeats an earlier code of
+    the same row (rows hold a handful of codes, so compare by distance)."""
+    lengths = np.diff(offsets)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    repeated = np.zeros(len(codes), dtype=bool)
+    for d in range(1, int(lengths.max(initial=0))):
+        repeated[d:] |= (codes[d:] == codes[:-d]) & (rows[d:] == rows[:-d])
+    return repeated
+
+
+def union_all(bitmaps: Iterable[Bitmap]) -> Bitmap:
+    """OR together any number of bitmaps, one reduction per chunk."""
+    by_key: Dict[int, list] = {}
+    for bitmap in bitmaps:
+        for key, container in bitmap.containers.items():
+            by_key.setdefault(key, []).append(container)
+
+    containers = {}
+    for key, parts in by_key.items():
+        if len(parts) == 1:
+            containers[key] = parts[0]
+        elif all(_is_array(p) for p in parts) and sum(map(len, parts)) <= ARRAY_MAX:
+            containers[key] = np.unique(np.concatenate(parts))
+        else:
+            words = [p if not _is_array(p) else _array_to_bitmap(p) for p in parts]
+            containers[key] = np.bitwise_or.reduce(words)
+    return Bitmap(containers)
+
+
+class FilterEngine:
+    """Facet bitmaps for journal, issue month, JEL letter and JEL code.
+
+    Facet values map to bitmaps, so any boolean combination can be written
+    with ``&``, ``|`` and ``-`` on the results of ``bitmap``/``any_of``.
+    ``previous`` is the engine over the store that ``index.store`` extends
+    (see PaperStore.appended_to); its bitmaps are OR-ed with the new ids
+    only.
+    """
+
+    FACETS = ("journal", "month", "jel_letter", "jel_code")
+
+    def __init__(self, index: PaperIndex, previous: Optional["FilterEngine"] = None):
+        self.index = index
+        self.store = index.store
+        postings = {
+            "journal": index.by_journal,
+            "month": index.by_month,
+            "jel_letter": index.by_jel_letter,
+            "jel_code": {self.store.decode_jel_id(c): ids for c, ids in index.by_jel_id.items()},
+        }
+        # (code, id) pairs of the jel_code facet, and the JEL entries that
+        # repeat a code of the same paper, for counting codes by bincount
+        self._jel_codes = [(name, c) for name, c in zip(postings["jel_code"], index.by_jel_id)]
+        start = 0 if previous is None else len(previous.store)
+        offsets = self.store.jel_offsets[start:]
+        repeated = _repeated_entries(offsets - offsets[0], self.store.jel_ids[offsets[0]:])
+        if previous is None:
+            self._jel_repeated = repeated
+            self.universe = Bitmap.full(len(self.store))
+            self.facets: Dict[str, Dict[object, Bitmap]] = {
+                facet: {value: Bitmap.from_ids(ids) for value, ids in values.items()}
+                for facet, values in postings.items()
+            }
+            return
+
+        self._jel_repeated = np.concatenate([previous._jel_repeated, repeated])
+        self.universe = previous.universe | Bitmap.from_ids(np.arange(start, len(self.store)))
+        self.facets = {}
+        for facet, values in postings.items():
+            bitmaps = dict(previous.facets[facet])
+            for value, ids in values.items():
+                # Posting lists are sorted, so the new ids are a suffix
+                new = ids[np.searchsorted(ids, start):]
+                if len(new):
+                    bitmap = Bitmap.from_ids(new)
+                    bitmaps[value] = bitmaps[value] | bitmap if value in bitmaps else bitmap
+            self.facets[facet] = bitmaps
+
+    def bitmap(self, facet: str, value) -> Bitmap:
+        """Return the bitmap of papers with ``value`` for ``facet``."""
+        return self.facets[facet].get(value, Bitmap())
+
+    def any_of(self, facet: str, values: Iterable) -> Bitmap:
+        """Return papers matching any of ``values`` for ``facet``."""
+        return union_all(self.bitmap(facet, v) for v in values)
+
+    def query(self, journals: Optional[Iterable[str]] = None,
+              year_month: Optional[Tuple[int, int]] = None,
+              jel_codes: Optional[Iterable[str]] = None,
+              jel_letters: Optional[Iterable[str]] = None) -> Bitmap:
+        """Return the bitmap of papers matching every given filter.
+
+        Same semantics as PaperIndex.query: values within a facet are OR-ed,
+        facets are AND-ed, None leaves a facet unfiltered and an empty
+        iterable matches nothing.
+        """
+        parts = []
+        if journals is not None:
+            parts.append(self.any_of("journal", journals))
+        if year_month is not None:
+            parts.append(self.bitmap("month", tuple(year_month)))
+        if jel_codes is not None:
+            parts.append(self.any_of("jel_code", jel_codes))
+        if jel_letters is not None:
+            parts.append(self.any_of("jel_letter", [l.upper() for l in jel_letters]))
+
+        if not parts:
+            return self.universe
+        parts.sort(key=lambda b: len(b.containers))
+        result = parts[0]
+        for part in parts[1:]:
+            if not result:
+                break
+            result = result & part
+        return result
+
+    def count(self, **filters) -> int:
+        """Return the number of papers matching ``filters`` (see ``query``)."""
+        return self.query(**filters).count()
+
+    def facet_counts(self, facet: str, within: Optional[Bitmap] = None) -> Dict[object, int]:
+        """Return per-value counts for ``facet``, optionally restricted to ``within``."""
+        values = self.facets[facet]
+        if within is None:
+            return {value: bitmap.count() for value, bitmap in values.items()}
+        if facet == "jel_code":
+            return self._jel_code_counts(within)
+        return {value: bitmap.and_count(within) for value, bitmap in values.items()}
+
+    def _jel_code_counts(self, within: Bitmap) -> Dict[str, int]:
+        """Count papers per JEL code in ``within`` with one bincount over
+        their code entries, instead of one and_count per code."""
+        ids = within.to_ids()
+        offsets = self.store.jel_offsets
+        if 2 * len(ids) > len(self.store):
+            # Most papers: mask all entries rather than gathering them
+            selected = np.zeros(len(self.store), dtype=bool)
+            selected[ids] = True
+            positions = np.repeat(selected, np.diff(offsets)) & ~self._jel_repeated
+        else:
+            starts = offsets[ids]
+            lengths = offsets[ids + 1] - starts
+            positions = np.arange(lengths.sum()) + np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            positions = positions[~self._jel_repeated[positions]]
+        # Extra (negative) code ids are shifted to start at 0
+        shift = len(self.store.extra_jel_codes)
+        counts = np.bincount(self.store.jel_ids[positions].astype(np.int64) + shift)
+        return {name: int(counts[c + shift]) if c + shift < len(counts) else 0
+                for name, c in self._jel_codes}
+
+
+@lru_cache(maxsize=2)
+def engine_for(index: PaperIndex) -> FilterEngine:
+    """Return the filter engine over ``index``, built once per index (or
+    extended from the engine over the store it was appended to)."""
+    previous = index.store.appended_to()
+    if previous is not None:
+        return FilterEngine(index, engine_for(index_for(previous)))
+    return FilterEngine(index)
+
+
+def get_filter_engine() -> FilterEngine:
+    """Return the filter engine over the current corpus."""
+    return engine_for(get_index())
@@ -0,0 +1,189 @@
+# Memoization of filtered views for truffle.econ
+# Streamlit re-runs the whole script on every widget interaction; these
+# caches live in an imported module, so they survive reruns and make an
+# unchanged filter state cost a dictionary lookup.
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value for ``key`` (or ``default``), counting hit/miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value) -> None:
+        """Store ``value``, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and occupancy."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class BytesLRUCache(LRUCache):
+    """LRUCache of byte strings bounded by entry count and total size.
+
+    Values are sized by ``len`` (so ASCII text such as figure JSON can be
+    stored as str). Values larger than ``max_bytes`` are not stored at all.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 << 20):
+        super().__init__(maxsize)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._data[key] = value
+            self.nbytes += len(value)
+            while len(self._data) > self.maxsize or self.nbytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self) -> None:
+        super().clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        return {**super().stats(), "nbytes": self.nbytes, "max_bytes": self.max_bytes}
+
+
+def filter_key(version: str, journals: Optional[Iterable[str]] = None,
+               year_month: Optional[Tuple[int, int]] = None) -> tuple:
+    """Normalize a filter state into a hashable cache key.
+
+    Journal order does not matter; None (no filter) and an empty selection
+    (match nothing) stay distinct, as in FilterEngine.query.
+    """
+    journals = None if journals is None else tuple(sorted(set(journals)))
+    year_month = None if year_month is None else tuple(year_month)
+    return (version, journals, year_month)
+
+
+class ViewCache:
+    """Caches filtered paper-id arrays and serialized figures per filter state.
+
+    A figure of a large selection is megabytes of JSON, so the figure cache
+    is also bounded by total size (``figure_bytes``).
+    """
+
+    def __init__(self, maxsize: int = 64, figure_bytes: int = 64 << 20):
+        self.ids = LRUCache(maxsize)
+        self.figures = BytesLRUCache(maxsize, figure_bytes)
+
+    def paper_ids(self, engine, journals=None, year_month=None) -> np.ndarray:
+        """Return the (read-only) sorted ids matching a filter state."""
+        key = filter_key(engine.store.version, journals, year_month)
+
+        def compute():
+            ids = engine.query(journals=journals, year_month=year_month).to_ids()
+            ids.flags.writeable = False
+            return ids
+
+        return self.ids.get_or_compute(key, compute)
+
+    def display_ids(self, engine, journals=None, year_month=None) -> np.ndarray:
+        """Return the (read-only) matching ids in journal, title order."""
+        key = ("display",) + filter_key(engine.store.version, journals, year_month)
+
+        def compute():
+            ids = engine.index.sort_for_display(self.paper_ids(engine, journals, year_month))
+            ids.flags.writeable = False
+            return ids
+
+        return self.ids.get_or_compute(key, compute)
+
+    def search_ids(self, engine, query: str, journals=None, year_month=None,
+                   k: int = 200) -> np.ndarray:
+        """Return (read-only) ids of the ``k`` best search hits, best first,
+        restricted to papers matching the filter state."""
+        from .search import search_index_for
+
+        query = " ".join(query.lower().split())
+        key = ("search", query, k) + filter_key(engine.store.version, journals, year_month)
+
+        def compute():
+            allowed = self.paper_ids(engine, journals, year_month)
+            hits = search_index_for(engine.store).search(query, k, allowed)
+            ids = np.array([paper_id for paper_id, _ in hits], dtype=np.int64)
+            ids.flags.writeable = False
+            return ids
+
+        return self.ids.get_or_compute(key, compute)
+
+    def figure_json(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Return cached figure JSON for ``key``, calling ``build`` on a miss.
+
+        ``key`` should start with a ``filter_key`` and include any rendering
+        options that change the figure.
+        """
+        return self.figures.get_or_compute(key, build)
+
+    def stats(self) -> dict:
+        """Return the counters of both caches."""
+        return {"ids": self.ids.stats(), "figures": self.figures.stats()}
+
+    def clear(self) -> None:
+        self.ids.clear()
+        self.figures.clear()
+
+
+@lru_cache(maxsize=None)
+def get_view_cache() -> ViewCache:
+    """Return the process-wide view cache."""
+    return ViewCache()
@@ -0,0 +1,257 @@
+# JEL code co-occurrence for truffle.econ
+# Counts how often two JEL codes are listed on the same paper, as sparse
+# CSR matrices over code ids built with plain NumPy. One matrix is kept per
+# (journal, issue month) slice, so any journal / month filter is answered by
+# summing a few slices, and a single code's row ("related fields") costs
+# O(slices x row length) regardless of corpus size.
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .jel_codes import JEL_CODE_STRIDE, JEL_LETTERS, decode_jel_code, encode_jel_code
+from .store import PaperStore, get_store
+
+# Canonical code ids are letter_index * 100 + number (see encode_jel_code)
+N_CODES = len(JEL_LETTERS) * JEL_CODE_STRIDE
+
+SliceKey = Tuple[str, Tuple[int, int]]
+
+
+class CsrMatrix:
+    """Square sparse count matrix in CSR form.
+
+    Row ``i`` holds columns ``indices[indptr[i]:indptr[i + 1]]`` (sorted)
+    with counts ``data[indptr[i]:indptr[i + 1]]``.
+    """
+
+    __slots__ = ("n", "indptr", "indices", "data")
+
+    def __init__(self, n: int, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def empty(cls, n: int = N_CODES) -> "CsrMatrix":
+        return cls(n, np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int16),
+                   np.zeros(0, dtype=np.int32))
+
+    @classmethod
+    def from_pairs(cls, rows: np.ndarray, cols: np.ndarray, counts: Optional[np.ndarray] = None,
+                   n: int = N_CODES) -> "CsrMatrix":
+        """Build a matrix from (row, col[, count]) entries, summing duplicates."""
+        keys = rows.astype(np.int64) * n + cols
+        if counts is None:
+            keys, counts = np.unique(keys, return_counts=True)
+        else:
+            keys, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts, minlength=len(keys))
+        rows, cols = np.divmod(keys, n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(n, indptr, cols.astype(np.int16), counts.astype(np.int32))
+
+    @classmethod
+    def sum(cls, matrices: Iterable["CsrMatrix"], n: int = N_CODES) -> "CsrMatrix":
+        """Return the element-wise sum of ``matrices``."""
+        matrices = list(matrices)
+        if not matrices:
+            return cls.empty(n)
+        if len(matrices) == 1:
+            return matrices[0]
+        rows = np.concatenate([m.row_ids() for m in matrices])
+        cols = np.concatenate([m.indices for m in matrices])
+        counts = np.concatenate([m.data for m in matrices])
+        return cls.from_pairs(rows, cols, counts, n)
+
+    def row_ids(self) -> np.ndarray:
+        """Return the row of every stored entry."""
+        return np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.indptr))
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (columns, counts) of row ``i``."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def get(self, i: int, j: int) -> int:
+        cols, counts = self.row(i)
+        pos = np.searchsorted(cols, j)
+        return int(counts[pos]) if pos < len(cols) and cols[pos] == j else 0
+
+    def diagonal(self) -> np.ndarray:
+        """Return the diagonal as a dense array."""
+        rows = self.row_ids()
+        diag = np.zeros(self.n, dtype=np.int64)
+        on_diag = rows == self.indices
+        diag[rows[on_diag]] = self.data[on_diag]
+        return diag
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+
+
+def paper_code_pairs(offsets: np.ndarray, code_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (paper, code a, code b) for every ordered pair of codes on one paper.
+
+    ``offsets``/``code_ids`` are CSR-style per paper. Codes outside the
+    canonical range (negative ids) and repeats within a paper are ignored.
+    Pairs include (a, a), so the diagonal counts papers per code.
+    """
+    papers = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    valid = code_ids >= 0
+    papers, codes = papers[valid], code_ids[valid].astype(np.int64)
+    # One entry per (paper, code)
+    order = np.lexsort((codes, papers))
+    papers, codes = papers[order], codes[order]
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (papers[1:] != papers[:-1]) | (codes[1:] != codes[:-1])
+    papers, codes = papers[keep], codes[keep]
+
+    # Pair every entry with every entry of the same paper
+    starts = np.flatnonzero(np.r_[True, papers[1:] != papers[:-1]])
+    sizes = np.diff(np.r_[starts, len(papers)])
+    group_start = np.repeat(starts, sizes)
+    group_size = np.repeat(sizes, sizes)
+    left = np.repeat(np.arange(len(papers)), group_size)
+    within = np.arange(len(left)) - np.repeat(np.cumsum(group_size) - group_size, group_size)
+    right = group_start[left] + within
+    return papers[left], codes[left], codes[right]
+
+
+class CooccurrenceIndex:
+    """Per-(journal, month) JEL co-occurrence matrices.
+
+    ``matrix(journals, year_month)`` sums the matching slices; ``related``
+    reads a single row from each slice. Reads never modify the index, so one
+    instance can serve many threads: ``add`` and ``extended`` fold new pairs
+    into their slices straight away, and ``add`` swaps in a new ``slices``
+    dict rather than changing the one readers may be iterating.
+    """
+
+    def __init__(self, n_codes: int = N_CODES):
+        self.n_codes = n_codes
+        self.slices: Dict[SliceKey, CsrMatrix] = {}
+
+    @classmethod
+    def from_store(cls, store: PaperStore) -> "CooccurrenceIndex":
+        """Count co-occurrences of every paper in ``store``, per slice."""
+        index = cls()
+        for key, rows, cols in _pairs_by_slice(store, 0):
+            index.slices[key] = CsrMatrix.from_pairs(rows, cols, n=index.n_codes)
+        return index
+
+    def extended(self, store: PaperStore, start: int) -> "CooccurrenceIndex":
+        """Return an index over ``store``, whose first ``start`` papers are
+        the ones counted here; this index is left unchanged.
+
+        Only the new papers' pairs are computed, and only the slices they
+        fall in are rebuilt.
+        """
+        index = type(self)(self.n_codes)
+        index.slices = dict(self.slices)
+        for key, rows, cols in _pairs_by_slice(store, start):
+            index._fold(index.slices, key, rows, cols)
+        return index
+
+    def add(self, journal: str, year_month: Tuple[int, int], jel_codes: Iterable[str]) -> None:
+        """Count the JEL codes of one new paper (rebuilds its slice)."""
+        code_ids = np.array([encode_jel_code(c) for c in jel_codes], dtype=np.int64)
+        _, rows, cols = paper_code_pairs(np.array([0, len(code_ids)]), code_ids)
+        slices = dict(self.slices)
+        self._fold(slices, (journal, tuple(year_month)), rows, cols)
+        self.slices = slices
+
+    def _fold(self, slices: Dict[SliceKey, CsrMatrix], key: SliceKey,
+              rows: np.ndarray, cols: np.ndarray) -> None:
+        """Add the (row, col) pairs to slice ``key`` of ``slices``."""
+        if len(rows) == 0 and key in slices:
+            return
+        added = CsrMatrix.from_pairs(rows, cols, n=self.n_codes)
+        current = slices.get(key)
+        slices[key] = added if current is None else CsrMatrix.sum([current, added], self.n_codes)
+
+    def _slice(self, key: SliceKey) -> CsrMatrix:
+        matrix = self.slices.get(key)
+        return CsrMatrix.empty(self.n_codes) if matrix is None else matrix
+
+    def slice_keys(self, journals: Optional[Iterable[str]] = None,
+                   year_month: Optional[Tuple[int, int]] = None) -> List[SliceKey]:
+        """Return the slices matching a filter (None means unfiltered)."""
+        journals = None if journals is None else set(journals)
+        year_month = None if year_month is None else tuple(year_month)
+        return sorted(k for k in self.slices
+                      if (journals is None or k[0] in journals)
+                      and (year_month is None or k[1] == year_month))
+
+    def matrix(self, journals=None, year_month=None) -> CsrMatrix:
+        """Return the co-occurrence counts of papers matching the filter."""
+        return CsrMatrix.sum((self._slice(k) for k in self.slice_keys(journals, year_month)),
+                             self.n_codes)
+
+    def code_row(self, code_id: int, journals=None, year_month=None) -> np.ndarray:
+        """Return the dense co-occurrence counts of one code with every code."""
+        counts = np.zeros(self.n_codes, dtype=np.int64)
+        for key in self.slice_keys(journals, year_month):
+            cols, data = self._slice(key).row(code_id)
+            np.add.at(counts, cols, data)
+        return counts
+
+    def related(self, code: str, k: int = 10, journals=None, year_month=None) -> List[Tuple[str, int]]:
+        """Return up to ``k`` (code, papers) pairs most often listed with ``code``."""
+        code_id = encode_jel_code(code)
+        if code_id < 0:
+            return []
+        counts = self.code_row(code_id, journals, year_month)
+        counts[code_id] = 0
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-counts[candidates], k - 1)[:k]]
+        candidates = candidates[np.lexsort((candidates, -counts[candidates]))]
+        return [(decode_jel_code(c), int(counts[c])) for c in candidates]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(m.nbytes for m in self.slices.values())
+
+
+def _pairs_by_slice(store: PaperStore, start: int):
+    """Yield (slice key, rows, cols) with the code pairs of papers
+    ``start:`` of ``store``, per (journal, month) slice."""
+    offsets = store.jel_offsets[start:]
+    papers, rows, cols = paper_code_pairs(offsets - offsets[0], store.jel_ids[offsets[0]:])
+    month_keys = store.years[start:].astype(np.int64) * 100 + store.months[start:]
+    slice_codes = store.journal_ids[start:].astype(np.int64) * 1_000_000 + month_keys
+    slice_ids, slice_of_paper = np.unique(slice_codes, return_inverse=True)
+
+    # Sort all pairs by slice once, then yield each slice's run
+    pair_slices = slice_of_paper[papers]
+    order = np.argsort(pair_slices, kind="stable")
+    pair_slices, rows, cols = pair_slices[order], rows[order], cols[order]
+    bounds = np.searchsorted(pair_slices, np.arange(len(slice_ids) + 1))
+    for s, code in enumerate(slice_ids):
+        journal_id, month_key = divmod(int(code), 1_000_000)
+        key = (store.journals.get(journal_id), divmod(month_key, 100))
+        yield key, rows[bounds[s]:bounds[s + 1]], cols[bounds[s]:bounds[s + 1]]
+
+
+@lru_cache(maxsize=2)
+def cooccurrence_for(store: PaperStore) -> CooccurrenceIndex:
+    """Return the co-occurrence index over ``store``, built once per store (or
+    extended from the index of the store it was appended to)."""
+    previous = store.appended_to()
+    if previous is not None:
+        return cooccurrence_for(previous).extended(store, len(previous))
+    return CooccurrenceIndex.from_store(store)
+
+
+def get_cooccurrence() -> CooccurrenceIndex:
+    """Return the co-occurrence index over the current corpus."""
+    return cooccurrence_for(get_store())
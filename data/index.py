@@ -0,0 +1,313 @@
+# Inverted indexes over the paper store
+# Maps journal, issue month and JEL code/letter to sorted arrays of paper ids,
+# so filters are answered by intersecting short id lists instead of scanning
+# every paper. An index over a store with appended rows extends the index of
+# the store it was appended to.
+
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .jel_codes import JEL_CODE_STRIDE, JEL_LETTERS, decode_jel_code, encode_jel_code, jel_code_range
+from .store import PaperStore, get_store
+
+ID_DTYPE = np.int32
+EMPTY = np.zeros(0, dtype=ID_DTYPE)
+
+
+def _group_ids(keys: np.ndarray, paper_ids: np.ndarray) -> Dict[int, np.ndarray]:
+    """Group ``paper_ids`` by ``keys`` into sorted, de-duplicated id arrays."""
+    if len(keys) == 0:
+        return {}
+    # Sort by key, then paper id, and drop repeated (key, paper) pairs
+    order = np.lexsort((paper_ids, keys))
+    keys, paper_ids = keys[order], paper_ids[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (paper_ids[1:] != paper_ids[:-1])
+    keys, paper_ids = keys[keep], paper_ids[keep].astype(ID_DTYPE)
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    return {int(keys[s]): paper_ids[s:e] for s, e in zip(starts, ends)}
+
+
+def _extend_postings(old: dict, new: dict) -> dict:
+    """Return ``old`` with the posting lists of ``new`` (all larger ids) appended."""
+    merged = dict(old)
+    for key, ids in new.items():
+        merged[key] = np.concatenate([old[key], ids]) if key in old else ids
+    return merged
+
+
+def intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersect two sorted unique id arrays in O(min * log(max))."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return EMPTY
+    pos = np.searchsorted(b, a)
+    pos[pos == len(b)] = 0
+    return a[b[pos] == a]
+
+
+def union_sorted(arrays: Iterable[np.ndarray], disjoint: bool = False) -> np.ndarray:
+    """Union sorted id arrays into one sorted unique array.
+
+    A stable sort of the concatenation is a run-detecting merge sort, so it
+    merges the k sorted inputs in O(total * log k). ``disjoint`` promises
+    that no id occurs in two inputs (e.g. journals) and skips the
+    de-duplication pass.
+    """
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return EMPTY
+    if len(arrays) == 1:
+        return arrays[0]
+    merged = np.sort(np.concatenate(arrays), kind="stable")
+    if not disjoint:
+        merged = merged[np.r_[True, merged[1:] != merged[:-1]]]
+    return merged
+
+
+def compute_display_rank(store: PaperStore) -> np.ndarray:
+    """Return each paper's position when sorted by (journal, title)."""
+    # Rank journal names and strings once, then sort papers by int keys
+    journal_rank = np.argsort(np.argsort(list(store.journals), kind="stable"))
+    strings = list(store.strings)
+    string_order = sorted(range(len(strings)), key=strings.__getitem__)
+    string_rank = np.empty(len(strings), dtype=np.int64)
+    string_rank[string_order] = np.arange(len(strings))
+
+    order = np.lexsort((string_rank[store.title_ids], journal_rank[store.journal_ids]))
+    rank = np.empty(len(store), dtype=ID_DTYPE)
+    rank[order] = np.arange(len(store), dtype=ID_DTYPE)
+    return rank
+
+
+def _extend_display_rank(store: PaperStore, rank: np.ndarray) -> np.ndarray:
+    """Extend the display ``rank`` of the first papers of ``store`` to all of
+    them, in O(new papers * log(old)) string comparisons."""
+    start = len(rank)
+
+    def key(paper_id):
+        return (store.journals.get(store.journal_ids[paper_id]),
+                store.strings.get(store.title_ids[paper_id]))
+
+    class OldOrder:
+        # The old papers in display order, as sort keys, for bisect
+        order = np.argsort(rank)
+
+        def __len__(self):
+            return start
+
+        def __getitem__(self, position):
+            return key(self.order[position])
+
+    old = OldOrder()
+    # New papers in display order; ties keep id order, as in the full sort
+    new_ids = sorted(range(start, len(store)), key=key)
+    positions = np.array([bisect_right(old, key(i)) for i in new_ids], dtype=np.int64)
+    extended = np.empty(len(store), dtype=ID_DTYPE)
+    extended[:start] = rank + np.searchsorted(positions, rank, side="right")
+    extended[new_ids] = positions + np.arange(len(new_ids))
+    return extended
+
+
+class PaperIndex:
+    """Journal, month and JEL inverted indexes over a PaperStore.
+
+    Every posting list is a sorted int32 array of paper ids. ``previous`` is
+    the index over the store that ``store`` extends (see
+    PaperStore.appended_to); only the rows after it are indexed.
+    """
+
+    def __init__(self, store: PaperStore, previous: Optional["PaperIndex"] = None):
+        self.store = store
+        start = 0 if previous is None else len(previous.store)
+        paper_ids = np.arange(start, len(store), dtype=ID_DTYPE)
+        journal_ids = store.journal_ids[start:]
+        month_keys = store.years[start:].astype(np.int32) * 100 + store.months[start:]
+        jel_offsets = store.jel_offsets[start:]
+        jel_ids = store.jel_ids[jel_offsets[0]:]
+
+        self.by_journal: Dict[str, np.ndarray] = {
+            store.journals.get(j): ids for j, ids in _group_ids(journal_ids, paper_ids).items()
+        }
+        self.by_month: Dict[Tuple[int, int], np.ndarray] = {
+            divmod(key, 100): ids for key, ids in _group_ids(month_keys, paper_ids).items()
+        }
+
+        # One entry per (paper, JEL code) pair
+        jel_papers = np.repeat(paper_ids, np.diff(jel_offsets))
+        self.by_jel_id: Dict[int, np.ndarray] = _group_ids(jel_ids, jel_papers)
+
+        # Letters and two-digit groups: a paper with several codes under one
+        # node is listed once
+        valid = jel_ids >= 0
+        letter_ids = jel_ids[valid] // JEL_CODE_STRIDE
+        self.by_jel_letter: Dict[str, np.ndarray] = {
+            JEL_LETTERS[l]: ids
+            for l, ids in _group_ids(letter_ids, jel_papers[valid]).items()
+        }
+        group_ids = jel_ids[valid] // (JEL_CODE_STRIDE // 10)
+        self.by_jel_group: Dict[str, np.ndarray] = {
+            decode_jel_code(g * 10)[:2]: ids
+            for g, ids in _group_ids(group_ids, jel_papers[valid]).items()
+        }
+
+        if previous is not None:
+            # Appended ids are larger than all previous ones, and extra JEL
+            # codes keep their ids (see segments.append_store)
+            for name in ("by_journal", "by_month", "by_jel_id", "by_jel_letter", "by_jel_group"):
+                setattr(self, name, _extend_postings(getattr(previous, name), getattr(self, name)))
+            if "display_rank" in previous.__dict__:
+                self.display_rank = _extend_display_rank(store, previous.display_rank)
+
+        # Papers per node at each level (letter, group, code), in code order
+        self.jel_counts: Tuple[Dict[str, int], ...] = (
+            {letter: len(ids) for letter, ids in self.by_jel_letter.items()},
+            {group: len(ids) for group, ids in self.by_jel_group.items()},
+            {decode_jel_code(c): len(ids) for c, ids in self.by_jel_id.items() if c >= 0},
+        )
+
+    def __len__(self):
+        return len(self.store)
+
+    def all_ids(self) -> np.ndarray:
+        """Return every paper id."""
+        return np.arange(len(self.store), dtype=ID_DTYPE)
+
+    def journal(self, journal: str) -> np.ndarray:
+        """Return ids of papers in ``journal``."""
+        return self.by_journal.get(journal, EMPTY)
+
+    def month(self, year: int, month: int) -> np.ndarray:
+        """Return ids of papers from the given issue month."""
+        return self.by_month.get((year, month), EMPTY)
+
+    def jel_code(self, code: str) -> np.ndarray:
+        """Return ids of papers tagged with the JEL code ``code``."""
+        code_id = encode_jel_code(code)
+        if code_id < 0:
+            extra = self.store.extra_jel_codes.lookup(code)
+            if extra < 0:
+                return EMPTY
+            code_id = -1 - extra
+        return self.by_jel_id.get(code_id, EMPTY)
+
+    def jel_letter(self, letter: str) -> np.ndarray:
+        """Return ids of papers with at least one code under JEL ``letter``."""
+        return self.by_jel_letter.get(letter.upper(), EMPTY)
+
+    def jel_node(self, node: str) -> np.ndarray:
+        """Return ids of papers with a code under ``node`` ("J", "J3" or "J31")."""
+        node = node.strip().upper()
+        lo, hi = jel_code_range(node)
+        if hi == lo:
+            return EMPTY
+        if len(node) == 1:
+            return self.by_jel_letter.get(node, EMPTY)
+        if len(node) == 2:
+            return self.by_jel_group.get(node, EMPTY)
+        return self.by_jel_id.get(lo, EMPTY)
+
+    def jel_rollup(self, level: int = 1, node: str = "") -> Dict[str, int]:
+        """Count papers per JEL node at one level of the hierarchy.
+
+        ``level`` 0 counts per letter, 1 per two-digit group and 2 per code;
+        ``node`` restricts the counts to one subtree (e.g. level 2 under "J3").
+        """
+        counts = self.jel_counts[level]
+        if not node:
+            return dict(counts)
+        node = node.strip().upper()
+        lo, hi = jel_code_range(node)
+        if hi == lo:
+            return {}
+        if len(node) > level + 1:
+            # A node below ``level`` counts under its ancestor at that level
+            n = len(self.jel_node(node))
+            return {node[:level + 1]: n} if n else {}
+        return {name: n for name, n in counts.items() if name.startswith(node)}
+
+    @cached_property
+    def display_rank(self) -> np.ndarray:
+        """Position of each paper in the (journal, title) display order."""
+        if self.store.display_rank is not None:
+            return self.store.display_rank
+        return compute_display_rank(self.store)
+
+    def sort_for_display(self, ids: np.ndarray) -> np.ndarray:
+        """Return ``ids`` ordered by journal, then title."""
+        return ids[np.argsort(self.display_rank[ids], kind="stable")]
+
+    def months(self):
+        """Return the (year, month) pairs present, newest first."""
+        return sorted(self.by_month, reverse=True)
+
+    def query(self, journals: Optional[Iterable[str]] = None,
+              year_month: Optional[Tuple[int, int]] = None,
+              jel_codes: Optional[Iterable[str]] = None,
+              jel_letters: Optional[Iterable[str]] = None,
+              jel_nodes: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Return sorted ids of papers matching every given filter.
+
+        Within a facet the values are OR-ed (e.g. any of ``journals``);
+        facets are AND-ed together. None leaves a facet unfiltered, while an
+        empty iterable matches nothing. ``jel_nodes`` takes any level of the
+        JEL hierarchy ("C", "J3", "J31").
+        """
+        store = self.store
+        # Each facet is the posting lists it ORs, whether they are disjoint
+        # (a paper has one journal but several codes) and, for one-value
+        # facets, a test of that value on the store's column
+        facets = []
+        if journals is not None:
+            journals = set(journals)
+            journal_ids = [store.journal_id(j) for j in journals]
+            facets.append(([self.journal(j) for j in journals], True,
+                           lambda ids: np.isin(store.journal_ids[ids], journal_ids)))
+        if year_month is not None:
+            year, month = year_month
+            facets.append(([self.month(year, month)], True,
+                           lambda ids: (store.years[ids] == year) & (store.months[ids] == month)))
+        if jel_codes is not None:
+            facets.append(([self.jel_code(c) for c in jel_codes], False, None))
+        if jel_letters is not None:
+            facets.append(([self.jel_letter(l) for l in jel_letters], False, None))
+        if jel_nodes is not None:
+            facets.append(([self.jel_node(n) for n in jel_nodes], False, None))
+
+        if not facets:
+            return self.all_ids()
+        # Only the smallest facet is materialized. The others filter the
+        # (shrinking) result: one-value facets by a column lookup, the rest
+        # by intersecting with each posting list, so every step costs
+        # O(result) or O(result * log) rather than O(corpus)
+        facets.sort(key=lambda facet: sum(map(len, facet[0])))
+        result = union_sorted(facets[0][0], facets[0][1])
+        for parts, disjoint, column_test in facets[1:]:
+            if len(result) == 0:
+                break
+            if column_test is not None:
+                result = result[column_test(result)]
+            else:
+                result = union_sorted([intersect_sorted(result, ids) for ids in parts], disjoint)
+        return result
+
+
+@lru_cache(maxsize=2)
+def index_for(store: PaperStore) -> PaperIndex:
+    """Return the index over ``store``, built once per store (or extended
+    from the index of the store it was appended to)."""
+    previous = store.appended_to()
+    if previous is not None:
+        return PaperIndex(store, index_for(previous))
+    return PaperIndex(store)
+
+
+def get_index() -> PaperIndex:
+    """Return the index over the current corpus store."""
+    return index_for(get_store())
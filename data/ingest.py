@@ -0,0 +1,403 @@
+# Offline ingestion for truffle.econ
+# Fetches the articles of the covered journals from the Crossref REST API
+# and writes them, merged with the current corpus, to the corpus snapshot:
+#
+#   python -m data.ingest 2026-03 [2026-04] [--journal AER] [--record DIR]
+#
+# Requests go through one pooled httpx.AsyncClient (keep-alive connections
+# shared by every journal and page). Each host gets its own semaphore, so
+# at most ``per_host`` requests to it are in flight. Transport errors, 429
+# and 5xx answers are retried with exponential backoff (honouring
+# Retry-After). Every response is recorded (see data/replay.py); a later
+# run sends its ETag / Last-Modified back and reuses the recorded body on
+# 304 Not Modified. The same recordings replay through FixtureServer, so
+# a run can be repeated offline with --base-url.
+#
+# Crossref carries no JEL classification; codes are taken from "subject"
+# entries that are JEL codes and from a trailing "(JEL ...)" in the
+# abstract (AEA journals). Papers already in the corpus keep their codes
+# when the fetched record has none.
+
+import argparse
+import asyncio
+import html
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .jel_codes import JEL_CODES
+from .papers import JOURNAL_ABBREVIATIONS, Paper
+from .replay import Recording, request_key
+from .store import PaperStore, snapshot_path
+
+CROSSREF_URL = "https://api.crossref.org"
+
+# Print ISSNs of the covered journals, as used by Crossref's /journals route
+JOURNAL_ISSNS = {
+    "American Economic Review": "0002-8282",
+    "Quarterly Journal of Economics": "0033-5533",
+    "Econometrica": "0012-9682",
+    "Journal of Political Economy": "0022-3808",
+    "Review of Economic Studies": "0034-6527",
+}
+
+# Default location of recorded responses (the validator cache)
+DEFAULT_RECORDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ingest-cache")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 60.0
+PAGE_ROWS = 100
+
+YearMonth = Tuple[int, int]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_JEL_CODE_RE = re.compile(r"^[A-Z]\d{2}$")
+_ABSTRACT_JEL_RE = re.compile(r"\s*\(?\bJEL(?:\s+codes?)?:?\s+([A-Z]\d{1,2}(?:\s*[,;]\s*[A-Z]\d{1,2})*)\)?\.?\s*$")
+
+
+class IngestError(RuntimeError):
+    """Raised when a request still fails after all retries."""
+
+
+class Fetcher:
+    """Pooled, rate-limited JSON fetcher with retries and conditional requests.
+
+    Use as an async context manager. ``recording`` (a directory or
+    Recording) stores every response and supplies validators for
+    If-None-Match / If-Modified-Since. ``transport`` is passed to httpx,
+    e.g. to route requests to an in-process app.
+    """
+
+    def __init__(self, base_url: str = CROSSREF_URL, recording=None, per_host: int = 4,
+                 max_connections: int = 16, retries: int = 4, backoff: float = 0.5,
+                 timeout: float = 30.0, mailto: Optional[str] = None, transport=None):
+        self.base_url = base_url.rstrip("/")
+        self.recording = Recording(recording) if isinstance(recording, str) else recording
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.mailto = mailto
+        self.requests = 0
+        self.not_modified = 0
+        self.retried = 0
+        self._limits = httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections)
+        self._timeout = timeout
+        self._transport = transport
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        # Crossref routes clients that identify themselves to its "polite" pool
+        agent = "truffle.econ ingest" + (f" (mailto:{self.mailto})" if self.mailto else "")
+        self._client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout,
+                                         headers={"User-Agent": agent}, transport=self._transport)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._client = None
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return self.backoff * 2 ** attempt
+
+    async def get_json(self, path: str, params: Optional[dict] = None):
+        """GET ``base_url + path`` and return the decoded JSON body."""
+        params = dict(params or {})
+        if self.mailto:
+            params["mailto"] = self.mailto
+        url = str(httpx.URL(self.base_url + path, params=params))
+        key = request_key(url)
+        cached = self.recording.get(key) if self.recording is not None else None
+        headers = {}
+        if cached is not None and cached["status"] == 200:
+            if "etag" in cached["headers"]:
+                headers["If-None-Match"] = cached["headers"]["etag"]
+            if "last-modified" in cached["headers"]:
+                headers["If-Modified-Since"] = cached["headers"]["last-modified"]
+
+        semaphore = self._semaphore(urlsplit(url).netloc)
+        for attempt in range(self.retries + 1):
+            response, error = None, None
+            async with semaphore:
+                self.requests += 1
+                try:
+                    response = await self._client.get(url, headers=headers)
+                except httpx.TransportError as e:
+                    error = e
+            if response is not None and response.status_code == 304 and headers:
+                self.not_modified += 1
+                return json.loads(cached["body"])
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            if attempt == self.retries:
+                reason = error if response is None else f"HTTP {response.status_code}"
+                raise IngestError(f"GET {url} failed after {attempt + 1} attempts: {reason}")
+            # Back off outside the semaphore so other requests can proceed
+            self.retried += 1
+            await asyncio.sleep(self._delay(attempt, response))
+
+        if response.status_code != 200:
+            raise IngestError(f"GET {url} returned HTTP {response.status_code}")
+        if self.recording is not None:
+            self.recording.put(key, response.status_code, dict(response.headers), response.text)
+        return response.json()
+
+
+def _clean_text(text: str) -> str:
+    """Strip JATS / HTML markup and collapse whitespace."""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", text)).split())
+
+
+def _date_parts(item: dict) -> Optional[YearMonth]:
+    """Return the issue (year, month) of a Crossref work, if known."""
+    for field in ("journal-issue", "published-print", "issued", "published"):
+        source = item.get(field)
+        if field == "journal-issue":
+            source = (source or {}).get("published-print")
+        parts = ((source or {}).get("date-parts") or [[]])[0]
+        if len(parts) >= 2 and parts[0] and parts[1]:
+            return int(parts[0]), int(parts[1])
+    return None
+
+
+def _author_name(author: dict) -> Optional[str]:
+    if author.get("name"):
+        return author["name"]
+    name = " ".join(p for p in (author.get("given"), author.get("family")) if p)
+    return name or None
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_jel_codes(item: dict, abstract: str) -> Tuple[List[str], str]:
+    """Return (JEL codes, abstract without its JEL line) for a Crossref work."""
+    codes = [s.strip().upper() for s in item.get("subject", [])
+             if _JEL_CODE_RE.match(s.strip().upper())]
+    match = _ABSTRACT_JEL_RE.search(abstract)
+    if match:
+        codes.extend(c.strip() for c in re.split(r"[,;]", match.group(1)))
+        abstract = abstract[:match.start()].rstrip()
+    codes = [c for c in dict.fromkeys(codes) if c in JEL_CODES]
+    return codes, abstract
+
+
+def parse_crossref_work(item: dict, journal: str) -> Optional[Paper]:
+    """Convert one Crossref work into a Paper (None for non-articles).
+
+    Front matter, errata and other items without authors or an issue date
+    are skipped.
+    """
+    title = _clean_text(" ".join(item.get("title") or []))
+    authors = [a for a in map(_author_name, item.get("author") or []) if a]
+    year_month = _date_parts(item)
+    if not title or not authors or year_month is None:
+        return None
+    abstract = _clean_text(item.get("abstract") or "")
+    if abstract.lower().startswith("abstract "):
+        abstract = abstract[len("abstract "):]
+    jel_codes, abstract = extract_jel_codes(item, abstract)
+    doi = item.get("DOI")
+    return Paper(
+        title=title,
+        authors=authors,
+        journal=journal,
+        jel_codes=jel_codes,
+        abstract=abstract,
+        url=f"https://doi.org/{doi}" if doi else item.get("URL", ""),
+        year=year_month[0],
+        month=year_month[1],
+        volume=_int_or_none(item.get("volume")),
+        issue=_int_or_none(item.get("issue")),
+        pages=item.get("page"),
+        doi=doi.lower() if doi else None,
+    )
+
+
+def parse_crossref_works(payload: dict, journal: str) -> List[Paper]:
+    """Parse a Crossref /works response page into Papers."""
+    items = payload.get("message", {}).get("items", [])
+    return [p for p in (parse_crossref_work(item, journal) for item in items) if p is not None]
+
+
+def _month_filter(since: YearMonth, until: YearMonth) -> str:
+    return (f"from-pub-date:{since[0]}-{since[1]:02d},until-pub-date:{until[0]}-{until[1]:02d},"
+            "type:journal-article")
+
+
+async def fetch_journal(fetcher: Fetcher, journal: str, since: YearMonth, until: YearMonth,
+                        rows: int = PAGE_ROWS) -> List[Paper]:
+    """Fetch the papers of one journal with an issue date in [since, until]."""
+    path = f"/journals/{JOURNAL_ISSNS[journal]}/works"
+    params = {"filter": _month_filter(since, until), "rows": rows}
+    first = await fetcher.get_json(path, {**params, "offset": 0})
+    total = first.get("message", {}).get("total-results", 0)
+    # Offsets (not cursors) keep page URLs stable, so validators stay usable
+    pages = [first] + await asyncio.gather(*(
+        fetcher.get_json(path, {**params, "offset": offset})
+        for offset in range(rows, total, rows)
+    ))
+    papers = [p for page in pages for p in parse_crossref_works(page, journal)]
+    return [p for p in papers if since <= (p.year, p.month) <= until]
+
+
+async def fetch_papers(since: YearMonth, until: YearMonth, journals: Optional[Iterable[str]] = None,
+                       **fetcher_params) -> Tuple[List[Paper], Fetcher]:
+    """Fetch every journal concurrently; return (papers, fetcher with its counters)."""
+    journals = list(JOURNAL_ISSNS) if journals is None else list(journals)
+    async with Fetcher(**fetcher_params) as fetcher:
+        results = await asyncio.gather(*(fetch_journal(fetcher, j, since, until) for j in journals))
+    return [p for papers in results for p in papers], fetcher
+
+
+def merge_papers(existing: Iterable[Paper], fetched: Iterable[Paper]) -> List[Paper]:
+    """Merge fetched papers into the corpus, matching on DOI (ignoring case),
+    else on journal, issue month and title (see segments.paper_key).
+
+    A fetched paper with a DOI also matches a stored copy without one.
+    Fetched records replace existing ones in place, except that existing
+    JEL codes are kept when the fetched record has none.
+    """
+    from .segments import paper_key
+    papers: List[Paper] = []
+    positions: Dict[tuple, int] = {}
+
+    def put(paper: Paper, replace_codes: bool) -> None:
+        key = paper_key(paper.doi, paper.journal, paper.year, paper.month, paper.title)
+        title_key = paper_key(None, paper.journal, paper.year, paper.month, paper.title)
+        position = positions.get(key, positions.get(title_key))
+        if position is None:
+            position = len(papers)
+            papers.append(paper)
+        else:
+            if replace_codes and not paper.jel_codes:
+                paper.jel_codes = list(papers[position].jel_codes)
+            papers[position] = paper
+        positions[key] = position
+
+    for paper in existing:
+        put(paper, False)
+    for paper in fetched:
+        put(paper, True)
+    return papers
+
+
+def current_papers(path: str) -> List[Paper]:
+    """Return the papers of the snapshot at ``path``, or PAPERS_2026 if there is none."""
+    if os.path.exists(path):
+        from .snapshot import load_snapshot
+        store = load_snapshot(path)
+    else:
+        from .papers import PAPERS_2026
+        store = PaperStore.from_papers(PAPERS_2026)
+    return [store.to_paper(i) for i in range(len(store))]
+
+
+def ingest(since: YearMonth, until: YearMonth, journals: Optional[Iterable[str]] = None,
+           path: Optional[str] = None, **fetcher_params) -> Tuple[PaperStore, Fetcher]:
+    """Fetch papers, merge them into the corpus and write the snapshot atomically."""
+    from .snapshot import write_snapshot
+    path = snapshot_path() if path is None else path
+    fetched, fetcher = asyncio.run(fetch_papers(since, until, journals, **fetcher_params))
+    store = PaperStore.from_papers(merge_papers(current_papers(path), fetched))
+    write_snapshot(store, path)
+    return store, fetcher
+
+
+def ingest_segment(since: YearMonth, until: YearMonth, journals: Optional[Iterable[str]] = None,
+                   directory: Optional[str] = None, **fetcher_params):
+    """Fetch papers and append those not yet in the corpus as a new segment.
+
+    Costs O(fetched papers): existing segments are neither read nor
+    rewritten. Papers already present are skipped rather than replaced;
+    they are matched on DOI (ignoring case), or on journal, issue month
+    and title against stored papers that have no DOI. Returns (corpus,
+    fetcher).
+    """
+    from .segments import SegmentedCorpus, paper_key, segments_path
+    corpus = SegmentedCorpus.open(segments_path() if directory is None else directory)
+    fetched, fetcher = asyncio.run(fetch_papers(since, until, journals, **fetcher_params))
+    known = set(corpus.paper_keys())
+    new = []
+    for paper in fetched:
+        key = paper_key(paper.doi, paper.journal, paper.year, paper.month, paper.title)
+        title_key = paper_key(None, paper.journal, paper.year, paper.month, paper.title)
+        if key not in known and title_key not in known:
+            known.add(key)
+            new.append(paper)
+    corpus.append(new)
+    return corpus, fetcher
+
+
+def _year_month(text: str) -> YearMonth:
+    try:
+        year, month = (int(p) for p in text.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {text!r}")
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"month out of range in {text!r}")
+    return year, month
+
+
+def _journal(text: str) -> str:
+    names = {**{a.lower(): j for j, a in JOURNAL_ABBREVIATIONS.items()},
+             **{j.lower(): j for j in JOURNAL_ISSNS}}
+    if text.lower() not in names:
+        raise argparse.ArgumentTypeError(f"unknown journal {text!r}")
+    return names[text.lower()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch journal articles into the corpus snapshot.")
+    parser.add_argument("since", type=_year_month, help="first issue month, YYYY-MM")
+    parser.add_argument("until", type=_year_month, nargs="?", help="last issue month (default: since)")
+    parser.add_argument("--journal", type=_journal, action="append",
+                        help="journal name or abbreviation (repeatable; default: all)")
+    parser.add_argument("--snapshot", help="snapshot to update (default: TRUFFLE_SNAPSHOT or data/corpus.snap)")
+    parser.add_argument("--segment", nargs="?", const="", metavar="DIR",
+                        help="append a segment to DIR (default: TRUFFLE_SEGMENTS or data/corpus.d) "
+                             "instead of rewriting the snapshot")
+    parser.add_argument("--base-url", default=CROSSREF_URL, help="API root, e.g. a data.replay server")
+    parser.add_argument("--record", default=DEFAULT_RECORDING, help="directory of recorded responses")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent requests per host")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--mailto", help="contact address sent to Crossref")
+    args = parser.parse_args(argv)
+
+    until = args.until or args.since
+    fetcher_params = dict(base_url=args.base_url, recording=args.record, per_host=args.per_host,
+                          retries=args.retries, mailto=args.mailto)
+    if args.segment is not None:
+        corpus, fetcher = ingest_segment(args.since, until, args.journal, args.segment or None,
+                                         **fetcher_params)
+        corpus.wait_for_compaction()
+        size = f"{len(corpus)} papers in {len(corpus.segments)} segments"
+    else:
+        store, fetcher = ingest(args.since, until, args.journal, args.snapshot, **fetcher_params)
+        size = f"{len(store)} papers"
+    print(f"{fetcher.requests} requests ({fetcher.not_modified} not modified, {fetcher.retried} retried); "
+          f"corpus now has {size}")
+
+
+if __name__ == "__main__":
+    main()
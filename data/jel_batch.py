@@ -0,0 +1,96 @@
+# Vectorized JEL code parsing for truffle.econ
+# parse_jel_codes decodes many code strings at once with NumPy, giving the
+# same results as parse_jel_code / encode_jel_code in data.jel_codes (which
+# re-exports it, keeping NumPy off the import path of plain lookups).
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from .jel_codes import (
+    JEL_CODES, JEL_CODE_STRIDE, JEL_LETTERS, _LETTER_INDEX, encode_jel_code, parse_jel_code
+)
+
+
+@dataclass
+class JelCodeBatch:
+    """Parsed JEL codes, one array entry per input string.
+
+    ``letters`` and ``numbers`` match ``parse_jel_code`` element by element
+    (numbers beyond the int64 range saturate, and a NUL letter reads back as
+    "" since NumPy strings cannot end in NUL). ``code_ids`` match
+    ``encode_jel_code`` (-1 where ``valid`` is False), and ``known`` marks
+    codes present in JEL_CODES.
+    """
+    codes: np.ndarray
+    letters: np.ndarray
+    letter_idx: np.ndarray
+    numbers: np.ndarray
+    code_ids: np.ndarray
+    valid: np.ndarray
+    known: np.ndarray
+
+    def __len__(self):
+        return len(self.codes)
+
+    def unknown_codes(self) -> list:
+        """Return the distinct input codes that are not in JEL_CODES."""
+        return sorted(set(self.codes[~self.known].tolist()))
+
+
+_KNOWN_CODE_IDS = np.array(sorted(encode_jel_code(c) for c in JEL_CODES), dtype=np.int16)
+_INT64_MAX = np.iinfo(np.int64).max
+# ASCII code point -> JEL letter index (-1 for anything else)
+_LETTER_TABLE = np.full(128, -1, dtype=np.int8)
+_LETTER_TABLE[[ord(letter) for letter in JEL_LETTERS]] = np.arange(len(JEL_LETTERS))
+
+def parse_jel_codes(codes: Iterable[str]) -> JelCodeBatch:
+    """Parse many JEL code strings at once.
+
+    Plain codes (a letter followed by up to 18 ASCII digits, with optional
+    surrounding whitespace) are decoded with array arithmetic. Anything else
+    (signs, underscores, non-ASCII text, NUL characters) goes through
+    ``parse_jel_code`` so the results are always identical to it.
+    """
+    codes = list(codes)
+    raw = np.array(codes, dtype=str) if codes else np.zeros(0, dtype="<U1")
+    n = len(raw)
+    stripped = np.char.strip(raw)
+    lengths = np.char.str_len(stripped)
+
+    # Upper-case ASCII on the code points; other text takes the slow path
+    width = max(stripped.dtype.itemsize // 4, 1)
+    points = np.ascontiguousarray(stripped).view(np.uint32).reshape(n, width).copy()
+    points[(points >= ord("a")) & (points <= ord("z"))] -= ord("a") - ord("A")
+    cleaned = points.view(stripped.dtype).reshape(n)
+    letters = cleaned.astype("<U1")
+    letter_idx = _LETTER_TABLE[np.minimum(points[:, 0], 127)] if n else np.zeros(0, dtype=np.int8)
+
+    # Fast path: every character after the letter is an ASCII digit
+    digits = points[:, 1:].astype(np.int64) - ord("0")
+    positions = np.arange(width - 1)
+    in_code = positions < (lengths - 1)[:, None]
+    is_digit = (digits >= 0) & (digits <= 9)
+    fast = (lengths <= 19) & np.all(is_digit | ~in_code, axis=1) & (points.max(axis=1, initial=0) < 128)
+    # Digit weights 10^k counted back from each code's last character
+    powers = np.where(in_code, (lengths - 2)[:, None] - positions, 0)
+    numbers = np.where(in_code & fast[:, None], digits * 10 ** powers, 0).sum(axis=1)
+    # encode_jel_code only accepts canonical spellings such as "J31"
+    canonical = (lengths == 3) & (raw == cleaned) & (np.char.str_len(raw) == 3)
+
+    # NumPy drops trailing NULs when building the array, so re-check those
+    slow = np.flatnonzero(~fast)
+    if "\0" in "".join(codes):
+        slow = np.union1d(slow, [i for i, c in enumerate(codes) if "\0" in c])
+    for i in slow:
+        letter, number = parse_jel_code(codes[i])
+        letters[i] = letter
+        letter_idx[i] = _LETTER_INDEX.get(letter, -1)
+        numbers[i] = min(max(number, -_INT64_MAX), _INT64_MAX)
+        canonical[i] = encode_jel_code(codes[i]) >= 0
+
+    valid = canonical & (letter_idx >= 0) & (numbers >= 0) & (numbers < JEL_CODE_STRIDE)
+    code_ids = np.where(valid, letter_idx.astype(np.int16) * JEL_CODE_STRIDE + numbers, -1).astype(np.int16)
+    known = valid & np.isin(code_ids, _KNOWN_CODE_IDS)
+    return JelCodeBatch(raw, letters, letter_idx, numbers, code_ids, valid, known)
@@ -1,6 +1,8 @@
 # JEL Classification Codes Database
 # Source: American Economic Association https://www.aeaweb.org/econlit/jelCodes.php
 
+from functools import lru_cache
+
 JEL_CATEGORIES = {
     "A": "General Economics and Teaching",
     "B": "History of Economic Thought, Methodology, and Heterodox Approaches",
@@ -947,3 +949,74 @@ def parse_jel_code(code: str) -> tuple:
 
 # All valid JEL letters (in order)
 JEL_LETTERS = list("ABCDEFGHIJKLMNOPQRYZ")
+
+# Integer JEL code ids: letter position in JEL_LETTERS * 100 + subcode number.
+# Ids sort in the same order as the codes and fit comfortably in an int16.
+JEL_CODE_STRIDE = 100
+_LETTER_INDEX = {letter: i for i, letter in enumerate(JEL_LETTERS)}
+
+def encode_jel_code(code: str) -> int:
+    """Return the integer id of a JEL code, or -1 if it is not of the form A00-Z99."""
+    letter, number = parse_jel_code(code)
+    if letter not in _LETTER_INDEX or not 0 <= number < JEL_CODE_STRIDE:
+        return -1
+    # Only canonical spellings round-trip through decode_jel_code
+    if code != f"{letter}{number:02d}":
+        return -1
+    return _LETTER_INDEX[letter] * JEL_CODE_STRIDE + number
+
+def decode_jel_code(code_id: int) -> str:
+    """Return the JEL code string for an id produced by encode_jel_code."""
+    letter_idx, number = divmod(int(code_id), JEL_CODE_STRIDE)
+    return f"{JEL_LETTERS[letter_idx]}{number:02d}"
+
+# JEL hierarchy: letter ("J") > two-digit group ("J3") > code ("J31").
+# Every node covers a contiguous range of code ids, so "all codes under J3"
+# is the id range [J30, J40).
+
+def jel_code_range(node: str) -> tuple:
+    """Return the half-open code-id range [lo, hi) covered by a JEL node.
+
+    ``node`` is a letter ("J"), a two-digit group ("J3") or a full code
+    ("J31"). Unknown nodes give an empty range.
+    """
+    node = node.strip().upper()
+    letter_idx = _LETTER_INDEX.get(node[:1])
+    digits = node[1:]
+    if letter_idx is None or len(digits) > 2 or not (digits == "" or digits.isdigit()):
+        return (0, 0)
+    width = JEL_CODE_STRIDE // 10 ** len(digits)
+    lo = letter_idx * JEL_CODE_STRIDE + (int(digits) * width if digits else 0)
+    return (lo, lo + width)
+
+def jel_parent(node: str):
+    """Return the parent of a JEL node ("J31" -> "J3" -> "J"), or None for a letter."""
+    node = node.strip().upper()
+    return node[:-1] if len(node) > 1 else None
+
+@lru_cache(maxsize=1)
+def _build_children():
+    """Child nodes of every letter and two-digit group present in JEL_CODES."""
+    children = {}
+    for code in JEL_CODES:
+        node = code
+        while len(node) > 1:
+            parent = node[:-1]
+            children.setdefault(parent, set()).add(node)
+            node = parent
+    return {node: sorted(kids) for node, kids in children.items()}
+
+def jel_children(node: str) -> list:
+    """Return the known child nodes of a JEL node, in code order."""
+    return _build_children().get(node.strip().upper(), [])
+
+
+def __getattr__(name):
+    # JEL_CHILDREN is built on first use. Batch parsing needs NumPy, so it
+    # lives in data.jel_batch and is only imported when used
+    if name == "JEL_CHILDREN":
+        return _build_children()
+    if name in ("JelCodeBatch", "parse_jel_codes"):
+        from . import jel_batch
+        return getattr(jel_batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,214 @@
+# Recorded HTTP responses for truffle.econ ingestion
+# The ingestion fetcher (data/ingest.py) keeps every response it receives
+# in a directory, one JSON file per request:
+#
+#   {"key": "/journals/0002-8282/works?offset=0&rows=100", "status": 200,
+#    "headers": {"etag": ..., "last-modified": ..., "content-type": ...},
+#    "body": "..."}
+#
+# The same files serve as the validator cache for conditional requests and
+# as test fixtures: FixtureServer replays a directory over a local HTTP
+# server, answering If-None-Match / If-Modified-Since with 304 and
+# optionally failing the first requests to exercise retries.
+#
+#   python -m data.replay DIR [--port 8765]
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Response headers kept in a recording
+KEPT_HEADERS = ("etag", "last-modified", "content-type", "retry-after")
+
+
+def request_key(url: str) -> str:
+    """Return the host-independent key of a GET request: path plus sorted query."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return parts.path + ("?" + query if query else "")
+
+
+class Recording:
+    """A directory of recorded responses addressed by ``request_key``."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the recorded response for ``key``, or None."""
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: str) -> None:
+        """Record a response, replacing any earlier one atomically."""
+        os.makedirs(self.path, exist_ok=True)
+        entry = {
+            "key": key,
+            "status": status,
+            "headers": {k: headers[k] for k in KEPT_HEADERS if k in headers},
+            "body": body,
+        }
+        path = self._file(key)
+        tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def entries(self) -> List[dict]:
+        """Return every recorded response."""
+        if not os.path.isdir(self.path):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.path, name), encoding="utf-8") as f:
+                    entries.append(json.load(f))
+        return entries
+
+
+def _not_modified(entry: dict, request_headers) -> bool:
+    """Return True if a conditional request's validators match ``entry``."""
+    etag = entry["headers"].get("etag")
+    if_none_match = request_headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag is not None and etag in [t.strip() for t in if_none_match.split(",")]
+    last_modified = entry["headers"].get("last-modified")
+    if_modified_since = request_headers.get("If-Modified-Since")
+    if last_modified and if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class FixtureServer:
+    """Serve a Recording over HTTP on localhost, in a background thread.
+
+    Use as a context manager; ``url`` is the base URL to fetch from.
+    ``fail_first`` requests per key get a 503 before the recording is
+    served, and every response is delayed by ``delay`` seconds. The server
+    counts requests, 304s and the peak number of requests in flight.
+    """
+
+    def __init__(self, recording, port: int = 0, fail_first: int = 0, delay: float = 0.0):
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self.fail_first = fail_first
+        self.delay = delay
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _respond(self):
+                key = request_key(self.path)
+                with server._lock:
+                    failures = server._failures.get(key, 0)
+                    if failures < server.fail_first:
+                        server._failures[key] = failures + 1
+                if failures < server.fail_first:
+                    return self._send(503, {"retry-after": "0"}, b"")
+                entry = server.recording.get(key)
+                if entry is None:
+                    return self._send(404, {}, b"")
+                if entry["status"] == 200 and _not_modified(entry, self.headers):
+                    with server._lock:
+                        server.not_modified += 1
+                    headers = {k: v for k, v in entry["headers"].items() if k != "content-type"}
+                    return self._send(304, headers, b"")
+                return self._send(entry["status"], entry["headers"], entry["body"].encode("utf-8"))
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded ingestion responses on localhost.")
+    parser.add_argument("path", help="recording directory (see data.ingest --record)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0,
+                        help="answer the first N requests per URL with 503")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    args = parser.parse_args(argv)
+
+    server = FixtureServer(args.path, args.port, args.fail_first, args.delay)
+    print(f"serving {len(server.recording.entries())} responses from {args.path} at {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+# Full-text search over paper titles and abstracts
+# An inverted index with BM25 ranking. Postings are stored per term as
+# delta-encoded paper ids (in the narrowest unsigned dtype that fits) plus
+# term frequencies, all in a few flat NumPy arrays. Newly added papers go to
+# a small in-memory segment that is searched alongside the frozen postings
+# and folded into them by compact(). Since paper ids only grow, new postings
+# are merged in by appending to each term's list, never by re-sorting.
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .store import PaperStore, get_store
+
+# Title terms count this many times, so title matches rank higher
+TITLE_WEIGHT = 2
+
+# Papers tokenized per batch by SearchIndex.from_store
+BUILD_BATCH = 1 << 15
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Bytes table mapping everything but [a-z0-9] to a space: on lower-cased,
+# ASCII-encoded text, ``translate(...).split()`` finds the same tokens as
+# _TOKEN_RE (non-ASCII characters are encoded as "?", a separator)
+_SEPARATORS = bytes(c if chr(c) in "abcdefghijklmnopqrstuvwxyz0123456789" else 32 for c in range(256))
+_PAPER_BREAK = b" | "
+_BREAK_ID = -2
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because
+been before being below between both but by can could did do does doing down
+during each few for from further had has have having here how however i if in
+into is it its itself more most much no nor not of off on once only or other
+our out over own same should so some such than that the their them then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your
+""".split())
+
+# (suffix, replacement, minimum stem length) tried in order, first match wins
+_SUFFIXES = (
+    ("ational", "ate", 2), ("ization", "ize", 2), ("fulness", "ful", 2),
+    ("iveness", "ive", 2), ("ousness", "ous", 2), ("ations", "ate", 2),
+    ("ation", "ate", 2), ("ities", "ity", 2), ("ments", "ment", 2),
+    ("ness", "", 3), ("ings", "", 3), ("ing", "", 3), ("ies", "y", 2),
+    ("sses", "ss", 1), ("ied", "y", 2), ("edly", "", 3), ("ed", "", 3),
+    ("ly", "", 3), ("es", "", 3), ("s", "", 3),
+)
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    """Reduce an English word to a crude stem (a small Porter-style stripper)."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement, min_stem in _SUFFIXES:
+        if word.endswith(suffix):
+            base = word[:-len(suffix)]
+            if len(base) < min_stem or (suffix == "s" and word.endswith(("ss", "us", "is"))):
+                continue
+            return base + replacement
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-case, split, drop stopwords and stem ``text``."""
+    if not text:
+        return []
+    return [stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _narrow_uint(values: np.ndarray) -> np.ndarray:
+    """Return ``values`` in the smallest unsigned dtype that holds them."""
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values.astype(np.uint64)
+
+
+class SearchIndex:
+    """BM25 inverted index over title + abstract text.
+
+    Frozen postings are CSR-style: the entries of term ``t`` are
+    ``offsets[t]:offsets[t + 1]`` of ``deltas`` (paper-id gaps, the first
+    one being the id itself) and ``tfs`` (term frequencies). ``last_ids``
+    holds each term's largest frozen paper id (0 if none).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.terms: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.deltas = np.zeros(0, dtype=np.uint8)
+        self.tfs = np.zeros(0, dtype=np.uint8)
+        self.last_ids = np.zeros(0, dtype=np.int64)
+        # Papers added since the last compact(): flat (term id, paper id, tf)
+        self._pending_terms: List[int] = []
+        self._pending_ids: List[int] = []
+        self._pending_tfs: List[int] = []
+        self._pending_by_term: Dict[int, List[int]] = {}
+        # Lengths of pending papers; frozen ones are in _lengths
+        self._doc_lengths: Dict[int, int] = {}
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._total_length = 0
+        self._n_docs = 0
+        self._last_id = -1
+
+    @classmethod
+    def from_store(cls, store: PaperStore, start: int = 0, **params) -> "SearchIndex":
+        """Index the title and abstract of every paper in ``store`` (from
+        paper ``start`` on; earlier ids are left out).
+
+        Builds the frozen postings directly rather than add()-ing papers one
+        by one: each distinct word is stemmed once, and the (term, paper)
+        frequencies are counted by sorting one key per token.
+        """
+        index = cls(**params)
+        index._index_rows(store, start)
+        return index
+
+    def extended(self, store: PaperStore) -> "SearchIndex":
+        """Return an index over ``store``, whose first papers are the ones
+        indexed here; only the papers after them are tokenized.
+
+        This index is left unchanged. Papers add()-ed since the last
+        compact() are not carried over, so compact() first.
+        """
+        if self._pending_ids:
+            raise ValueError("SearchIndex has pending papers; compact() before extending it")
+        index = type(self)(self.k1, self.b)
+        index.terms = dict(self.terms)
+        index.offsets, index.deltas, index.tfs, index.last_ids = self.offsets, self.deltas, self.tfs, self.last_ids
+        index._lengths, index._total_length, index._n_docs = self._lengths, self._total_length, self._n_docs
+        index._index_rows(store, self._last_id + 1)
+        return index
+
+    def _index_rows(self, store: PaperStore, start: int) -> None:
+        """Index papers ``start:`` of ``store`` into the frozen postings."""
+        n = len(store)
+        # Raw word (bytes) -> term id, or -1 for a stopword
+        word_terms: Dict[bytes, int] = {}
+        pairs = []
+        for lo in range(start, n, BUILD_BATCH):
+            hi = min(lo + BUILD_BATCH, n)
+            keys = [self._token_keys(store, store.abstract_ids[lo:hi], lo, word_terms)]
+            title_keys = self._token_keys(store, store.title_ids[lo:hi], lo, word_terms)
+            keys.extend([title_keys] * TITLE_WEIGHT)
+            # Sorted (term, paper) keys; the run length of a key is its tf
+            keys = np.sort(np.concatenate(keys))
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else keys
+            pairs.append((keys[starts], np.diff(np.r_[starts, len(keys)])))
+
+        keys = np.concatenate([k for k, _ in pairs]) if pairs else np.zeros(0, dtype=np.int64)
+        tfs = np.concatenate([t for _, t in pairs]) if pairs else np.zeros(0, dtype=np.int64)
+        # Batches cover disjoint papers, so the keys are unique; order by term
+        order = np.argsort(keys, kind="stable")
+        term_ids, ids = np.divmod(keys[order], max(n, 1))
+        self._append_postings(term_ids, ids, tfs[order])
+
+        lengths = np.bincount(ids - start, weights=tfs[order], minlength=n - start)
+        skipped = np.zeros(start - len(self._lengths), dtype=np.float32)
+        self._lengths = np.concatenate([self._lengths, skipped, lengths.astype(np.float32)])
+        self._total_length += int(lengths.sum())
+        self._n_docs += n - start
+        self._last_id = n - 1
+
+    def _token_keys(self, store: PaperStore, string_ids: np.ndarray, first_id: int,
+                    word_terms: Dict[bytes, int]) -> np.ndarray:
+        """Return ``term_id * len(store) + paper_id`` for every indexed token
+        of the strings ``string_ids`` (papers ``first_id``, ``first_id + 1``, ...)."""
+        # One split over the whole batch, with a _PAPER_BREAK word between papers
+        words = _PAPER_BREAK.join((text or "").lower().encode("ascii", "replace").translate(_SEPARATORS)
+                                  for text in map(store.strings.get, string_ids.tolist())).split()
+        word_terms.setdefault(_PAPER_BREAK.strip(), _BREAK_ID)
+        for word in set(words).difference(word_terms):
+            text = word.decode("ascii")
+            word_terms[word] = -1 if text in STOPWORDS else self.terms.setdefault(stem(text), len(self.terms))
+        term_ids = np.fromiter(map(word_terms.__getitem__, words), dtype=np.int64, count=len(words))
+        paper_ids = np.cumsum(term_ids == _BREAK_ID) + first_id
+        keep = term_ids >= 0
+        return term_ids[keep] * len(store) + paper_ids[keep]
+
+    def __len__(self):
+        return self._n_docs
+
+    def add(self, paper_id: int, title: Optional[str], abstract: Optional[str]) -> None:
+        """Index one paper. Ids must be added in increasing order."""
+        if paper_id <= self._last_id:
+            raise ValueError(f"Paper id {paper_id} added after {self._last_id}; "
+                             "ids must be added in increasing order")
+        self._last_id = paper_id
+        counts = Counter(tokenize(abstract))
+        for token in tokenize(title):
+            counts[token] += TITLE_WEIGHT
+        for term, tf in counts.items():
+            term_id = self.terms.setdefault(term, len(self.terms))
+            self._pending_by_term.setdefault(term_id, []).append(len(self._pending_ids))
+            self._pending_terms.append(term_id)
+            self._pending_ids.append(paper_id)
+            self._pending_tfs.append(tf)
+        length = sum(counts.values())
+        self._doc_lengths[paper_id] = length
+        self._total_length += length
+        self._n_docs += 1
+
+    def compact(self) -> None:
+        """Fold pending additions into the frozen, delta-encoded postings."""
+        if not self._pending_ids:
+            return
+        term_ids = np.array(self._pending_terms, dtype=np.int64)
+        ids = np.array(self._pending_ids, dtype=np.int64)
+        order = np.lexsort((ids, term_ids))
+        self._append_postings(term_ids[order], ids[order], np.array(self._pending_tfs, dtype=np.int64)[order])
+        self._pending_terms, self._pending_ids, self._pending_tfs = [], [], []
+        self._pending_by_term = {}
+
+        lengths = np.zeros(self._last_id + 1, dtype=np.float32)
+        lengths[:len(self._lengths)] = self._lengths
+        lengths[list(self._doc_lengths)] = list(self._doc_lengths.values())
+        self._lengths = lengths
+        self._doc_lengths = {}
+
+    def _append_postings(self, term_ids: np.ndarray, ids: np.ndarray, tfs: np.ndarray) -> None:
+        """Add entries sorted by (term id, paper id), whose paper ids are all
+        larger than the frozen ones, to the frozen postings.
+
+        Each term's new entries go after its old ones, so this is one
+        O(postings) insertion rather than a sort. The arrays are replaced,
+        not modified, so copies of the old ones stay valid.
+        """
+        n_terms = len(self.terms)
+        old_terms = len(self.offsets) - 1
+        new_counts = np.bincount(term_ids, minlength=n_terms)
+        counts = new_counts.copy()
+        counts[:old_terms] += np.diff(self.offsets)
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # Gaps from each term's previous id; a term's first new entry
+        # follows its last frozen id (0, i.e. the id itself, if none)
+        last_ids = np.zeros(n_terms, dtype=np.int64)
+        last_ids[:old_terms] = self.last_ids
+        deltas = np.diff(ids, prepend=0)
+        new_starts = np.cumsum(new_counts) - new_counts
+        has_new = new_counts > 0
+        starts = new_starts[has_new]
+        deltas[starts] = ids[starts] - last_ids[has_new]
+        last_ids[has_new] = ids[starts + new_counts[has_new] - 1]
+
+        # Insert before the end of each term's old entries
+        ends = np.full(n_terms, len(self.deltas), dtype=np.int64)
+        ends[:old_terms] = self.offsets[1:]
+        at = np.repeat(ends, new_counts)
+        deltas, tfs = _narrow_uint(deltas), _narrow_uint(tfs)
+        self.deltas = np.insert(self.deltas.astype(np.result_type(self.deltas, deltas)), at, deltas)
+        self.tfs = np.insert(self.tfs.astype(np.result_type(self.tfs, tfs)), at, tfs)
+        self.offsets, self.last_ids = offsets, last_ids
+
+    @staticmethod
+    def _decode_ids(deltas: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Undo the per-term delta encoding of a whole CSR array."""
+        running = np.cumsum(deltas, dtype=np.int64)
+        # Subtract the running total reached before each term's first entry
+        counts = np.diff(offsets)
+        before = np.r_[0, running][offsets[:-1]]
+        return running - np.repeat(before, counts)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (paper ids, term frequencies) for an already-stemmed term."""
+        term_id = self.terms.get(term)
+        if term_id is None:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        ids = np.zeros(0, dtype=np.int64)
+        tfs = np.zeros(0, dtype=np.int64)
+        if term_id < len(self.offsets) - 1:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            ids = np.cumsum(self.deltas[start:end], dtype=np.int64)
+            tfs = self.tfs[start:end].astype(np.int64)
+        pending = self._pending_by_term.get(term_id)
+        if pending:
+            ids = np.concatenate([ids, np.array([self._pending_ids[i] for i in pending], dtype=np.int64)])
+            tfs = np.concatenate([tfs, np.array([self._pending_tfs[i] for i in pending], dtype=np.int64)])
+        return ids, tfs
+
+    def term_matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the frozen postings as (term ids, paper ids, term frequencies)."""
+        term_ids = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+        return term_ids, self._decode_ids(self.deltas, self.offsets), self.tfs.astype(np.int64)
+
+    def _doc_length_array(self, ids: np.ndarray) -> np.ndarray:
+        lengths = np.zeros(len(ids), dtype=np.float32)
+        frozen = ids < len(self._lengths)
+        lengths[frozen] = self._lengths[ids[frozen]]
+        for i in np.flatnonzero(~frozen):
+            lengths[i] = self._doc_lengths[int(ids[i])]
+        return lengths
+
+    def search(self, query: str, k: int = 50,
+               allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (paper_id, score) pairs, best first.
+
+        ``allowed`` optionally restricts results to a sorted array of ids
+        (e.g. the current journal / month filter).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        n_docs = self._n_docs
+        if not terms or n_docs == 0:
+            return []
+        avg_length = self._total_length / n_docs
+
+        all_ids, all_scores = [], []
+        for term in terms:
+            ids, tfs = self.postings(term)
+            if len(ids) == 0:
+                continue
+            if allowed is not None:
+                keep = np.isin(ids, allowed, assume_unique=True)
+                ids, tfs = ids[keep], tfs[keep]
+            idf = np.log(1.0 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self._doc_length_array(ids) / avg_length)
+            all_ids.append(ids)
+            all_scores.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        if not all_ids:
+            return []
+
+        ids, inverse = np.unique(np.concatenate(all_ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(all_scores))
+        # Partial selection of the k best, then sort only those
+        if len(ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the frozen postings."""
+        return self.offsets.nbytes + self.deltas.nbytes + self.tfs.nbytes + self._lengths.nbytes
+
+
+@lru_cache(maxsize=2)
+def search_index_for(store: PaperStore) -> SearchIndex:
+    """Return the search index over ``store``, built once per store (or
+    extended from the index of the store it was appended to)."""
+    previous = store.appended_to()
+    if previous is not None:
+        return search_index_for(previous).extended(store)
+    return SearchIndex.from_store(store)
+
+
+def get_search_index() -> SearchIndex:
+    """Return the search index over the current corpus."""
+    return search_index_for(get_store())
+
+
+def search_papers(query: str, k: int = 50, allowed: Optional[Iterable[int]] = None):
+    """Return up to ``k`` best-matching paper ids for ``query``."""
+    if allowed is not None:
+        allowed = np.asarray(allowed)
+    return [paper_id for paper_id, _ in get_search_index().search(query, k, allowed)]
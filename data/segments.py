@@ -0,0 +1,489 @@
+# Append-only corpus segments for truffle.econ
+# The corpus can be kept as a directory of immutable segments, each a
+# regular corpus snapshot (see data/snapshot.py) with its own PaperIndex:
+#
+#   corpus.d/MANIFEST.json      {"format": 1, "segments": [...], "next": 7}
+#   corpus.d/seg-000001.snap    the corpus as of the last compaction
+#   corpus.d/seg-000006.snap    an issue appended since
+#
+# Appending a month of papers builds and writes one small segment, so it
+# costs O(issue size); the existing segments are not touched. Queries run
+# on every segment's mini-index and shift the ids by the segment's base,
+# so paper ids are global and stable: segment i holds ids
+# [base_i, base_i + len_i). compact() concatenates segments column by
+# column (re-interning only the string tables) into one segment with the
+# same ids, in a background thread if asked, and swaps it in atomically.
+#
+# current() serves the corpus as one PaperStore. After an append it does
+# not rebuild it: append_store() adds the new rows to the previous store
+# (sharing its string table) and records the link, so index_for,
+# engine_for, search_index_for, cooccurrence_for and similarity_index_for
+# extend the previous store's indexes with the new rows only. Compaction
+# keeps the corpus version, and stores compare equal by version, so the
+# compacted store finds those same indexes in the caches.
+#
+# The manifest is replaced atomically, so readers in other processes see
+# either the old or the new segment list. There must be one writer; a
+# reader that finds a listed segment already removed by compaction
+# re-reads the manifest.
+#
+#   python -m data.segments init [dir]      seed from the current corpus
+#   python -m data.segments compact [dir]
+#   python -m data.segments info [dir]
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from functools import cached_property
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .index import PaperIndex
+from .papers import Paper
+from .store import MISSING, ConcatStringTable, PaperStore, StringTable
+
+MANIFEST = "MANIFEST.json"
+FORMAT_VERSION = 1
+
+# Segment directory read by get_store() when present; TRUFFLE_SEGMENTS
+# points at a different one
+DEFAULT_SEGMENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.d")
+
+# Appending beyond this many segments starts a background compaction
+MAX_SEGMENTS = 8
+
+# Manifest reads retried when compaction removes a segment mid-read
+MANIFEST_ATTEMPTS = 5
+
+_STRING_COLUMNS = ("title_ids", "abstract_ids", "url_ids", "pages_ids", "doi_ids", "author_ids")
+
+
+def _remap(ids: np.ndarray, mapping: np.ndarray) -> np.ndarray:
+    """Map string ids through ``mapping``, keeping MISSING (-1) as is."""
+    # Index -1 picks the appended MISSING
+    return np.r_[mapping, MISSING][ids]
+
+
+def _remap_jel(ids: np.ndarray, extra_mapping: np.ndarray) -> np.ndarray:
+    """Map negative (extra-table) JEL ids through ``extra_mapping``."""
+    extra = ids < 0
+    out = ids.astype(np.int64)
+    out[extra] = -1 - extra_mapping[-1 - out[extra]]
+    return out.astype(ids.dtype)
+
+
+def paper_key(doi: Optional[str], journal: str, year: int, month: int, title: Optional[str]) -> tuple:
+    """Return the identity of a paper for de-duplication: its DOI (case
+    does not matter), else its journal, issue month and normalized title."""
+    doi = (doi or "").strip().lower()
+    if doi:
+        return ("doi", doi)
+    return ("title", journal, int(year), int(month), " ".join((title or "").lower().split()))
+
+
+def concat_stores(stores: List[PaperStore], version: Optional[str] = None) -> PaperStore:
+    """Concatenate stores into one, paper ``i`` of ``stores[k]`` becoming
+    paper ``sum(len(stores[:k])) + i``.
+
+    Columns are concatenated with NumPy; only the string tables are
+    re-interned (O(distinct strings), no per-paper Python work).
+    """
+    if len(stores) == 1 and version is None:
+        return stores[0]
+    journals, strings, extra_jel_codes = StringTable(), StringTable(), StringTable()
+    parts = {name: [] for name in PaperStore.COLUMNS}
+    for store in stores:
+        string_map = np.array([strings.intern(s) for s in store.strings], dtype=np.int64)
+        _append_columns(parts, store, journals, string_map, extra_jel_codes)
+    return PaperStore(journals, strings, extra_jel_codes, _join_columns(parts), version=version)
+
+
+def append_store(previous: PaperStore, store: PaperStore, version: Optional[str] = None) -> PaperStore:
+    """Return ``previous`` followed by the papers of ``store``.
+
+    Unlike concat_stores nothing of ``previous`` is re-interned: its string
+    table is shared through a ConcatStringTable, and only the (tiny)
+    journal and extra JEL tables are rebuilt. The result records
+    ``previous`` (see PaperStore.appended_to), so indexes over it are
+    extended with the new rows rather than rebuilt.
+    """
+    journals = StringTable(previous.journals)
+    extra_jel_codes = StringTable(previous.extra_jel_codes)
+    parts = {name: [] for name in PaperStore.COLUMNS}
+    _append_columns(parts, previous, journals, None, extra_jel_codes)
+    string_map = np.arange(len(store.strings), dtype=np.int64) + len(previous.strings)
+    _append_columns(parts, store, journals, string_map, extra_jel_codes)
+    merged = PaperStore(journals, ConcatStringTable([previous.strings, store.strings]),
+                        extra_jel_codes, _join_columns(parts), version=version)
+    merged.set_appended_to(previous)
+    return merged
+
+
+def _append_columns(parts: dict, store: PaperStore, journals: StringTable,
+                    string_map: Optional[np.ndarray], extra_jel_codes: StringTable) -> None:
+    """Add ``store``'s columns to ``parts``, re-coded for the merged tables
+    (string ids through ``string_map``; None keeps them)."""
+    journal_map = np.array([journals.intern(j) for j in store.journals], dtype=np.int64)
+    extra_map = np.array([extra_jel_codes.intern(c) for c in store.extra_jel_codes], dtype=np.int64)
+    columns = store.columns()
+    parts["journal_ids"].append(journal_map[columns["journal_ids"]].astype(np.uint8))
+    for name in _STRING_COLUMNS:
+        ids = columns[name] if string_map is None else _remap(columns[name], string_map)
+        parts[name].append(ids.astype(np.int32))
+    for name in ("jel_ids", "jel_point_ids"):
+        parts[name].append(_remap_jel(columns[name], extra_map))
+    for name in ("years", "months", "volumes", "issues", "jel_x", "jel_y"):
+        parts[name].append(columns[name])
+    # Offsets: drop each store's leading 0 and shift by the entries so far
+    for name, entries in (("author_offsets", "author_ids"), ("jel_offsets", "jel_ids")):
+        base = sum(len(p) for p in parts[entries][:-1])
+        parts[name].append(columns[name][1:] + base)
+
+
+def _join_columns(parts: dict) -> dict:
+    columns = {name: np.concatenate(arrays) if arrays else np.zeros(0)
+               for name, arrays in parts.items()}
+    for name in ("author_offsets", "jel_offsets"):
+        columns[name] = np.r_[np.int64(0), columns[name]].astype(np.int64)
+    return columns
+
+
+class Segment:
+    """One immutable slice of the corpus: a store, its index and its base id."""
+
+    def __init__(self, store: PaperStore, base: int, name: Optional[str] = None):
+        self.store = store
+        self.base = base
+        self.name = name
+
+    def __len__(self):
+        return len(self.store)
+
+    @cached_property
+    def index(self) -> PaperIndex:
+        return PaperIndex(self.store)
+
+    @cached_property
+    def paper_keys(self) -> frozenset:
+        """The ``paper_key`` of every paper in this segment."""
+        store, strings = self.store, self.store.strings
+        doi_ids = np.unique(store.doi_ids[store.doi_ids >= 0]).tolist()
+        dois = [(strings.get(i) or "").strip().lower() for i in doi_ids]
+        keys = {("doi", doi) for doi in dois if doi}
+        # Papers without a DOI (few) are keyed by journal, month and title
+        with_doi = [i for i, doi in zip(doi_ids, dois) if doi]
+        for i in np.flatnonzero(~np.isin(store.doi_ids, with_doi)).tolist():
+            keys.add(paper_key(None, store.journals.get(int(store.journal_ids[i])), store.years[i],
+                               store.months[i], strings.get(int(store.title_ids[i]))))
+        return frozenset(keys)
+
+
+def _corpus_version(segments: Iterable[Segment]) -> str:
+    versions = [s.store.version for s in segments]
+    if len(versions) == 1:
+        return versions[0]
+    return hashlib.sha1("+".join(versions).encode("ascii")).hexdigest()
+
+
+class SegmentedCorpus:
+    """A corpus made of append-only segments, queried as one.
+
+    ``directory`` (optional) persists segments and the manifest; without it
+    the corpus lives in memory. ``segments`` is replaced, never mutated, so
+    readers can use it without locking.
+    """
+
+    def __init__(self, segments: Iterable[PaperStore] = (), directory: Optional[str] = None,
+                 max_segments: int = MAX_SEGMENTS, check_interval: Optional[float] = None):
+        if check_interval is None:
+            check_interval = float(os.environ.get("TRUFFLE_SNAPSHOT_CHECK", "2.0"))
+        self.directory = directory
+        self.max_segments = max_segments
+        self.check_interval = check_interval
+        self.compactions = 0
+        self.segments: Tuple[Segment, ...] = ()
+        self._next = 1
+        self._merged: Optional[PaperStore] = None
+        self._write_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._manifest_identity = None
+        self._checked = time.monotonic()
+        base = 0
+        for store in segments:
+            self.segments += (Segment(store, base),)
+            base += len(store)
+
+    # -- persistence ---------------------------------------------------
+
+    @classmethod
+    def open(cls, directory: str, **params) -> "SegmentedCorpus":
+        """Load the segments listed in ``directory``'s manifest (memory-mapped)."""
+        corpus = cls(directory=directory, **params)
+        corpus._load_manifest()
+        return corpus
+
+    @classmethod
+    def create(cls, directory: str, store: PaperStore, **params) -> "SegmentedCorpus":
+        """Start a segment directory whose first segment is ``store``."""
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            raise FileExistsError(f"{directory} already holds a segmented corpus")
+        corpus = cls(directory=directory, **params)
+        corpus._install([corpus._write_segment(store, 0)])
+        return corpus
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST)
+
+    def _stat_manifest(self):
+        st = os.stat(self._manifest_path())
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _load_manifest(self) -> None:
+        for attempt in range(MANIFEST_ATTEMPTS):
+            try:
+                return self._read_manifest()
+            except FileNotFoundError:
+                # A compaction replaced the manifest and removed segments
+                # listed in the one just read; the new one lists the merged
+                # segment instead
+                if attempt == MANIFEST_ATTEMPTS - 1:
+                    raise
+
+    def _read_manifest(self) -> None:
+        from .snapshot import load_snapshot
+        identity = self._stat_manifest()
+        with open(self._manifest_path(), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported segment manifest format {manifest.get('format')!r}")
+        # Keep already-mapped segments; map only new files
+        known = {s.name: s for s in self.segments}
+        segments, base = [], 0
+        for name in manifest["segments"]:
+            segment = known.get(name)
+            if segment is None or segment.base != base:
+                segment = Segment(load_snapshot(os.path.join(self.directory, name)), base, name)
+            segments.append(segment)
+            base += len(segment)
+        self.segments = tuple(segments)
+        self._next = manifest["next"]
+        self._manifest_identity = identity
+
+    def _write_segment(self, store: PaperStore, base: int) -> Segment:
+        if self.directory is None:
+            return Segment(store, base)
+        from .snapshot import write_snapshot
+        name = f"seg-{self._next:06d}.snap"
+        self._next += 1
+        write_snapshot(store, os.path.join(self.directory, name))
+        return Segment(store, base, name)
+
+    def _install(self, segments: List[Segment]) -> None:
+        """Make ``segments`` the current list (and the manifest, if persisted)."""
+        old = self.segments
+        if self.directory is not None:
+            manifest = {"format": FORMAT_VERSION, "segments": [s.name for s in segments],
+                        "next": self._next}
+            path = self._manifest_path()
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._manifest_identity = self._stat_manifest()
+        self.segments = tuple(segments)
+        if self.directory is not None:
+            # Readers that still hold the old stores keep their mappings
+            live = {s.name for s in segments}
+            for segment in old:
+                if segment.name not in live:
+                    try:
+                        os.remove(os.path.join(self.directory, segment.name))
+                    except FileNotFoundError:
+                        pass
+
+    def refresh(self) -> bool:
+        """Re-read the manifest if another process replaced it; return True if so."""
+        self._checked = time.monotonic()
+        if self.directory is None:
+            return False
+        try:
+            identity = self._stat_manifest()
+        except FileNotFoundError:
+            return False
+        if identity == self._manifest_identity:
+            return False
+        with self._write_lock:
+            try:
+                self._load_manifest()
+            except FileNotFoundError:
+                # Keep serving the segments already mapped
+                return False
+        return True
+
+    # -- writing -------------------------------------------------------
+
+    def append(self, papers: Iterable[Paper]) -> Optional[Segment]:
+        """Add ``papers`` as a new segment (None if there are none).
+
+        Costs O(len(papers)). Starts a background compaction once there
+        are more than ``max_segments`` segments.
+        """
+        store = PaperStore.from_papers(papers)
+        if len(store) == 0:
+            return None
+        with self._write_lock:
+            segment = self._write_segment(store, len(self))
+            self._install(list(self.segments) + [segment])
+        if len(self.segments) > self.max_segments:
+            self.compact_in_background()
+        return segment
+
+    def compact(self) -> bool:
+        """Merge the current segments into one; return False if there was
+        nothing to merge.
+
+        Segments appended while the merge runs are kept after the merged
+        one. The merged store keeps the version the corpus had, so caches
+        keyed on it stay valid.
+        """
+        segments = self.segments
+        if len(segments) < 2:
+            return False
+        version = _corpus_version(segments)
+        merged = self._merged
+        # An appended store shares string tables with repeats; re-intern them
+        if merged is None or merged.version != version or isinstance(merged.strings, ConcatStringTable):
+            merged = concat_stores([s.store for s in segments], version=version)
+        with self._write_lock:
+            segment = self._write_segment(merged, 0)
+            # Only the merged prefix is replaced
+            self._install([segment] + list(self.segments[len(segments):]))
+            self.compactions += 1
+        return True
+
+    def compact_in_background(self) -> threading.Thread:
+        """Run ``compact`` in a daemon thread (at most one at a time)."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return self._compactor
+        self._compactor = threading.Thread(target=self.compact, name="segment-compaction", daemon=True)
+        self._compactor.start()
+        return self._compactor
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+
+    # -- reading -------------------------------------------------------
+
+    def __len__(self):
+        segments = self.segments
+        return segments[-1].base + len(segments[-1]) if segments else 0
+
+    @property
+    def version(self) -> str:
+        return _corpus_version(self.segments)
+
+    def locate(self, paper_id: int) -> Tuple[Segment, int]:
+        """Return (segment, local id) of a global paper id."""
+        segments = self.segments
+        k = bisect_right([s.base for s in segments], paper_id) - 1
+        if k < 0 or paper_id >= len(self):
+            raise IndexError(f"paper id {paper_id} out of range")
+        return segments[k], paper_id - segments[k].base
+
+    def to_paper(self, paper_id: int) -> Paper:
+        segment, local = self.locate(paper_id)
+        return segment.store.to_paper(local)
+
+    def query(self, **filters) -> np.ndarray:
+        """Return sorted global ids matching ``filters`` (see PaperIndex.query)."""
+        parts = [s.index.query(**filters).astype(np.int64) + s.base for s in self.segments]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def count(self, **filters) -> int:
+        return sum(len(s.index.query(**filters)) for s in self.segments)
+
+    def months(self):
+        """Return the (year, month) pairs present, newest first."""
+        return sorted({ym for s in self.segments for ym in s.index.by_month}, reverse=True)
+
+    def paper_keys(self) -> frozenset:
+        """Return the ``paper_key`` of every paper in the corpus."""
+        return frozenset().union(*(s.paper_keys for s in self.segments))
+
+    def current(self) -> PaperStore:
+        """Return the whole corpus as one PaperStore (merged lazily, once per version).
+
+        Segments added since the last call are appended to the previous
+        result (see append_store), at a cost of O(new papers) plus copying
+        the columns. Re-reads the manifest at most every ``check_interval``
+        seconds.
+        """
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+        segments = self.segments
+        version = _corpus_version(segments)
+        merged = self._merged
+        if len(segments) == 1:
+            # After a compaction this is equal to (and shares the cached
+            # indexes of) the merged store it replaces
+            merged = segments[0].store
+        elif merged is None or merged.version != version:
+            merged = self._append_to_merged(segments, version)
+        self._merged = merged
+        return merged
+
+    def _append_to_merged(self, segments: Tuple[Segment, ...], version: str) -> PaperStore:
+        """Merge ``segments``, starting from the last merged store if it
+        covers a prefix of them."""
+        previous = self._merged
+        if previous is not None:
+            for k in range(len(segments) - 1, 0, -1):
+                if _corpus_version(segments[:k]) == previous.version:
+                    # A compacted first segment has the same papers and
+                    # version, and its own (unshared) string table
+                    if k == 1:
+                        previous = segments[0].store
+                    tail = concat_stores([s.store for s in segments[k:]])
+                    return append_store(previous, tail, version)
+        return concat_stores([s.store for s in segments], version=version)
+
+
+def segments_path() -> str:
+    """Return the segment directory location (TRUFFLE_SEGMENTS or the default)."""
+    return os.environ.get("TRUFFLE_SEGMENTS", DEFAULT_SEGMENTS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage an append-only segmented corpus.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command, help in (("init", "seed a segment directory from the current corpus"),
+                          ("compact", "merge all segments into one"),
+                          ("info", "list the segments")):
+        sub.add_parser(command, help=help).add_argument("path", nargs="?", default=segments_path())
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        from .ingest import current_papers
+        from .store import snapshot_path
+        corpus = SegmentedCorpus.create(args.path, PaperStore.from_papers(current_papers(snapshot_path())))
+    else:
+        corpus = SegmentedCorpus.open(args.path)
+        if args.command == "compact":
+            corpus.compact()
+    print(f"{args.path}: {len(corpus)} papers in {len(corpus.segments)} segments")
+    for segment in corpus.segments:
+        print(f"  {segment.name}: ids {segment.base}-{segment.base + len(segment) - 1}")
+
+
+if __name__ == "__main__":
+    main()
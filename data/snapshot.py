@@ -0,0 +1,226 @@
+# Binary corpus snapshots for truffle.econ
+# A snapshot stores a PaperStore's columns and string tables as aligned,
+# little-endian arrays behind a small JSON header:
+#
+#   b"TRUFSNP1" | uint64 header length | JSON header | padding | data blobs
+#
+# Each blob starts on a 64-byte boundary so it can be used in place from a
+# memory-mapped file: loading is O(number of columns), not O(papers).
+#
+# Files are mapped read-only and shared, so every server process on a host
+# uses the same physical pages. Writers replace the file atomically and
+# running processes switch to the new file on their next check (see
+# SnapshotWatcher), without a restart.
+#
+# Build (or atomically replace) a snapshot from the Python modules with:
+#
+#   python -m data.snapshot build [path]
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from .store import DEFAULT_SNAPSHOT, FrozenStringTable, PaperStore
+
+MAGIC = b"TRUFSNP1"
+FORMAT_VERSION = 1
+ALIGN = 64
+TABLES = ("journals", "strings", "extra_jel_codes")
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable corpus snapshot."""
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+
+def _little_endian(array: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+
+def _frozen(table) -> FrozenStringTable:
+    if isinstance(table, FrozenStringTable):
+        return table
+    return FrozenStringTable.encode(table)
+
+
+def write_snapshot(store: PaperStore, path: str) -> None:
+    """Write ``store`` to ``path`` atomically (readers never see a partial file)."""
+    blobs: Dict[str, np.ndarray] = {}
+    for name, array in store.columns().items():
+        blobs[f"columns/{name}"] = _little_endian(array)
+    for name in TABLES:
+        table = _frozen(getattr(store, name))
+        blobs[f"tables/{name}/offsets"] = _little_endian(table.offsets)
+        blobs[f"tables/{name}/heap"] = _little_endian(table.heap)
+    # Precompute the display order so readers never decode every title
+    from .index import compute_display_rank
+    rank = store.display_rank if store.display_rank is not None else compute_display_rank(store)
+    blobs["derived/display_rank"] = _little_endian(rank)
+
+    entries = {}
+    offset = 0
+    for name, array in blobs.items():
+        entries[name] = {"dtype": array.dtype.str, "offset": offset, "count": len(array)}
+        offset += array.nbytes + _pad(array.nbytes)
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "version": store.version,
+        "n_papers": len(store),
+        "blobs": entries,
+    }).encode("utf-8")
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * _pad(len(MAGIC) + 8 + len(header)))
+        for array in blobs.values():
+            f.write(array.tobytes())
+            f.write(b"\0" * _pad(array.nbytes))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_header(buffer) -> tuple:
+    """Return (header dict, data start offset) for a snapshot buffer."""
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise SnapshotError("not a truffle.econ corpus snapshot")
+    start = len(MAGIC) + 8
+    if len(buffer) < start:
+        raise SnapshotError("truncated snapshot header")
+    (header_len,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    if len(buffer) < start + header_len:
+        raise SnapshotError("truncated snapshot header")
+    try:
+        header = json.loads(bytes(buffer[start:start + header_len]).decode("utf-8"))
+    except ValueError as e:
+        raise SnapshotError(f"unreadable snapshot header: {e}") from None
+    if header.get("format") != FORMAT_VERSION:
+        raise SnapshotError(f"unsupported snapshot format {header.get('format')!r}")
+    data_start = start + header_len
+    return header, data_start + _pad(data_start)
+
+
+def store_from_buffer(buffer) -> PaperStore:
+    """Build a PaperStore whose arrays point straight into ``buffer``."""
+    header, data_start = read_header(buffer)
+    for name, entry in header["blobs"].items():
+        end = data_start + entry["offset"] + entry["count"] * np.dtype(entry["dtype"]).itemsize
+        if end > len(buffer):
+            raise SnapshotError(f"truncated snapshot: {name} ends at byte {end} of {len(buffer)}")
+
+    def blob(name):
+        entry = header["blobs"][name]
+        return np.frombuffer(buffer, dtype=np.dtype(entry["dtype"]),
+                             count=entry["count"], offset=data_start + entry["offset"])
+
+    tables = {
+        name: FrozenStringTable(blob(f"tables/{name}/offsets"), blob(f"tables/{name}/heap"))
+        for name in TABLES
+    }
+    # Columns missing from older snapshots (derived JEL points) are recomputed
+    columns = {name: blob(f"columns/{name}") for name in PaperStore.COLUMNS
+               if f"columns/{name}" in header["blobs"]}
+    display_rank = blob("derived/display_rank") if "derived/display_rank" in header["blobs"] else None
+    return PaperStore(tables["journals"], tables["strings"], tables["extra_jel_codes"],
+                      columns, version=header["version"], display_rank=display_rank)
+
+
+def load_snapshot(path: str) -> PaperStore:
+    """Memory-map a snapshot read-only and return a zero-copy PaperStore."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SnapshotError(f"empty snapshot file {path}")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The arrays keep the mapping alive; it is unmapped when they are freed
+    return store_from_buffer(buffer)
+
+
+class SnapshotWatcher:
+    """Serve the store of a snapshot file, reloading it when the file is replaced.
+
+    The file's identity (inode, size, mtime) is checked at most every
+    ``check_interval`` seconds. A replaced file is mapped and swapped in with
+    a single reference assignment; readers still holding the old store keep
+    a valid mapping until they drop it. A replacement that is not a readable
+    snapshot (say, a file still being copied into place) is skipped: the
+    current store stays and the file is checked again next time.
+    """
+
+    def __init__(self, path: str, check_interval: Optional[float] = None):
+        if check_interval is None:
+            check_interval = float(os.environ.get("TRUFFLE_SNAPSHOT_CHECK", "2.0"))
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._identity = self._stat()
+        self._store = load_snapshot(path)
+        self._checked = time.monotonic()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def current(self) -> PaperStore:
+        """Return the current store, first reloading it if the file changed."""
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self.refresh(now)
+        return self._store
+
+    def refresh(self, now: Optional[float] = None) -> bool:
+        """Check the file now; return True if a new snapshot was loaded."""
+        with self._lock:
+            self._checked = time.monotonic() if now is None else now
+            try:
+                identity = self._stat()
+            except FileNotFoundError:
+                # Keep serving the mapped snapshot while the path is missing
+                return False
+            if identity == self._identity:
+                return False
+            try:
+                store = load_snapshot(self.path)
+            except SnapshotError:
+                return False
+            self._store = store
+            self._identity = identity
+            self.reloads += 1
+            return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect corpus snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="convert PAPERS_2026 into a snapshot")
+    build.add_argument("path", nargs="?", default=DEFAULT_SNAPSHOT)
+    info = sub.add_parser("info", help="print a snapshot's header")
+    info.add_argument("path", nargs="?", default=DEFAULT_SNAPSHOT)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from .papers import PAPERS_2026
+        store = PaperStore.from_papers(PAPERS_2026)
+        write_snapshot(store, args.path)
+        print(f"wrote {len(store)} papers to {args.path} ({os.path.getsize(args.path)} bytes)")
+    else:
+        store = load_snapshot(args.path)
+        print(f"{args.path}: {len(store)} papers, version {store.version}")
+
+
+if __name__ == "__main__":
+    main()
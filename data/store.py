@@ -0,0 +1,548 @@
+# Columnar paper store for truffle.econ
+# Keeps the corpus as NumPy arrays instead of a list of Paper objects, so
+# memory grows predictably with the number of papers and filters can run
+# as vectorized array operations.
+
+import os
+import uuid
+import weakref
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .jel_codes import JEL_CODE_STRIDE, decode_jel_code, parse_jel_codes
+from .papers import Paper, JOURNAL_COLORS
+
+# Sentinel for missing optional values in integer / string-id columns
+MISSING = -1
+
+# Corpus snapshot read by get_store() when present (see data/snapshot.py);
+# the TRUFFLE_SNAPSHOT environment variable points at a different file.
+DEFAULT_SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.snap")
+
+
+class StringTable:
+    """Interned strings addressed by small integer ids."""
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings: List[str] = []
+        self._ids = {}
+        for s in strings:
+            self.intern(s)
+
+    def intern(self, s: Optional[str]) -> int:
+        """Return the id of ``s``, adding it to the table if needed."""
+        if s is None:
+            return MISSING
+        string_id = self._ids.get(s)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[s] = string_id
+            self.strings.append(s)
+        return string_id
+
+    def lookup(self, s: str) -> int:
+        """Return the id of ``s`` without adding it, or MISSING."""
+        return self._ids.get(s, MISSING)
+
+    def get(self, string_id: int) -> Optional[str]:
+        """Return the string for ``string_id`` (None for MISSING)."""
+        if string_id < 0:
+            return None
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __iter__(self):
+        return iter(self.strings)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate UTF-8 size of the table contents."""
+        return sum(len(s.encode("utf-8")) for s in self.strings)
+
+
+class FrozenStringTable:
+    """Read-only string table over an offsets array and a UTF-8 heap.
+
+    Strings are decoded on access, so the table can sit directly on a
+    memory-mapped snapshot without copying it.
+    """
+
+    def __init__(self, offsets: np.ndarray, heap: np.ndarray):
+        self.offsets = offsets
+        self.heap = heap
+        self._ids = None
+
+    @classmethod
+    def encode(cls, strings: Iterable[str]) -> "FrozenStringTable":
+        """Pack ``strings`` into an offsets array and a heap."""
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        heap = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(offsets, heap)
+
+    def intern(self, s):
+        raise TypeError("FrozenStringTable is read-only")
+
+    def lookup(self, s: str) -> int:
+        """Return the id of ``s``, or MISSING (builds a lookup dict on first use)."""
+        if self._ids is None:
+            self._ids = {value: i for i, value in enumerate(self)}
+        return self._ids.get(s, MISSING)
+
+    def get(self, string_id: int) -> Optional[str]:
+        """Return the string for ``string_id`` (None for MISSING)."""
+        if string_id < 0:
+            return None
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return self.heap[start:end].tobytes().decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        data = self.heap.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield data[start:end].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.heap.nbytes
+
+
+class ConcatStringTable:
+    """Read-only concatenation of string tables.
+
+    The ids of each part are shifted by the sizes of the parts before it,
+    so appending a table costs nothing for the ones already there. A string
+    held by several parts has several ids; ``lookup`` returns the first.
+    """
+
+    def __init__(self, parts: Iterable):
+        self.parts = []
+        for part in parts:
+            # Flatten, so lookups never recurse
+            self.parts.extend(part.parts if isinstance(part, ConcatStringTable) else [part])
+        self.bases = [0]
+        for part in self.parts:
+            self.bases.append(self.bases[-1] + len(part))
+
+    def intern(self, s):
+        raise TypeError("ConcatStringTable is read-only")
+
+    def lookup(self, s: str) -> int:
+        """Return the (first) id of ``s``, or MISSING."""
+        for base, part in zip(self.bases, self.parts):
+            string_id = part.lookup(s)
+            if string_id != MISSING:
+                return base + string_id
+        return MISSING
+
+    def get(self, string_id: int) -> Optional[str]:
+        """Return the string for ``string_id`` (None for MISSING)."""
+        if string_id < 0:
+            return None
+        k = bisect_right(self.bases, string_id) - 1
+        return self.parts[k].get(string_id - self.bases[k])
+
+    def __len__(self):
+        return self.bases[-1]
+
+    def __iter__(self):
+        for part in self.parts:
+            yield from part
+
+    @property
+    def nbytes(self) -> int:
+        return sum(part.nbytes for part in self.parts)
+
+
+class PaperView:
+    """Read-only, Paper-compatible view of one row of a PaperStore."""
+
+    __slots__ = ("_store", "paper_id")
+
+    def __init__(self, store: "PaperStore", paper_id: int):
+        self._store = store
+        self.paper_id = paper_id
+
+    @property
+    def store(self) -> "PaperStore":
+        return self._store
+
+    @property
+    def title(self) -> str:
+        return self._store.strings.get(self._store.title_ids[self.paper_id])
+
+    @property
+    def authors(self) -> List[str]:
+        return self._store.authors_of(self.paper_id)
+
+    @property
+    def journal(self) -> str:
+        return self._store.journals.get(self._store.journal_ids[self.paper_id])
+
+    @property
+    def jel_codes(self) -> List[str]:
+        return self._store.jel_codes_of(self.paper_id)
+
+    @property
+    def abstract(self) -> str:
+        return self._store.strings.get(self._store.abstract_ids[self.paper_id])
+
+    @property
+    def url(self) -> str:
+        return self._store.strings.get(self._store.url_ids[self.paper_id])
+
+    @property
+    def year(self) -> int:
+        return int(self._store.years[self.paper_id])
+
+    @property
+    def month(self) -> int:
+        return int(self._store.months[self.paper_id])
+
+    @property
+    def volume(self) -> Optional[int]:
+        return self._store._optional_int(self._store.volumes, self.paper_id)
+
+    @property
+    def issue(self) -> Optional[int]:
+        return self._store._optional_int(self._store.issues, self.paper_id)
+
+    @property
+    def pages(self) -> Optional[str]:
+        return self._store.strings.get(self._store.pages_ids[self.paper_id])
+
+    @property
+    def doi(self) -> Optional[str]:
+        return self._store.strings.get(self._store.doi_ids[self.paper_id])
+
+    def to_paper(self) -> Paper:
+        """Materialize this view as a standalone Paper dataclass."""
+        return self._store.to_paper(self.paper_id)
+
+    def __eq__(self, other):
+        if isinstance(other, PaperView):
+            return self._store is other._store and self.paper_id == other.paper_id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._store), self.paper_id))
+
+    def __repr__(self):
+        return f"PaperView({self.paper_id}, title={self.title!r})"
+
+
+def jel_points(jel_offsets: np.ndarray, jel_ids: np.ndarray, extra_jel_codes) -> tuple:
+    """Return the JEL chart coordinates of every stored code.
+
+    Returns (x, y, code ids) arrays parallel to ``jel_ids`` but with each
+    paper's entries sorted by (x, y) for drawing. x is the JEL letter
+    position (-1 for codes with no letter on the chart) and y the subcode
+    number, both as given by ``parse_jel_code`` (y clipped to int16).
+    """
+    extra = parse_jel_codes(list(extra_jel_codes))
+    extra_x = np.r_[extra.letter_idx, -1].astype(np.int8)
+    extra_y = np.r_[extra.numbers, 0]
+    is_extra = jel_ids < 0
+    # Non-canonical codes index the parsed extra table at -1 - id
+    extra_index = np.where(is_extra, -1 - jel_ids.astype(np.int64), len(extra))
+    x = np.where(is_extra, extra_x[extra_index], jel_ids // JEL_CODE_STRIDE).astype(np.int8)
+    y = np.where(is_extra, extra_y[extra_index], jel_ids % JEL_CODE_STRIDE)
+    y = np.clip(y, np.iinfo(np.int16).min, np.iinfo(np.int16).max).astype(np.int16)
+
+    owners = np.repeat(np.arange(len(jel_offsets) - 1), np.diff(jel_offsets))
+    order = np.lexsort((y, x, owners))
+    return x[order], y[order], jel_ids[order]
+
+
+class PaperStore:
+    """Column-oriented, array-backed storage for the paper corpus.
+
+    - journal, year and month are small-int arrays (journal ids index the
+      ``journals`` table)
+    - authors and JEL codes are CSR-style: ``*_offsets[i]:*_offsets[i + 1]``
+      slices the flat id array for paper ``i``
+    - JEL codes are int16 ids from ``encode_jel_code``; codes that are not of
+      the form A00-Z99 get negative ids into ``extra_jel_codes``
+    - ``jel_x``, ``jel_y`` and ``jel_point_ids`` hold each paper's JEL chart
+      points (see ``jel_points``), sorted for drawing and sliced with
+      ``jel_offsets``; they are computed when missing from ``columns``
+    - all other text lives in one interned ``strings`` table
+
+    ``version`` identifies this corpus build; caches key on it so results
+    computed for one corpus are never served for another. Stores compare
+    equal (and hash) by version.
+    """
+
+    COLUMNS = (
+        "journal_ids", "years", "months", "volumes", "issues",
+        "title_ids", "abstract_ids", "url_ids", "pages_ids", "doi_ids",
+        "author_offsets", "author_ids", "jel_offsets", "jel_ids",
+        "jel_x", "jel_y", "jel_point_ids",
+    )
+
+    def __init__(self, journals, strings, extra_jel_codes, columns, version=None,
+                 display_rank=None):
+        self.version: str = version or uuid.uuid4().hex
+        # Optional precomputed (journal, title) ranks, e.g. from a snapshot
+        self.display_rank: Optional[np.ndarray] = display_rank
+        # Weak reference to the store this one extends with appended rows
+        self._appended_to = None
+        self.journals: StringTable = journals
+        self.strings: StringTable = strings
+        self.extra_jel_codes: StringTable = extra_jel_codes
+
+        self.journal_ids = columns["journal_ids"]
+        self.years = columns["years"]
+        self.months = columns["months"]
+        self.volumes = columns["volumes"]
+        self.issues = columns["issues"]
+        self.title_ids = columns["title_ids"]
+        self.abstract_ids = columns["abstract_ids"]
+        self.url_ids = columns["url_ids"]
+        self.pages_ids = columns["pages_ids"]
+        self.doi_ids = columns["doi_ids"]
+        self.author_offsets = columns["author_offsets"]
+        self.author_ids = columns["author_ids"]
+        self.jel_offsets = columns["jel_offsets"]
+        self.jel_ids = columns["jel_ids"]
+        if "jel_x" in columns:
+            self.jel_x = columns["jel_x"]
+            self.jel_y = columns["jel_y"]
+            self.jel_point_ids = columns["jel_point_ids"]
+        else:
+            self.jel_x, self.jel_y, self.jel_point_ids = jel_points(
+                self.jel_offsets, self.jel_ids, extra_jel_codes)
+
+    @classmethod
+    def from_papers(cls, papers: Iterable[Paper]) -> "PaperStore":
+        """Build a store from Paper objects (or anything with Paper's fields)."""
+        # Known journals first, so their ids are stable across corpora
+        journals = StringTable(JOURNAL_COLORS)
+        strings = StringTable()
+        extra_jel_codes = StringTable()
+
+        journal_ids, years, months, volumes, issues = [], [], [], [], []
+        title_ids, abstract_ids, url_ids, pages_ids, doi_ids = [], [], [], [], []
+        author_offsets, author_ids = [0], []
+        jel_offsets, jel_codes = [0], []
+
+        for paper in papers:
+            journal_ids.append(journals.intern(paper.journal))
+            years.append(paper.year)
+            months.append(paper.month)
+            volumes.append(MISSING if paper.volume is None else paper.volume)
+            issues.append(MISSING if paper.issue is None else paper.issue)
+            title_ids.append(strings.intern(paper.title))
+            abstract_ids.append(strings.intern(paper.abstract))
+            url_ids.append(strings.intern(paper.url))
+            pages_ids.append(strings.intern(paper.pages))
+            doi_ids.append(strings.intern(paper.doi))
+
+            author_ids.extend(strings.intern(a) for a in paper.authors)
+            author_offsets.append(len(author_ids))
+
+            jel_codes.extend(paper.jel_codes)
+            jel_offsets.append(len(jel_codes))
+
+        # Encode all JEL codes in one pass; only odd ones need the extra table
+        jel_ids = parse_jel_codes(jel_codes).code_ids
+        for i in np.flatnonzero(jel_ids < 0):
+            jel_ids[i] = -1 - extra_jel_codes.intern(jel_codes[i])
+
+        columns = {
+            "journal_ids": np.array(journal_ids, dtype=np.uint8),
+            "years": np.array(years, dtype=np.uint16),
+            "months": np.array(months, dtype=np.uint8),
+            "volumes": np.array(volumes, dtype=np.int32),
+            "issues": np.array(issues, dtype=np.int32),
+            "title_ids": np.array(title_ids, dtype=np.int32),
+            "abstract_ids": np.array(abstract_ids, dtype=np.int32),
+            "url_ids": np.array(url_ids, dtype=np.int32),
+            "pages_ids": np.array(pages_ids, dtype=np.int32),
+            "doi_ids": np.array(doi_ids, dtype=np.int32),
+            "author_offsets": np.array(author_offsets, dtype=np.int64),
+            "author_ids": np.array(author_ids, dtype=np.int32),
+            "jel_offsets": np.array(jel_offsets, dtype=np.int64),
+            "jel_ids": jel_ids.astype(np.int16),
+        }
+        return cls(journals, strings, extra_jel_codes, columns)
+
+    def __len__(self):
+        return len(self.journal_ids)
+
+    def __eq__(self, other):
+        if isinstance(other, PaperStore):
+            return self.version == other.version
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.version)
+
+    def appended_to(self) -> Optional["PaperStore"]:
+        """Return the store whose papers are this store's first rows, if
+        this store was built by appending rows to it and it is still alive.
+
+        The ``xxx_for(store)`` helpers use it to extend the previous store's
+        indexes with the new rows instead of rebuilding them.
+        """
+        return None if self._appended_to is None else self._appended_to()
+
+    def set_appended_to(self, previous: "PaperStore") -> None:
+        """Record that this store is ``previous`` plus appended rows."""
+        self._appended_to = weakref.ref(previous)
+
+    @staticmethod
+    def _optional_int(column, paper_id):
+        value = int(column[paper_id])
+        return None if value == MISSING else value
+
+    def decode_jel_id(self, code_id: int) -> str:
+        """Return the JEL code string for a stored code id."""
+        if code_id < 0:
+            return self.extra_jel_codes.get(-1 - int(code_id))
+        return decode_jel_code(code_id)
+
+    def authors_of(self, paper_id: int) -> List[str]:
+        """Return the author list of a paper."""
+        start, end = self.author_offsets[paper_id], self.author_offsets[paper_id + 1]
+        return [self.strings.get(a) for a in self.author_ids[start:end]]
+
+    def jel_ids_of(self, paper_id: int) -> np.ndarray:
+        """Return the JEL code ids of a paper, in their original order."""
+        return self.jel_ids[self.jel_offsets[paper_id]:self.jel_offsets[paper_id + 1]]
+
+    def jel_codes_of(self, paper_id: int) -> List[str]:
+        """Return the JEL code strings of a paper, in their original order."""
+        return [self.decode_jel_id(c) for c in self.jel_ids_of(paper_id)]
+
+    def jel_chart_points(self, paper_ids: Iterable[int]) -> tuple:
+        """Gather the drawable JEL chart points of ``paper_ids``.
+
+        Returns (bounds, x, y, code ids): the sorted points of the i-th
+        requested paper are ``bounds[i]:bounds[i + 1]`` of the other arrays.
+        """
+        paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        starts = self.jel_offsets[paper_ids]
+        counts = self.jel_offsets[paper_ids + 1] - starts
+        # Flat positions of every point of the requested papers, in order
+        positions = np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+        owners = np.repeat(np.arange(len(paper_ids)), counts)
+
+        drawable = self.jel_x[positions] >= 0
+        positions, owners = positions[drawable], owners[drawable]
+        bounds = np.searchsorted(owners, np.arange(len(paper_ids) + 1))
+        return bounds, self.jel_x[positions], self.jel_y[positions], self.jel_point_ids[positions]
+
+    def paper(self, paper_id: int) -> PaperView:
+        """Return a lightweight view of one paper."""
+        return PaperView(self, paper_id)
+
+    def papers(self, paper_ids: Optional[Iterable[int]] = None) -> List[PaperView]:
+        """Return views for ``paper_ids`` (all papers when omitted)."""
+        if paper_ids is None:
+            paper_ids = range(len(self))
+        return [PaperView(self, int(i)) for i in paper_ids]
+
+    def to_paper(self, paper_id: int) -> Paper:
+        """Materialize one row as a Paper dataclass."""
+        view = PaperView(self, paper_id)
+        return Paper(
+            title=view.title,
+            authors=view.authors,
+            journal=view.journal,
+            jel_codes=view.jel_codes,
+            abstract=view.abstract,
+            url=view.url,
+            year=view.year,
+            month=view.month,
+            volume=view.volume,
+            issue=view.issue,
+            pages=view.pages,
+            doi=view.doi,
+        )
+
+    def journal_id(self, journal: str) -> int:
+        """Return the categorical id of a journal name, or MISSING."""
+        return self.journals.lookup(journal)
+
+    def filter_mask(self, journals=None, year_month=None) -> np.ndarray:
+        """Return a boolean mask of papers matching the given filters.
+
+        ``journals`` is an iterable of journal names (None means all) and
+        ``year_month`` a (year, month) tuple (None means all months).
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if journals is not None:
+            ids = [self.journal_id(j) for j in journals]
+            mask &= np.isin(self.journal_ids, [i for i in ids if i != MISSING])
+        if year_month is not None:
+            year, month = year_month
+            mask &= (self.years == year) & (self.months == month)
+        return mask
+
+    def filter_ids(self, journals=None, year_month=None) -> np.ndarray:
+        """Return the sorted ids of papers matching the given filters."""
+        return np.flatnonzero(self.filter_mask(journals, year_month))
+
+    def facet_cube(self, dims=("journal", "month", "jel_letter"), paper_ids=None):
+        """Return paper counts over every cell of ``dims`` (see data/aggregate.py)."""
+        from .aggregate import facet_cube
+        return facet_cube(self, dims, paper_ids)
+
+    def unique_jel_ids(self) -> np.ndarray:
+        """Return the sorted distinct JEL code ids used by the corpus."""
+        return np.unique(self.jel_ids)
+
+    def columns(self) -> dict:
+        """Return the column arrays by name."""
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns and string tables."""
+        return (sum(a.nbytes for a in self.columns().values()) + self.strings.nbytes
+                + self.journals.nbytes + self.extra_jel_codes.nbytes)
+
+
+def snapshot_path() -> str:
+    """Return the corpus snapshot location (TRUFFLE_SNAPSHOT or the default)."""
+    return os.environ.get("TRUFFLE_SNAPSHOT", DEFAULT_SNAPSHOT)
+
+
+@lru_cache(maxsize=None)
+def _corpus_source():
+    """Return a SegmentedCorpus or SnapshotWatcher, or a store built from PAPERS_2026."""
+    from .segments import MANIFEST, SegmentedCorpus, segments_path
+    directory = segments_path()
+    if "TRUFFLE_SEGMENTS" in os.environ or os.path.exists(os.path.join(directory, MANIFEST)):
+        return SegmentedCorpus.open(directory)
+    path = snapshot_path()
+    if "TRUFFLE_SNAPSHOT" in os.environ or os.path.exists(path):
+        from .snapshot import SnapshotWatcher
+        return SnapshotWatcher(path)
+    from .papers import PAPERS_2026
+    return PaperStore.from_papers(PAPERS_2026)
+
+
+def get_store() -> PaperStore:
+    """Return the current corpus store.
+
+    Reads the segment directory (see data/segments.py) or else the
+    snapshot when one exists (an explicit TRUFFLE_SEGMENTS or
+    TRUFFLE_SNAPSHOT must exist), picking up appended segments or a
+    replaced snapshot file without a restart; otherwise builds the store
+    once from PAPERS_2026.
+    """
+    source = _corpus_source()
+    if isinstance(source, PaperStore):
+        return source
+    return source.current()
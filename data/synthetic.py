@@ -0,0 +1,223 @@
+# Synthetic paper corpora for truffle.econ
+# The real corpus is a few dozen papers, too small to measure how anything
+# scales. generate_papers(n, seed) returns n Paper records whose shape
+# follows the bundled corpus (PAPERS_2026):
+#
+#   - JEL codes: the number per paper and the letter mix are fitted to the
+#     corpus (smoothed, so every letter occurs); a paper draws most codes
+#     from one primary letter, and within a letter a few codes are much
+#     more popular than the rest (Zipf), as in real classifications
+#   - authors: team sizes fitted to the corpus, names drawn from a pool in
+#     which a few authors are far more prolific than most
+#   - titles and abstracts: lengths fitted to the corpus, words drawn from
+#     its vocabulary with a share taken from the descriptions of the
+#     paper's JEL codes, so text and codes are correlated
+#
+# Output is a pure function of (n, seed, parameters). DOIs use the test
+# prefix 10.5555 so they can never clash with real ones.
+
+import random
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from .jel_codes import JEL_CODES, JEL_LETTERS
+from .papers import JOURNAL_COLORS, Paper
+
+SYNTHETIC_DOI_PREFIX = "10.5555"
+
+# Share of a paper's codes drawn from its primary letter
+PRIMARY_LETTER_SHARE = 0.6
+# Share of abstract and title words taken from the JEL code descriptions
+TOPIC_WORD_SHARE = 0.25
+# Zipf exponents for code popularity within a letter and author productivity
+CODE_ZIPF = 1.1
+AUTHOR_ZIPF = 0.7
+# Papers generated per batch (part of the random stream: changing it
+# changes the corpus)
+CHUNK_SIZE = 1 << 16
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _smoothed(counts: Counter, support, alpha: float = 1.0) -> np.ndarray:
+    """Return probabilities over ``support`` from ``counts`` with add-alpha smoothing."""
+    weights = np.array([counts.get(k, 0) + alpha for k in support], dtype=np.float64)
+    return weights / weights.sum()
+
+
+@lru_cache(maxsize=1)
+def corpus_profile() -> dict:
+    """Distributions fitted to the bundled corpus."""
+    from .papers import PAPERS_2026
+
+    letters = [l for l in JEL_LETTERS if any(c.startswith(l) for c in JEL_CODES)]
+    codes_by_letter = {l: sorted(c for c in JEL_CODES if c.startswith(l)) for l in letters}
+    # Popular codes differ per letter but not per run
+    rng = np.random.default_rng(0)
+    code_probs = {}
+    for letter, codes in codes_by_letter.items():
+        ranks = rng.permutation(len(codes)) + 1
+        weights = 1.0 / ranks ** CODE_ZIPF
+        code_probs[letter] = weights / weights.sum()
+
+    words = Counter(w for p in PAPERS_2026 for w in _WORD_RE.findall(f"{p.title} {p.abstract}".lower()))
+    vocabulary = sorted(words)
+    word_lengths = np.log([len(p.abstract.split()) for p in PAPERS_2026])
+    return {
+        "letters": letters,
+        "letter_probs": _smoothed(Counter(c[0] for p in PAPERS_2026 for c in p.jel_codes), letters),
+        "codes_by_letter": codes_by_letter,
+        "code_probs": code_probs,
+        "codes_per_paper": _smoothed(Counter(len(p.jel_codes) for p in PAPERS_2026), range(1, 9), 0.5),
+        "authors_per_paper": _smoothed(Counter(len(p.authors) for p in PAPERS_2026), range(1, 9), 0.25),
+        "abstract_log_words": (float(word_lengths.mean()), float(word_lengths.std())),
+        "title_words": (min(len(p.title.split()) for p in PAPERS_2026),
+                        max(len(p.title.split()) for p in PAPERS_2026)),
+        "vocabulary": np.array(vocabulary, dtype=object),
+        "word_probs": _smoothed(words, vocabulary, 0.0),
+        "topic_words": {c: _WORD_RE.findall(d.lower()) for c, d in JEL_CODES.items()},
+        "volumes": {p.journal: p.volume for p in PAPERS_2026 if p.volume},
+    }
+
+
+def author_names(n: int, seed: int = 0) -> List[str]:
+    """Return ``n`` distinct synthetic author names, some with middle initials."""
+    from .papers import PAPERS_2026
+
+    rng = random.Random(seed)
+    first = sorted({a.split()[0] for p in PAPERS_2026 for a in p.authors})
+    last = sorted({a.split()[-1] for p in PAPERS_2026 for a in p.authors})
+    names = []
+    for i in range(n):
+        middle = f" {chr(65 + rng.randrange(26))}." if rng.random() < 0.3 else ""
+        names.append(f"{rng.choice(first)}{middle} {rng.choice(last)}{i // len(last) or ''}")
+    return names
+
+
+def _jel_codes(rng: np.random.Generator, profile: dict, n: int) -> List[List[str]]:
+    letters = profile["letters"]
+    counts = rng.choice(np.arange(1, 9), size=n, p=profile["codes_per_paper"])
+    primary = rng.choice(len(letters), size=n, p=profile["letter_probs"])
+    # Letter of every code slot: the primary letter or an independent draw
+    slots = np.repeat(primary, counts)
+    other = rng.choice(len(letters), size=len(slots), p=profile["letter_probs"])
+    slots = np.where(rng.random(len(slots)) < PRIMARY_LETTER_SHARE, slots, other)
+
+    # Draw the code of each slot from its letter's Zipf distribution
+    codes = np.empty(len(slots), dtype=object)
+    for l, letter in enumerate(letters):
+        where = np.flatnonzero(slots == l)
+        table = np.array(profile["codes_by_letter"][letter], dtype=object)
+        codes[where] = table[rng.choice(len(table), size=len(where), p=profile["code_probs"][letter])]
+
+    bounds = np.r_[0, np.cumsum(counts)]
+    # Repeated draws collapse, so a paper can end up with fewer codes
+    return [sorted(set(codes[bounds[i]:bounds[i + 1]])) for i in range(n)]
+
+
+def _texts(rng: np.random.Generator, profile: dict, lengths: np.ndarray,
+           jel_codes: List[List[str]]) -> List[str]:
+    """Return one text of ``lengths[i]`` words per paper, partly on its JEL topics."""
+    vocabulary = profile["vocabulary"]
+    words = vocabulary[rng.choice(len(vocabulary), size=int(lengths.sum()), p=profile["word_probs"])]
+    picks = rng.random(len(words))
+    topic_words = profile["topic_words"]
+    texts = []
+    start = 0
+    for length, codes in zip(lengths.tolist(), jel_codes):
+        text = words[start:start + length]
+        topics = [w for c in codes for w in topic_words[c]]
+        if topics:
+            every = max(1, round(1 / TOPIC_WORD_SHARE))
+            text[::every] = [topics[int(u * len(topics))] for u in picks[start:start + length:every]]
+        texts.append(" ".join(text))
+        start += length
+    return texts
+
+
+def _generate_chunk(rng: np.random.Generator, profile: dict, start: int, n: int, seed: int,
+                    pool: np.ndarray, author_probs: np.ndarray, year: int,
+                    journals: List[str]) -> List[Paper]:
+    """Return papers ``start`` to ``start + n - 1`` of a synthetic corpus."""
+    journal_idx = rng.integers(0, len(journals), size=n)
+    months = rng.integers(1, 13, size=n)
+    jel_codes = _jel_codes(rng, profile, n)
+
+    team_sizes = rng.choice(np.arange(1, 9), size=n, p=profile["authors_per_paper"])
+    authors = pool[rng.choice(len(pool), size=int(team_sizes.sum()), p=author_probs)]
+    author_bounds = np.r_[0, np.cumsum(team_sizes)]
+
+    mean, std = profile["abstract_log_words"]
+    abstract_lengths = np.clip(np.round(np.exp(rng.normal(mean, std, size=n))), 15, 400).astype(np.int64)
+    lo, hi = profile["title_words"]
+    title_lengths = rng.integers(lo, hi + 1, size=n)
+    abstracts = _texts(rng, profile, abstract_lengths, jel_codes)
+    titles = _texts(rng, profile, title_lengths, jel_codes)
+    first_pages = rng.integers(1, 2000, size=n)
+    page_counts = rng.integers(15, 60, size=n)
+
+    papers = []
+    for i in range(n):
+        journal = journals[journal_idx[i]]
+        doi = f"{SYNTHETIC_DOI_PREFIX}/synthetic.{seed}.{start + i}"
+        papers.append(Paper(
+            title=titles[i][:1].upper() + titles[i][1:],
+            # A pool name drawn twice for one paper is listed once
+            authors=list(dict.fromkeys(authors[author_bounds[i]:author_bounds[i + 1]])),
+            journal=journal,
+            jel_codes=jel_codes[i],
+            abstract=abstracts[i][:1].upper() + abstracts[i][1:] + ".",
+            url=f"https://doi.org/{doi}",
+            year=year,
+            month=int(months[i]),
+            volume=profile["volumes"].get(journal, 100) + (year - 2026),
+            issue=int(months[i]),
+            pages=f"{first_pages[i]}-{first_pages[i] + page_counts[i]}",
+            doi=doi,
+        ))
+    return papers
+
+
+def iter_papers(n: int, seed: int = 0, n_authors: Optional[int] = None, year: int = 2026,
+                journals: Optional[List[str]] = None) -> Iterator[List[Paper]]:
+    """Yield the papers of ``generate_papers(n, seed, ...)`` in lists of CHUNK_SIZE.
+
+    Only one chunk is alive at a time, however large ``n`` is.
+    """
+    profile = corpus_profile()
+    rng = np.random.default_rng(seed)
+    journals = list(JOURNAL_COLORS) if journals is None else list(journals)
+    n_authors = max(n, 100) if n_authors is None else n_authors
+    pool = np.array(author_names(n_authors, seed), dtype=object)
+    productivity = 1.0 / np.arange(1, n_authors + 1) ** AUTHOR_ZIPF
+    author_probs = productivity / productivity.sum()
+    for start in range(0, n, CHUNK_SIZE):
+        yield _generate_chunk(rng, profile, start, min(CHUNK_SIZE, n - start), seed,
+                              pool, author_probs, year, journals)
+
+
+def generate_papers(n: int, seed: int = 0, **params) -> List[Paper]:
+    """Return ``n`` synthetic papers (deterministic for a given seed).
+
+    Authors come from a pool of ``n_authors`` names (default: about one
+    per paper) built by ``author_names(n_authors, seed)``. Papers are
+    spread uniformly over ``journals`` and the months of ``year``.
+    """
+    return [paper for chunk in iter_papers(n, seed, **params) for paper in chunk]
+
+
+def generate_store(n: int, seed: int = 0, **params):
+    """Return a PaperStore holding ``generate_papers(n, seed, **params)``.
+
+    Built chunk by chunk, so memory stays close to the size of the store.
+    """
+    from .segments import concat_stores
+    from .store import PaperStore
+    stores = [PaperStore.from_papers(chunk) for chunk in iter_papers(n, seed, **params)]
+    if not stores:
+        return PaperStore.from_papers([])
+    return concat_stores(stores)
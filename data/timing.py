@@ -0,0 +1,189 @@
+# Hot-path timing for truffle.econ
+# Named spans time the stages of a Streamlit rerun (filtering, figure
+# construction, serialization, rendering the paper cards, ...):
+#
+#   with span("figure.build"):
+#       fig = create_jel_visualization(papers)
+#
+# Every span adds one sample to a rolling window per name, from which
+# stats() reports p50/p95/p99. A run (one rerun of the script) also
+# collects its spans into a record: total milliseconds and call count per
+# name. Recent records are kept in memory and, with TRUFFLE_TIMING_LOG
+# set, appended to that file as JSON lines for external dashboards.
+# TRUFFLE_TIMING=0 turns every span into a no-op.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, wraps
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Samples kept per span name, and run records kept in memory
+DEFAULT_WINDOW = 500
+DEFAULT_RUNS = 200
+
+PERCENTILES = (50, 95, 99)
+
+_DISABLED = nullcontext()
+
+
+class Timer:
+    """Collects span durations per name over a rolling window. Thread-safe.
+
+    Streamlit serves every session from its own thread, so the current run
+    is tracked per thread while the windows are shared.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, max_runs: int = DEFAULT_RUNS,
+                 enabled: bool = True, log_path: Optional[str] = None):
+        self.window = window
+        self.enabled = enabled
+        self.log_path = log_path
+        self.runs = deque(maxlen=max_runs)
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one duration sample for ``name``."""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            total, count = run.get(name, (0.0, 0))
+            run[name] = (total + seconds, count + 1)
+
+    @contextmanager
+    def _span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def span(self, name: str):
+        """Context manager timing the enclosed block as ``name``."""
+        return self._span(name) if self.enabled else _DISABLED
+
+    def timed(self, name: Optional[str] = None):
+        """Decorator timing every call of a function (default name: its name)."""
+        def decorate(fn):
+            label = name or fn.__name__
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    @contextmanager
+    def run(self, name: str = "rerun"):
+        """Time a whole run and record its spans as one record.
+
+        The run itself is also a span named ``name``. A run left by an
+        exception (e.g. Streamlit's rerun request) is marked incomplete.
+        """
+        if not self.enabled or getattr(self._local, "run", None) is not None:
+            yield
+            return
+        self._local.run = {}
+        start = time.perf_counter()
+        complete = False
+        try:
+            yield
+            complete = True
+        finally:
+            seconds = time.perf_counter() - start
+            spans, self._local.run = self._local.run, None
+            self.record(name, seconds)
+            record = {
+                "ts": round(time.time(), 3),
+                "run": name,
+                "complete": complete,
+                "total_ms": round(seconds * 1e3, 3),
+                "spans": {k: {"ms": round(total * 1e3, 3), "count": count}
+                          for k, (total, count) in spans.items()},
+            }
+            self.runs.append(record)
+            if self.log_path:
+                self._append_log([record])
+
+    def stats(self) -> Dict[str, dict]:
+        """Return count, mean, max and percentiles (ms) of each span's window."""
+        with self._lock:
+            windows = {name: np.array(samples) for name, samples in self._samples.items()}
+        stats = {}
+        for name, samples in sorted(windows.items()):
+            if len(samples) == 0:
+                continue
+            values = np.percentile(samples, PERCENTILES) * 1e3
+            stats[name] = {
+                "count": len(samples),
+                "mean_ms": float(samples.mean() * 1e3),
+                **{f"p{p}_ms": float(v) for p, v in zip(PERCENTILES, values)},
+                "max_ms": float(samples.max() * 1e3),
+            }
+        return stats
+
+    def runs_jsonl(self) -> str:
+        """Return the recent run records as JSON lines."""
+        return "".join(json.dumps(r) + "\n" for r in list(self.runs))
+
+    def stats_jsonl(self) -> str:
+        """Return the current stats as JSON lines, one per span name."""
+        ts = round(time.time(), 3)
+        return "".join(json.dumps({"ts": ts, "span": name, **values}) + "\n"
+                       for name, values in self.stats().items())
+
+    def export_jsonl(self, path: str, what: str = "runs") -> None:
+        """Append the run records (``what="runs"``) or stats (``"stats"``) to ``path``."""
+        text = self.runs_jsonl() if what == "runs" else self.stats_jsonl()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def _append_log(self, records: List[dict]) -> None:
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+        except OSError:
+            # Timing must never break the app
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self.runs.clear()
+
+
+@lru_cache(maxsize=None)
+def get_timer() -> Timer:
+    """Return the process-wide timer (configured from the environment)."""
+    return Timer(enabled=os.environ.get("TRUFFLE_TIMING", "1") != "0",
+                 log_path=os.environ.get("TRUFFLE_TIMING_LOG"))
+
+
+def span(name: str):
+    """Time the enclosed block as ``name`` on the process-wide timer."""
+    return get_timer().span(name)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator timing calls on the process-wide timer."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_timer().span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,87 @@
+"""facet_cube against brute-force counts over the store's papers."""
+
+import itertools
+from collections import Counter
+
+import pytest
+
+from data.aggregate import DIMENSIONS, facet_cube
+from data.jel_codes import decode_jel_code, encode_jel_code
+from data.papers import Paper
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(800, seed=13) + [
+    # Repeated and unlisted codes, two codes of one letter
+    Paper(title="Odd", authors=["A"], journal="Journal of Nothing", jel_codes=["J31", "J31", "X99", "J32"],
+          abstract="", url="", year=2030, month=1),
+    Paper(title="No codes", authors=["B"], journal="Journal of Nothing", jel_codes=[], abstract="", url="",
+          year=2030, month=2),
+]
+
+
+def values(paper: Paper, dim: str) -> list:
+    codes = sorted({decode_jel_code(c) for c in map(encode_jel_code, paper.jel_codes) if c >= 0})
+    return {"journal": [paper.journal], "year": [paper.year], "month": [(paper.year, paper.month)],
+            "jel_letter": sorted({c[0] for c in codes}), "jel_code": codes}[dim]
+
+
+def brute_force(papers, dims, paper_ids=None) -> Counter:
+    ids = range(len(papers)) if paper_ids is None else paper_ids
+    counts = Counter()
+    for i in ids:
+        counts.update(itertools.product(*(values(papers[i], d) for d in dims)))
+    return counts
+
+
+def cells(cube) -> dict:
+    return {tuple(row[d] for d in cube.dims): row["papers"] for row in cube.to_frame().to_dict("records")}
+
+
+# One JEL dimension at most per cube
+COMBOS = ([(d,) for d in DIMENSIONS]
+          + [c for n in (2, 3) for c in itertools.combinations(DIMENSIONS, n)
+             if sum(d.startswith("jel_") for d in c) <= 1])
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PaperStore.from_papers(PAPERS)
+
+
+@pytest.fixture(scope="module")
+def papers(store):
+    return [store.to_paper(i) for i in range(len(store))]
+
+
+def selections(papers):
+    yield None
+    yield [i for i, p in enumerate(papers) if p.journal == papers[0].journal]
+    yield range(0, len(papers), 7)
+    yield [len(papers) - 2]
+    yield []
+
+
+@pytest.mark.parametrize("dims", COMBOS, ids="-".join)
+def test_cube_matches_brute_force(store, papers, dims):
+    for paper_ids in selections(papers):
+        cube = facet_cube(store, dims, paper_ids)
+        assert cube.dims == dims
+        assert cells(cube) == dict(brute_force(papers, dims, paper_ids)), paper_ids
+
+
+def test_labels_list_every_value(store, papers):
+    full = facet_cube(store, ("journal", "month", "jel_code"))
+    filtered = facet_cube(store, ("journal", "month", "jel_code"), [0])
+    assert full.labels == filtered.labels
+    for dim in full.dims:
+        assert sorted(full.labels[dim]) == sorted({v for p in papers for v in values(p, dim)})
+    paper = papers[0]
+    assert filtered.count(journal=paper.journal, month=(paper.year, paper.month),
+                          jel_code=values(paper, "jel_code")[0]) == 1
+
+
+@pytest.mark.parametrize("dims", [(), ("colour",), ("journal", "journal"), ("jel_letter", "jel_code")])
+def test_bad_dimensions_are_rejected(store, dims):
+    with pytest.raises(ValueError):
+        facet_cube(store, dims)
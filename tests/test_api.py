@@ -0,0 +1,98 @@
+"""The JSON API through starlette's TestClient: ETags, cursors and parameter errors."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from data.api import CorpusAPI, create_app
+from data.segments import SegmentedCorpus
+from data.store import PaperStore
+from data.synthetic import generate_papers, generate_store
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(create_app(generate_store(300, seed=5))) as client:
+        yield client
+
+
+@pytest.fixture
+def corpus():
+    """An in-memory corpus whose store changes (new version) on append."""
+    return SegmentedCorpus([PaperStore.from_papers(generate_papers(120, seed=6))])
+
+
+def test_etag_answers_not_modified(client):
+    first = client.get("/papers", params={"limit": 5})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = client.get("/papers", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    # Any encoding of the same entity matches, as does a weak tag
+    plain = client.get("/papers", params={"limit": 5}, headers={"Accept-Encoding": "identity"})
+    for tag in (plain.headers["etag"], "W/" + etag, f'"other", {etag}', "*"):
+        assert client.get("/papers", params={"limit": 5},
+                          headers={"If-None-Match": tag}).status_code == 304
+    # Another request is another entity
+    other = client.get("/papers", params={"limit": 6}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+
+def test_etag_changes_with_the_corpus(corpus):
+    with TestClient(Starlette(routes=CorpusAPI(corpus.current).routes())) as client:
+        etag = client.get("/facets").headers["etag"]
+        corpus.append(generate_papers(10, seed=7))
+        response = client.get("/facets", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 130
+
+
+def test_cursor_pages_through_results(client):
+    seen, cursor = [], None
+    while True:
+        page = client.get("/papers", params={"limit": 40, **({"cursor": cursor} if cursor else {})}).json()
+        seen.extend(p["id"] for p in page["papers"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(300))
+    assert page["total"] == 300
+
+
+def test_cursor_expires_after_store_swap(corpus):
+    with TestClient(Starlette(routes=CorpusAPI(corpus.current).routes())) as client:
+        cursor = client.get("/papers", params={"limit": 10}).json()["next_cursor"]
+        assert client.get("/papers", params={"limit": 10, "cursor": cursor}).status_code == 200
+        corpus.append(generate_papers(10, seed=7))
+        expired = client.get("/papers", params={"limit": 10, "cursor": cursor})
+    assert expired.status_code == 410
+    assert "cursor expired" in expired.json()["error"]
+
+
+@pytest.mark.parametrize("path, params, message", [
+    ("/papers", {"journal": "Journal of Nothing"}, "unknown journal"),
+    ("/facets", {"journal": "Journal of Nothing"}, "unknown journal"),
+    ("/papers", {"jel": "X99"}, "unknown JEL code"),
+    ("/chart", {"jel": "J3"}, "unknown JEL code"),
+    ("/cooccurrence", {"code": "X99"}, "unknown JEL code"),
+    ("/cube", {"dim": "colour"}, "Unknown cube dimension"),
+    ("/cube", {"dim": ["journal", "journal"]}, "Repeated cube dimension"),
+    ("/facets", {"facet": "colour"}, "unknown facet"),
+    ("/papers", {"cursor": "not-a-cursor"}, "invalid cursor"),
+    ("/papers", {"month": "2026-13"}, "month must be YYYY-MM"),
+    ("/papers", {"limit": "0"}, "limit must be between"),
+])
+def test_bad_parameters_are_rejected(client, path, params, message):
+    response = client.get(path, params=params)
+    assert response.status_code == 400
+    assert message in response.json()["error"]
+
+
+def test_known_values_are_accepted(client):
+    root = client.get("/").json()
+    journal = root["journals"][0]
+    assert client.get("/papers", params={"journal": journal, "jel": "j31"}).status_code == 200
+    assert client.get("/cube", params={"dim": ["journal", "jel_letter"]}).status_code == 200
+    assert client.get("/cooccurrence", params={"code": "J31"}).status_code == 200
@@ -0,0 +1,101 @@
+"""CooccurrenceIndex against brute-force pair counts over the papers."""
+
+from collections import Counter
+
+import pytest
+
+from data.cooccurrence import CooccurrenceIndex
+from data.jel_codes import decode_jel_code, encode_jel_code
+from data.papers import Paper
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(600, seed=11)
+ADDED = [
+    Paper(title="Added", authors=["A"], journal=PAPERS[0].journal, jel_codes=["J31", "J31", "D81", "X99"],
+          abstract="", url="", year=PAPERS[0].year, month=PAPERS[0].month),
+    Paper(title="Added in a new slice", authors=["B"], journal="Journal of Nothing", jel_codes=["J31", "E52"],
+          abstract="", url="", year=2030, month=1),
+    Paper(title="No codes", authors=["C"], journal=PAPERS[1].journal, jel_codes=[], abstract="", url="",
+          year=PAPERS[1].year, month=PAPERS[1].month),
+]
+
+
+def brute_force(papers, journals=None, year_month=None) -> Counter:
+    """(code a, code b) -> papers listing both (a == b: papers listing a)."""
+    counts = Counter()
+    for paper in papers:
+        if journals is not None and paper.journal not in journals:
+            continue
+        if year_month is not None and (paper.year, paper.month) != tuple(year_month):
+            continue
+        codes = {c for c in (encode_jel_code(code) for code in paper.jel_codes) if c >= 0}
+        counts.update((a, b) for a in codes for b in codes)
+    return counts
+
+
+def filters():
+    first = PAPERS[0]
+    yield None, None
+    yield [first.journal], None
+    yield None, (first.year, first.month)
+    yield [first.journal, PAPERS[1].journal], (first.year, first.month)
+    yield ["Journal of Nothing"], None
+    yield [], None
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CooccurrenceIndex.from_store(PaperStore.from_papers(PAPERS))
+
+
+@pytest.fixture(scope="module")
+def added_index():
+    index = CooccurrenceIndex.from_store(PaperStore.from_papers(PAPERS))
+    for paper in ADDED:
+        index.add(paper.journal, (paper.year, paper.month), paper.jel_codes)
+    return index
+
+
+def assert_matches(index, papers, journals, year_month):
+    expected = brute_force(papers, journals, year_month)
+    matrix = index.matrix(journals, year_month)
+    rows = matrix.row_ids()
+    assert {(int(a), int(b)): int(n) for a, b, n in zip(rows, matrix.indices, matrix.data)} == dict(expected)
+
+    for code in ("J31", "D81", "E52"):
+        code_id = encode_jel_code(code)
+        related = Counter({decode_jel_code(b): n for (a, b), n in expected.items()
+                           if a == code_id and b != code_id})
+        full = sorted(related.items(), key=lambda item: (-item[1], item[0]))
+        assert index.related(code, len(full) + 5, journals, year_month) == full
+        # Ties at the cut may pick either code; the counts are fixed
+        top = index.related(code, 3, journals, year_month)
+        assert [n for _, n in top] == [n for _, n in full[:3]]
+
+
+@pytest.mark.parametrize("journals, year_month", list(filters()))
+def test_matches_brute_force(index, journals, year_month):
+    assert_matches(index, PAPERS, journals, year_month)
+
+
+@pytest.mark.parametrize("journals, year_month", list(filters()))
+def test_matches_brute_force_after_add(added_index, journals, year_month):
+    assert_matches(added_index, PAPERS + ADDED, journals, year_month)
+
+
+def test_extended_matches_rebuild():
+    store = PaperStore.from_papers(PAPERS + ADDED)
+    extended = CooccurrenceIndex.from_store(PaperStore.from_papers(PAPERS)).extended(store, len(PAPERS))
+    rebuilt = CooccurrenceIndex.from_store(store)
+    assert extended.slice_keys() == rebuilt.slice_keys()
+    for journals, year_month in filters():
+        assert_matches(extended, PAPERS + ADDED, journals, year_month)
+    assert extended.nbytes == rebuilt.nbytes
+
+
+def test_reads_do_not_modify_the_index(added_index):
+    slices = dict(added_index.slices)
+    added_index.related("J31", 5)
+    added_index.matrix()
+    assert added_index.slices == slices
@@ -0,0 +1,140 @@
+"""Roaring-style bitmaps and the FilterEngine against Python sets and store scans."""
+
+import random
+
+import numpy as np
+import pytest
+
+from data.bitmap import ARRAY_MAX, CHUNK_BITS, Bitmap, FilterEngine, union_all
+from data.index import PaperIndex
+from data.papers import Paper
+from data.segments import append_store
+from data.store import PaperStore
+from data.synthetic import generate_papers, generate_store
+
+CHUNK = 1 << CHUNK_BITS
+
+
+def random_ids(rng: random.Random, chunks: dict) -> set:
+    """Ids with ``chunks[key]`` members in chunk ``key``."""
+    ids = set()
+    for key, n in chunks.items():
+        ids.update(key * CHUNK + i for i in rng.sample(range(CHUNK), n))
+    return ids
+
+
+# Per chunk: sparse (array container), just below / above ARRAY_MAX, dense (bitmap)
+SHAPES = [
+    {0: 10, 1: 3000, 3: 20000},
+    {0: 3000, 1: 2000, 2: 5},
+    {0: ARRAY_MAX, 1: ARRAY_MAX + 1, 3: 5},
+    {1: 60000, 2: 1},
+    {},
+]
+
+
+def bitmap(ids: set) -> Bitmap:
+    return Bitmap.from_ids(sorted(ids))
+
+
+def as_set(b: Bitmap) -> set:
+    ids = b.to_ids()
+    assert np.all(np.diff(ids) > 0)
+    return set(ids.tolist())
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_set_operations_match_python_sets(seed):
+    rng = random.Random(seed)
+    sets = [random_ids(rng, shape) for shape in SHAPES]
+    for a in sets:
+        assert as_set(bitmap(a)) == a
+        assert bitmap(a).count() == len(a)
+        for b in sets:
+            assert as_set(bitmap(a) & bitmap(b)) == a & b
+            assert as_set(bitmap(a) | bitmap(b)) == a | b
+            assert as_set(bitmap(a) - bitmap(b)) == a - b
+            assert bitmap(a).and_count(bitmap(b)) == len(a & b)
+    assert as_set(union_all(bitmap(s) for s in sets)) == set().union(*sets)
+
+
+def test_containers_switch_at_array_max():
+    below = Bitmap.from_ids(np.arange(ARRAY_MAX))
+    above = Bitmap.from_ids(np.arange(ARRAY_MAX + 1))
+    assert below.containers[0].dtype == np.uint16
+    assert above.containers[0].dtype == np.uint64
+    # Two array containers whose union outgrows ARRAY_MAX
+    evens, odds = Bitmap.from_ids(np.arange(0, 6000, 2)), Bitmap.from_ids(np.arange(1, 6000, 2))
+    assert (evens | odds).containers[0].dtype == np.uint64
+    assert union_all([evens, odds]).containers[0].dtype == np.uint64
+    assert (evens | odds).count() == union_all([evens, odds]).count() == 6000
+    # Subtracting everything drops the chunk
+    assert not (evens - evens) and not (above - above)
+
+
+@pytest.fixture(scope="module")
+def store():
+    return generate_store(2500, seed=8)
+
+
+@pytest.fixture(scope="module")
+def engine(store):
+    return FilterEngine(PaperIndex(store))
+
+
+def filter_states(store):
+    journals = list(store.journals)
+    months = sorted({(int(y), int(m)) for y, m in zip(store.years, store.months)})
+    yield None, None
+    yield journals[:1], None
+    yield journals[1:3], months[0]
+    yield None, months[-1]
+    yield [], None
+    yield ["Journal of Nothing"], None
+
+
+def test_query_matches_filter_mask(store, engine):
+    for journals, year_month in filter_states(store):
+        expected = np.flatnonzero(store.filter_mask(journals, year_month))
+        assert np.array_equal(engine.query(journals=journals, year_month=year_month).to_ids(), expected)
+
+
+def test_jel_filters_match_scan(store, engine):
+    papers = [store.to_paper(i) for i in range(len(store))]
+    for codes in (["J31"], ["J31", "D81"], ["X99"], []):
+        expected = [i for i, p in enumerate(papers) if set(p.jel_codes) & set(codes)]
+        assert engine.query(jel_codes=codes).to_ids().tolist() == expected
+    expected = [i for i, p in enumerate(papers) if any(c[0] in "JD" for c in p.jel_codes)]
+    assert engine.query(jel_letters=["j", "D"]).to_ids().tolist() == expected
+
+
+def test_facet_counts_match_scan(store, engine):
+    papers = [store.to_paper(i) for i in range(len(store))]
+    for journals, year_month in filter_states(store):
+        within = engine.query(journals=journals, year_month=year_month)
+        ids = within.to_ids().tolist()
+        expected = {}
+        for i in ids:
+            for code in set(papers[i].jel_codes):
+                expected[code] = expected.get(code, 0) + 1
+        counts = engine.facet_counts("jel_code", within)
+        assert {c: n for c, n in counts.items() if n} == expected
+        letters = engine.facet_counts("jel_letter", within)
+        assert sum(letters.values()) == sum(len({c[0] for c in papers[i].jel_codes}) for i in ids)
+
+
+def test_extended_engine_matches_rebuild(store):
+    # Repeated and unlisted codes in the appended rows
+    tail = PaperStore.from_papers(generate_papers(300, seed=9) + [
+        Paper(title="Odd", authors=["A"], journal="Journal of Nothing", jel_codes=["J31", "X99", "J31"],
+              abstract="", url="", year=2030, month=1)])
+    merged = append_store(store, tail)
+    previous = FilterEngine(PaperIndex(store))
+    extended = FilterEngine(PaperIndex(merged, previous.index), previous)
+    rebuilt = FilterEngine(PaperIndex(merged))
+    assert as_set(extended.universe) == set(range(len(merged)))
+    for facet in FilterEngine.FACETS:
+        assert {v: b.to_ids().tolist() for v, b in extended.facets[facet].items()} == \
+            {v: b.to_ids().tolist() for v, b in rebuilt.facets[facet].items()}
+    within = rebuilt.query(year_month=(2030, 1))
+    assert {c: n for c, n in extended.facet_counts("jel_code", within).items() if n} == {"J31": 1, "X99": 1}
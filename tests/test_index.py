@@ -0,0 +1,114 @@
+"""PaperIndex posting lists, queries and JEL rollups against brute-force scans of the papers."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from data.index import PaperIndex
+from data.jel_codes import JEL_CODE_STRIDE, decode_jel_code, encode_jel_code, jel_code_range
+from data.papers import Paper
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(1500, seed=4) + [
+    # Repeated and unlisted codes
+    Paper(title="Odd", authors=["A"], journal="Journal of Nothing", jel_codes=["J31", "J31", "X99", "J32"],
+          abstract="", url="", year=2030, month=1),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return PaperIndex(PaperStore.from_papers(PAPERS))
+
+
+def brute_force(journals=None, year_month=None, jel_codes=None, jel_letters=None, jel_nodes=None):
+    def matches(paper):
+        codes = paper.jel_codes
+        return ((journals is None or paper.journal in journals)
+                and (year_month is None or (paper.year, paper.month) == year_month)
+                and (jel_codes is None or any(c in codes for c in jel_codes))
+                and (jel_letters is None or any(c[0] == l.upper() for c in codes for l in jel_letters))
+                and (jel_nodes is None or any(c.startswith(n) for c in codes for n in jel_nodes)))
+    return [i for i, paper in enumerate(PAPERS) if matches(paper)]
+
+
+JOURNALS = sorted({p.journal for p in PAPERS})
+MONTHS = sorted({(p.year, p.month) for p in PAPERS})
+
+# Per facet: unfiltered, one value, several values (OR), unknown values, nothing
+FACETS = {
+    "journals": [None, JOURNALS[:1], JOURNALS[1:3], ["Journal of Nowhere"], []],
+    "year_month": [None, MONTHS[0], MONTHS[-1], (1900, 1)],
+    "jel_codes": [None, ["J31"], ["J31", "D81", "X99"], ["Q99"], []],
+    "jel_letters": [None, ["j"], ["D", "E"], []],
+    "jel_nodes": [None, ["J3"], ["C", "J31", "E5"], ["Z9"], []],
+}
+
+
+@pytest.mark.parametrize("facet", FACETS)
+def test_single_facet(index, facet):
+    for value in FACETS[facet]:
+        assert index.query(**{facet: value}).tolist() == brute_force(**{facet: value}), value
+
+
+def test_facets_combine_with_and(index):
+    names = list(FACETS)
+    for a, b in itertools.combinations(names, 2):
+        for va, vb in itertools.product(FACETS[a], FACETS[b]):
+            filters = {a: va, b: vb}
+            assert index.query(**filters).tolist() == brute_force(**filters), filters
+    filters = {"journals": JOURNALS[:2], "year_month": MONTHS[-1], "jel_letters": ["J", "D"],
+               "jel_nodes": ["J", "D8"]}
+    assert index.query(**filters).tolist() == brute_force(**filters)
+
+
+def test_unfiltered_and_empty(index):
+    assert np.array_equal(index.query(), np.arange(len(PAPERS)))
+    assert len(index.query(journals=[], year_month=MONTHS[0])) == 0
+    result = index.query(journals=JOURNALS)
+    assert result.dtype == np.int32 and np.all(np.diff(result) > 0)
+
+
+def brute_force_rollup(level: int) -> dict:
+    """Papers per JEL node at ``level``, each paper counted once per node."""
+    counts = {}
+    for paper in PAPERS:
+        nodes = {decode_jel_code(c)[:level + 1] for c in map(encode_jel_code, paper.jel_codes) if c >= 0}
+        for node in nodes:
+            counts[node] = counts.get(node, 0) + 1
+    return counts
+
+
+@pytest.mark.parametrize("level", [0, 1, 2])
+def test_rollup_matches_brute_force(index, level):
+    expected = brute_force_rollup(level)
+    assert index.jel_rollup(level) == expected
+    for node in expected:
+        assert index.jel_node(node).tolist() == brute_force(jel_nodes=[node])
+    # Restricted to a subtree, at or above the level
+    for node in ("J", "J3", "D8", "E", "Z"):
+        if len(node) <= level + 1:
+            assert index.jel_rollup(level, node) == {n: c for n, c in expected.items() if n.startswith(node)}
+
+
+def test_rollup_of_a_node_below_the_level(index):
+    codes = brute_force_rollup(2)
+    assert index.jel_rollup(0, "j31") == {"J": codes["J31"]}
+    assert index.jel_rollup(1, " J31 ") == {"J3": codes["J31"]}
+    assert index.jel_rollup(0, "J3") == {"J": brute_force_rollup(1)["J3"]}
+
+
+@pytest.mark.parametrize("node", ["JJ", "J123", "3", "J-1"])
+def test_invalid_nodes_are_empty(index, node):
+    assert jel_code_range(node) == (0, 0)
+    assert len(index.jel_node(node)) == 0
+    assert index.jel_rollup(1, node) == {}
+
+
+def test_jel_code_range_nests():
+    first = encode_jel_code("J00")
+    assert jel_code_range("J") == (first, first + JEL_CODE_STRIDE)
+    assert jel_code_range("j3") == (first + 30, first + 40)
+    assert jel_code_range(" J31 ") == (first + 31, first + 32)
@@ -0,0 +1,129 @@
+"""Crossref ingestion against recorded responses served by FixtureServer."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from data.ingest import (JOURNAL_ISSNS, PAGE_ROWS, IngestError, _month_filter, fetch_papers, ingest,
+                         ingest_segment)
+from data.papers import Paper
+from data.replay import FixtureServer, Recording, request_key
+from data.segments import SegmentedCorpus
+from data.snapshot import load_snapshot, write_snapshot
+from data.store import PaperStore
+
+MONTH = (2026, 3)
+# Econometrica spans three pages, the other journals one
+PAPERS_PER_JOURNAL = {journal: 230 if journal == "Econometrica" else 3 for journal in JOURNAL_ISSNS}
+N_PAGES = sum(-(-(n + 1) // PAGE_ROWS) for n in PAPERS_PER_JOURNAL.values())
+
+
+def work(journal: str, i: int) -> dict:
+    return {
+        "DOI": f"10.1/{JOURNAL_ISSNS[journal]}.{i}",
+        "title": [f"<i>Paper</i> {i} of {journal}"],
+        "author": [{"given": "Ann", "family": "Smith"}],
+        "published-print": {"date-parts": [[MONTH[0], MONTH[1]]]},
+        "abstract": "<jats:p>We study things. (JEL D81, J13)</jats:p>",
+        "type": "journal-article",
+    }
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Crossref responses for every journal's March 2026 issue."""
+    recording = Recording(str(tmp_path / "fixtures"))
+    for journal, n in PAPERS_PER_JOURNAL.items():
+        issn = JOURNAL_ISSNS[journal]
+        # Front matter without authors is skipped by the parser
+        items = [work(journal, i) for i in range(n)] + [
+            {"DOI": f"10.1/{issn}.front", "title": ["Front Matter"],
+             "published-print": {"date-parts": [[MONTH[0], MONTH[1]]]}}]
+        for offset in range(0, len(items), PAGE_ROWS):
+            params = {"filter": _month_filter(MONTH, MONTH), "rows": PAGE_ROWS, "offset": offset}
+            body = {"message": {"total-results": len(items), "items": items[offset:offset + PAGE_ROWS]}}
+            recording.put(request_key(f"/journals/{issn}/works?{httpx.QueryParams(params)}"), 200,
+                          {"etag": f'"{issn}-{offset}"', "content-type": "application/json"},
+                          json.dumps(body))
+    return recording
+
+
+def fetch(server, **params):
+    params.setdefault("recording", None)
+    return asyncio.run(fetch_papers(MONTH, MONTH, base_url=server.url, **params))
+
+
+def test_failed_requests_are_retried(recording):
+    with FixtureServer(recording, fail_first=2) as server:
+        papers, fetcher = fetch(server, retries=2, backoff=0)
+    assert len(papers) == sum(PAPERS_PER_JOURNAL.values())
+    assert fetcher.retried == 2 * N_PAGES
+    assert server.requests == 3 * N_PAGES
+
+
+def test_retries_are_bounded(recording):
+    with FixtureServer(recording, fail_first=3) as server:
+        with pytest.raises(IngestError):
+            fetch(server, retries=2, backoff=0)
+
+
+def test_not_modified_reuses_recorded_body(recording, tmp_path):
+    cache = str(tmp_path / "cache")
+    with FixtureServer(recording) as server:
+        first, fetcher = fetch(server, recording=cache)
+        assert fetcher.not_modified == 0
+        second, fetcher = fetch(server, recording=cache)
+    assert fetcher.not_modified == server.not_modified == N_PAGES
+    assert second == first
+
+
+def test_per_host_concurrency_limit(recording):
+    with FixtureServer(recording, delay=0.05) as server:
+        papers, fetcher = fetch(server, per_host=2)
+    assert fetcher.requests == N_PAGES
+    assert server.peak_in_flight == 2
+
+
+def known_papers():
+    """Stored copies of two fetched papers, plus one paper Crossref does not return."""
+    aer = "American Economic Review"
+    return [
+        # Stored with an upper-case DOI; Crossref's is lower-cased
+        Paper(title="Paper 0 of American Economic Review", authors=["Ann Smith"], journal=aer,
+              jel_codes=["D81"], abstract="", url="", year=MONTH[0], month=MONTH[1],
+              doi=f"10.1/{JOURNAL_ISSNS[aer]}.0".upper()),
+        # No DOI: matched on journal, issue month and title
+        Paper(title="paper 1  of American Economic Review", authors=["Ann Smith"], journal=aer,
+              jel_codes=["D81"], abstract="", url="", year=MONTH[0], month=MONTH[1]),
+        Paper(title="An older paper", authors=["Bo Li"], journal=aer, jel_codes=["E52"], abstract="",
+              url="", year=2025, month=12, doi=" 10.1/old.1 "),
+    ]
+
+
+def test_ingest_snapshot_skips_known_papers(recording, tmp_path):
+    path = str(tmp_path / "corpus.snap")
+    write_snapshot(PaperStore.from_papers(known_papers()), path)
+    with FixtureServer(recording) as server:
+        store, _ = ingest(MONTH, MONTH, path=path, base_url=server.url, recording=None)
+        assert len(store) == sum(PAPERS_PER_JOURNAL.values()) + 1
+        # A second run over the same fetch changes nothing
+        store, _ = ingest(MONTH, MONTH, path=path, base_url=server.url, recording=None)
+    assert len(load_snapshot(path)) == len(store) == sum(PAPERS_PER_JOURNAL.values()) + 1
+    # The stored copy without a DOI was replaced by the fetched record
+    issn = JOURNAL_ISSNS["American Economic Review"]
+    assert store.to_paper(1).doi == f"10.1/{issn}.1"
+
+
+def test_ingest_segment_skips_known_papers(recording, tmp_path):
+    directory = str(tmp_path / "corpus.d")
+    SegmentedCorpus.create(directory, PaperStore.from_papers(known_papers()))
+    with FixtureServer(recording) as server:
+        corpus, _ = ingest_segment(MONTH, MONTH, directory=directory, base_url=server.url, recording=None)
+        assert len(corpus) == sum(PAPERS_PER_JOURNAL.values()) + 1
+        assert len(corpus.segments) == 2
+        # A second run finds nothing new
+        corpus, _ = ingest_segment(MONTH, MONTH, directory=directory, base_url=server.url, recording=None)
+    assert len(corpus) == sum(PAPERS_PER_JOURNAL.values()) + 1
+    assert len(corpus.segments) == 2
@@ -0,0 +1,102 @@
+"""parse_jel_codes must agree with parse_jel_code / encode_jel_code on every input."""
+
+import random
+import string
+
+import numpy as np
+import pytest
+
+from data.jel_codes import JEL_CODES, encode_jel_code, parse_jel_code, parse_jel_codes
+
+INT64_MAX = np.iinfo(np.int64).max
+
+# Letters, digits, whitespace, signs and a few non-ASCII characters
+# (including a non-ASCII digit, which int() accepts)
+ALPHABET = string.ascii_letters + string.digits + " \t\n+-_.Jjßé٣\x00"
+KNOWN = sorted(JEL_CODES)
+
+
+def random_codes(seed: int, n: int = 5000) -> list:
+    rng = random.Random(seed)
+    codes = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.3:
+            # Real codes, with random case and surrounding whitespace
+            code = rng.choice(KNOWN)
+            code = "".join(c.lower() if rng.random() < 0.5 else c for c in code)
+            code = rng.choice(["", " ", "\t"]) + code + rng.choice(["", " ", "\n"])
+        elif kind < 0.4:
+            # Long digit runs, around the int64 limit
+            code = rng.choice(string.ascii_letters) + "".join(
+                rng.choice(string.digits) for _ in range(rng.randint(15, 25)))
+        else:
+            code = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 6)))
+        codes.append(code)
+    return codes
+
+
+def assert_matches_scalar(codes):
+    batch = parse_jel_codes(codes)
+    assert len(batch) == len(codes)
+    for i, code in enumerate(codes):
+        letter, number = parse_jel_code(code)
+        # NumPy strings cannot end in NUL, so a NUL letter reads back as ""
+        assert batch.letters[i] == letter.rstrip("\0"), repr(code)
+        assert int(batch.numbers[i]) == max(min(number, INT64_MAX), -INT64_MAX), repr(code)
+        code_id = encode_jel_code(code)
+        assert int(batch.code_ids[i]) == code_id, repr(code)
+        assert bool(batch.valid[i]) == (code_id >= 0), repr(code)
+        assert bool(batch.known[i]) == (code in JEL_CODES), repr(code)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_codes_match_scalar_parser(seed):
+    codes = random_codes(seed)
+    assert_matches_scalar(codes)
+    # Results must not depend on the rest of the batch
+    rng = random.Random(seed)
+    assert_matches_scalar(rng.sample(codes, 50))
+    assert_matches_scalar(codes[:1])
+
+
+def test_every_known_code():
+    batch = parse_jel_codes(KNOWN)
+    assert batch.known.all()
+    assert batch.code_ids.tolist() == [encode_jel_code(c) for c in KNOWN]
+
+
+@pytest.mark.parametrize("codes", [
+    ["j31", "J31", " J31 ", "\tj31\n", "jJ1", "Z99", "z99"],
+    ["", " ", "J", "j", "J3", "J031", "J1 2"],
+])
+def test_mixed_case_and_whitespace(codes):
+    assert_matches_scalar(codes)
+
+
+@pytest.mark.parametrize("codes", [
+    ["J-1", "J+3", "J1_0", "J1.5", "X12", "J٣", "ßa", "éJ31", "JJ", "31J"],
+    ["J1\0", "\0J31", "J\0", "\0"],
+])
+def test_malformed_codes(codes):
+    assert_matches_scalar(codes)
+    assert not parse_jel_codes(codes).known.any()
+
+
+def test_int64_saturation():
+    codes = ["J" + "1" * 18, "J" + "9" * 18, "J" + "1" * 19, "J" + "9" * 25, "J-" + "9" * 25]
+    assert_matches_scalar(codes)
+    batch = parse_jel_codes(codes)
+    assert batch.numbers[3] == INT64_MAX
+    assert batch.numbers[4] == -INT64_MAX
+    assert not batch.valid.any()
+
+
+def test_empty_batch():
+    batch = parse_jel_codes([])
+    assert len(batch) == 0
+    assert batch.unknown_codes() == []
+
+
+def test_unknown_codes():
+    assert parse_jel_codes(["J31", "X99", "J99", "X99"]).unknown_codes() == ["J99", "X99"]
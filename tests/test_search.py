@@ -0,0 +1,83 @@
+"""SearchIndex: every way of building the postings ranks papers the same."""
+
+import numpy as np
+import pytest
+
+from data.search import SearchIndex, tokenize
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(1200, seed=12)
+SPLIT = 900
+QUERIES = ["labor market", "monetary policy shocks", "the of and", "inflation expectations households",
+           "zzzz", PAPERS[-1].title, PAPERS[0].title]
+
+
+def rankings(index: SearchIndex, allowed=None) -> list:
+    return [index.search(q, 20, allowed) for q in QUERIES]
+
+
+def assert_same(a: list, b: list):
+    for hits_a, hits_b in zip(a, b):
+        assert [i for i, _ in hits_a] == [i for i, _ in hits_b]
+        assert [s for _, s in hits_a] == pytest.approx([s for _, s in hits_b], rel=1e-6)
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PaperStore.from_papers(PAPERS)
+
+
+@pytest.fixture(scope="module")
+def full(store):
+    return SearchIndex.from_store(store)
+
+
+def added(store, start: int = 0) -> SearchIndex:
+    index = SearchIndex.from_store(PaperStore.from_papers(PAPERS[:start])) if start else SearchIndex()
+    for i in range(start, len(PAPERS)):
+        index.add(i, PAPERS[i].title, PAPERS[i].abstract)
+    return index
+
+
+def test_extended_matches_from_store(store, full):
+    prefix = SearchIndex.from_store(PaperStore.from_papers(PAPERS[:SPLIT]))
+    before = rankings(prefix)
+    extended = prefix.extended(store)
+    assert len(extended) == len(full) == len(PAPERS)
+    assert_same(rankings(extended), rankings(full))
+    # The index it extends is unchanged
+    assert_same(rankings(prefix), before)
+
+
+@pytest.mark.parametrize("start", [0, SPLIT])
+def test_add_and_compact_match_from_store(store, full, start):
+    index = added(store, start)
+    # Pending papers are searched before compact(), and after it
+    assert_same(rankings(index), rankings(full))
+    index.compact()
+    assert_same(rankings(index), rankings(full))
+    for term in ("labor", "market", "policy"):
+        for a, b in zip(index.postings(term), full.postings(term)):
+            assert np.array_equal(a, b)
+
+
+def test_allowed_restricts_results(full):
+    allowed = np.arange(0, len(PAPERS), 3)
+    for hits in rankings(full, allowed):
+        assert all(i % 3 == 0 for i, _ in hits)
+
+
+def test_add_rejects_out_of_order_ids(store):
+    index = SearchIndex.from_store(PaperStore.from_papers(PAPERS[:10]))
+    with pytest.raises(ValueError):
+        index.add(9, "Late", "")
+    index.add(20, "Gap", "")
+    with pytest.raises(ValueError):
+        index.add(20, "Again", "")
+    with pytest.raises(ValueError):
+        index.extended(store)
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize("The Markets of Labor, and Policies!") == ["market", "labor", "policy"]
@@ -0,0 +1,95 @@
+"""Appended segments extend the previous store's indexes instead of rebuilding them."""
+
+import numpy as np
+import pytest
+
+from data.bitmap import FilterEngine, engine_for
+from data.cooccurrence import CooccurrenceIndex, cooccurrence_for
+from data.index import PaperIndex, index_for
+from data.papers import Paper
+from data.search import SearchIndex, search_index_for
+from data.segments import SegmentedCorpus, concat_stores
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+# An unlisted code and a new journal, so the appended rows extend every table
+ODD_PAPER = Paper(title="Zeta functions of labour", authors=["Q. Quinn"], journal="Journal of Zeta",
+                  jel_codes=["X99", "J31"], abstract="Quantum labour markets.", url="",
+                  year=2027, month=1)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    papers = generate_papers(1200, seed=3)
+    writer = SegmentedCorpus.create(str(tmp_path / "corpus.d"), PaperStore.from_papers(papers[:800]),
+                                    max_segments=100)
+    reader = SegmentedCorpus.open(writer.directory, check_interval=0)
+    # Build the first store's indexes, as the app does on its first run
+    store = reader.current()
+    index_for(store).display_rank
+    search_index_for(store)
+    writer.append(papers[800:1000])
+    writer.append(papers[1000:] + [ODD_PAPER])
+    return writer, reader
+
+
+def assert_same_postings(a: dict, b: dict):
+    assert a.keys() == b.keys()
+    for key in a:
+        assert np.array_equal(a[key], b[key]), key
+
+
+def test_appended_store_extends_indexes(corpus):
+    _, reader = corpus
+    store = reader.current()
+    assert store.appended_to() is not None
+    full = concat_stores([s.store for s in reader.segments])
+    assert [store.to_paper(i) for i in range(len(store))] == [full.to_paper(i) for i in range(len(full))]
+
+    index, rebuilt = index_for(store), PaperIndex(full)
+    for name in ("by_journal", "by_month", "by_jel_id", "by_jel_letter", "by_jel_group"):
+        assert_same_postings(getattr(index, name), getattr(rebuilt, name))
+    assert index.jel_counts == rebuilt.jel_counts
+    assert np.array_equal(index.display_rank, rebuilt.display_rank)
+
+    engine, rebuilt_engine = engine_for(index), FilterEngine(rebuilt)
+    for facet in FilterEngine.FACETS:
+        assert {k: b.to_ids().tolist() for k, b in engine.facets[facet].items()} == \
+            {k: b.to_ids().tolist() for k, b in rebuilt_engine.facets[facet].items()}
+    assert engine.count() == len(full)
+
+    search = search_index_for(store)
+    for query in ("labour market", "quantum zeta", "monetary policy"):
+        assert search.search(query, 10) == pytest.approx(SearchIndex.from_store(full).search(query, 10))
+
+    cooccurrence = cooccurrence_for(store)
+    assert cooccurrence.related("J31", 20) == CooccurrenceIndex.from_store(full).related("J31", 20)
+
+
+def test_compaction_keeps_cached_indexes(corpus):
+    writer, reader = corpus
+    store = reader.current()
+    index = index_for(store)
+    writer.compact()
+    compacted = reader.current()
+    assert compacted is reader.segments[0].store
+    assert compacted == store and index_for(compacted) is index
+
+
+def test_reader_retries_manifest_after_compaction(corpus, monkeypatch):
+    writer, reader = corpus
+    read_manifest = SegmentedCorpus._read_manifest
+    calls = []
+
+    def racing_compaction(self):
+        # The manifest read first still lists the segments compaction removed
+        calls.append(self)
+        if len(calls) == 1:
+            raise FileNotFoundError("seg-000002.snap")
+        return read_manifest(self)
+
+    writer.compact()
+    monkeypatch.setattr(SegmentedCorpus, "_read_manifest", racing_compaction)
+    assert reader.refresh()
+    assert len(calls) == 2
+    assert len(reader.segments) == 1 and len(reader.current()) == len(writer)
@@ -0,0 +1,67 @@
+"""SimilarityIndex.similar against an exact brute-force cosine top-k."""
+
+import numpy as np
+import pytest
+
+from data import similar
+from data.similar import SimilarityIndex
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(300, seed=15)
+K = 10
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SimilarityIndex.from_store(PaperStore.from_papers(PAPERS), seed=3)
+
+
+@pytest.fixture(scope="module")
+def cosines(index):
+    """Exact pairwise cosines of the sparse vectors."""
+    vectors = np.zeros((len(index), index.n_features))
+    for i in range(len(index)):
+        lo, hi = index.indptr[i], index.indptr[i + 1]
+        vectors[i, index.features[lo:hi]] = index.values[lo:hi]
+    return vectors @ vectors.T
+
+
+def brute_force(cosines, paper_id, k):
+    scores = cosines[paper_id].copy()
+    scores[paper_id] = -np.inf
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [(int(j), scores[j]) for j in order if scores[j] > 0]
+
+
+def assert_matches(hits, expected, cosines, paper_id):
+    assert paper_id not in [j for j, _ in hits]
+    # Same scores, best first; each hit scored exactly (near-ties may swap ids)
+    assert [s for _, s in hits] == pytest.approx([s for _, s in expected], abs=1e-5)
+    for j, s in hits:
+        assert s == pytest.approx(cosines[paper_id, j], abs=1e-5)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_similar_matches_exact_top_k(index, cosines, seed):
+    # Reranking every paper makes the search exact
+    for paper_id in np.random.default_rng(seed).choice(len(PAPERS), 15, replace=False).tolist():
+        hits = index.similar(paper_id, K, rerank=len(PAPERS))
+        assert_matches(hits, brute_force(cosines, paper_id, K), cosines, paper_id)
+
+
+def test_blocks_and_batches_match(index, cosines, monkeypatch):
+    # Scoring in blocks smaller than the corpus merges the per-block best
+    monkeypatch.setattr(similar, "_SCORE_BLOCK", 64)
+    paper_ids = [0, 63, 64, 150, len(PAPERS) - 1]
+    results = index.similar_many(paper_ids, K, rerank=len(PAPERS))
+    assert list(results) == paper_ids
+    for paper_id, hits in results.items():
+        assert_matches(hits, brute_force(cosines, paper_id, K), cosines, paper_id)
+    assert index.similar_many([], K) == {}
+
+
+def test_k_beyond_the_corpus(index, cosines):
+    hits = index.similar(5, len(PAPERS) + 10, rerank=len(PAPERS))
+    assert_matches(hits, brute_force(cosines, 5, len(PAPERS)), cosines, 5)
+    assert len(hits) == int(np.sum(np.delete(cosines[5], 5) > 0))
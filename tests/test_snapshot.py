@@ -0,0 +1,91 @@
+"""Snapshot files: round trips through write/load, and SnapshotWatcher swaps."""
+
+import os
+
+import numpy as np
+import pytest
+
+from data.papers import Paper
+from data.snapshot import MAGIC, SnapshotError, SnapshotWatcher, load_snapshot, write_snapshot
+from data.store import PaperStore
+from data.synthetic import generate_papers
+
+PAPERS = generate_papers(400, seed=14) + [
+    # Unlisted (negative-id) JEL codes, empty strings and missing fields
+    Paper(title="", authors=[""], journal="Journal of Nothing", jel_codes=["X99", "J31", "X99", "Q5x"],
+          abstract="", url="", year=2030, month=1),
+    Paper(title="Odd", authors=[], journal="Journal of Nothing", jel_codes=[], abstract="Ünïcode — abstract",
+          url="https://example.org/odd", year=2030, month=2, volume=3, issue=1, pages="", doi=""),
+]
+
+
+def replace_file(path, data: bytes):
+    """Replace ``path`` the way write_snapshot does (a new inode)."""
+    with open(f"{path}.new", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.new", path)
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PaperStore.from_papers(PAPERS)
+
+
+@pytest.fixture
+def path(tmp_path, store):
+    path = str(tmp_path / "corpus.snap")
+    write_snapshot(store, path)
+    return path
+
+
+def test_round_trip(path, store):
+    loaded = load_snapshot(path)
+    assert loaded.version == store.version
+    assert len(loaded) == len(PAPERS)
+    assert [loaded.to_paper(i) for i in range(len(loaded))] == [store.to_paper(i) for i in range(len(store))]
+    assert loaded.to_paper(len(PAPERS) - 2).jel_codes == ["X99", "J31", "X99", "Q5x"]
+    for name, column in store.columns().items():
+        assert np.array_equal(loaded.columns()[name], column), name
+    # A snapshot of the loaded store is the same file
+    copy = f"{path}.copy"
+    write_snapshot(loaded, copy)
+    with open(path, "rb") as a, open(copy, "rb") as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize("damage", ["empty", "bad magic", "short header", "truncated header", "truncated data"])
+def test_unreadable_files_are_rejected(path, damage):
+    with open(path, "rb") as f:
+        data = f.read()
+    data = {"empty": b"", "bad magic": b"NOTASNAP" + data[len(MAGIC):], "short header": data[:12],
+            "truncated header": data[:40], "truncated data": data[:len(data) // 2]}[damage]
+    replace_file(path, data)
+    with pytest.raises(SnapshotError):
+        load_snapshot(path)
+
+
+def test_watcher_swaps_to_a_rewritten_file(path):
+    watcher = SnapshotWatcher(path, check_interval=0)
+    first = watcher.current()
+    assert not watcher.refresh()
+    write_snapshot(PaperStore.from_papers(PAPERS[:100]), path)
+    second = watcher.current()
+    assert len(second) == 100 and watcher.reloads == 1
+    # Readers of the old store keep a valid mapping
+    assert first.to_paper(len(PAPERS) - 1) == PAPERS[-1]
+
+
+def test_watcher_keeps_serving_through_a_bad_file(path):
+    watcher = SnapshotWatcher(path, check_interval=0)
+    store = watcher.current()
+    with open(path, "rb") as f:
+        data = f.read()
+    for bad in (data[:len(data) // 2], b"NOTASNAP" + data[len(MAGIC):]):
+        replace_file(path, bad)
+        assert not watcher.refresh()
+        assert watcher.current() is store
+    assert watcher.reloads == 0
+    # The file is checked again once it is readable
+    write_snapshot(PaperStore.from_papers(PAPERS[:50]), path)
+    assert watcher.refresh()
+    assert len(watcher.current()) == 50